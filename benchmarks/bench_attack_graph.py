@@ -0,0 +1,52 @@
+"""Attack-graph build and queries on a synthetic network of ~100k edges.
+
+Run with ``python benchmarks/bench_attack_graph.py``.
+"""
+from __future__ import annotations
+
+import random
+from time import perf_counter
+
+from tornado_ai.core.decision import sacd
+from tornado_ai.core.decision.attack_graph import AttackGraphBuilder
+
+
+def _environment(hosts: int, edges: int, seed: int = 7) -> AttackGraphBuilder:
+    rng = random.Random(seed)
+    builder = AttackGraphBuilder()
+    builder.add_node("internet", entry=True)
+    for index in range(hosts):
+        builder.add_node(
+            f"host-{index}", phase="exploit", likelihood=rng.uniform(0.3, 1.0), goal=index % 1000 == 999
+        )
+    for _ in range(50):
+        builder.add_edge("internet", f"host-{rng.randrange(hosts)}", rng.uniform(0.1, 0.9), "exposed service")
+    added = 50
+    while added < edges:
+        source, target = rng.randrange(hosts), rng.randrange(hosts)
+        if source != target:
+            builder.add_edge(f"host-{source}", f"host-{target}", rng.uniform(0.05, 0.95), "reused credential")
+            added += 1
+    return builder
+
+
+def _timed(label: str, func):
+    start = perf_counter()
+    result = func()
+    print(f"  {label:<14}{(perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    for hosts, edges in ((2_000, 10_000), (20_000, 100_000)):
+        builder = _environment(hosts, edges)
+        print(f"hosts={hosts} edges={edges}")
+        graph = _timed("build", builder.build)
+        _timed("best_path", graph.best_path)
+        _timed("k_best(5)", lambda: graph.k_best_paths(5))
+        _timed("choke_points", lambda: graph.choke_points(10))
+        _timed("analyze_graph", lambda: sacd.analyze_graph("bench", graph, paths=5, choke_points=10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Vectorized batch analysis against the per-target ``build_plan`` loop.
+
+Run with ``python benchmarks/bench_batch.py``.
+"""
+from __future__ import annotations
+
+import random
+from time import perf_counter
+
+from tornado_ai.core.decision.batch import BatchAnalyzer
+from tornado_ai.core.decision.tsa import ToolSelectionAssistant, ToolSelectionContext
+from tornado_ai.shared.types import TargetProfile
+from tornado_ai.tools.registry import tool_registry
+
+_ASSET_KINDS = ("webapp", "api", "mobile", "cloud", "infrastructure", "binary", "iot")
+
+
+def _targets(count: int) -> list[TargetProfile]:
+    rng = random.Random(7)
+    return [
+        TargetProfile.model_validate(
+            {
+                "targetId": f"target-{index}",
+                "assetKind": rng.choice(_ASSET_KINDS),
+                "environment": "production",
+                "criticality": "high",
+                "cvss": round(rng.uniform(0, 10), 1),
+            }
+        )
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    assistant = ToolSelectionAssistant(tool_registry)
+    analyzer = BatchAnalyzer(tool_registry, assistant)
+    for count in (10_000, 100_000):
+        targets = _targets(count)
+        start = perf_counter()
+        for profile in targets:
+            assistant.build_plan(ToolSelectionContext(profile=profile, history=[])).model_dump_json()
+        loop_seconds = perf_counter() - start
+        start = perf_counter()
+        size = sum(len(chunk) for chunk in analyzer.stream(targets))
+        batch_seconds = perf_counter() - start
+        print(
+            f"targets={count:7d}  loop={loop_seconds:7.3f} s  batch={batch_seconds:7.3f} s  "
+            f"speedup={loop_seconds / batch_seconds:5.1f}x  ndjson={size / 1e6:6.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
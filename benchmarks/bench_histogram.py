@@ -0,0 +1,29 @@
+"""Microbenchmark for ``Histogram.observe`` and ``Histogram.snapshot``.
+
+Run with ``python benchmarks/bench_histogram.py``.
+"""
+from __future__ import annotations
+
+import random
+import timeit
+
+from tornado_ai.core.observability.histogram import Histogram
+
+
+def main() -> None:
+    rng = random.Random(42)
+    samples = [rng.lognormvariate(-4.0, 1.5) for _ in range(100_000)]
+    for accuracy in (0.05, 0.01, 0.001):
+        histogram = Histogram("bench", relative_accuracy=accuracy)
+        elapsed = timeit.timeit(lambda: [histogram.observe(v) for v in samples], number=1)
+        per_observe_ns = elapsed / len(samples) * 1e9
+        snapshot_s = timeit.timeit(histogram.snapshot, number=100) / 100
+        print(
+            f"accuracy={accuracy:<6} observe={per_observe_ns:7.1f} ns/op  "
+            f"snapshot={snapshot_s * 1e6:8.1f} us  buckets={len(histogram._buckets)}  "
+            f"count={histogram.count}"
+        )
+
+
+if __name__ == "__main__":
+    main()
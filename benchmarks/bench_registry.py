@@ -0,0 +1,45 @@
+"""Plan building and registry views against a catalog grown to thousands of tools.
+
+Run with ``python benchmarks/bench_registry.py``.
+"""
+from __future__ import annotations
+
+import timeit
+from dataclasses import replace
+
+from tornado_ai.core.decision.tsa import ToolSelectionAssistant, ToolSelectionContext
+from tornado_ai.shared.types import TargetProfile
+from tornado_ai.tools.definitions import tool_definitions
+from tornado_ai.tools.registry import ToolRegistry
+
+
+def _grown_registry(copies: int) -> ToolRegistry:
+    definitions = list(tool_definitions)
+    grown = [
+        replace(definition, spec=definition.spec.model_copy(update={"id": f"{definition.spec.id}.{index}"}))
+        for index in range(copies)
+        for definition in definitions
+        if definition.spec.category == "binary"
+    ]
+    return ToolRegistry(definitions + grown)
+
+
+def main() -> None:
+    profile = TargetProfile.model_validate(
+        {"targetId": "bench", "assetKind": "webapp", "environment": "production", "criticality": "high", "cvss": 7.5}
+    )
+    context = ToolSelectionContext(profile=profile, history=[])
+    for copies in (0, 500, 2000):
+        registry = _grown_registry(copies)
+        assistant = ToolSelectionAssistant(registry)
+        assistant.build_plan(context)
+        plan_us = timeit.timeit(lambda: assistant.build_plan(context), number=200) / 200 * 1e6
+        categories_us = timeit.timeit(registry.categories, number=10_000) / 10_000 * 1e6
+        print(
+            f"tools={len(registry):5d}  build_plan={plan_us:8.1f} us  categories={categories_us:6.3f} us  "
+            f"version={registry.version}"
+        )
+
+
+if __name__ == "__main__":
+    main()
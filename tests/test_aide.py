@@ -1,5 +1,28 @@
+import time
+from dataclasses import replace
+
+import pytest
+
+from fastapi import HTTPException
+
+from tornado_ai.api.controllers.intelligence import (
+    AnalyzeTargetPayload,
+    ExecutePlanPayload,
+    SelectToolsPayload,
+    analyze_target,
+    execute_plan,
+    select_tools,
+)
 from tornado_ai.core.decision import aide
+from tornado_ai.core.decision.aide import AdvancedIntelligentDecisionEngine
+from tornado_ai.core.decision.ipo import IntelligentParameterOptimizer
+from tornado_ai.core.decision.memo import DecisionCache
+from tornado_ai.core.decision.sacd import SmartAttackChainDiscovery
+from tornado_ai.core.decision.tsa import ToolSelectionAssistant
+from tornado_ai.core.observability import telemetry_center
 from tornado_ai.shared.types import PriorToolResult, TargetProfile
+from tornado_ai.tools.definitions import tool_definitions
+from tornado_ai.tools.registry import ToolRegistry
 
 
 def make_profile(**overrides):
@@ -43,3 +66,154 @@ def test_aide_skips_successful_tools():
     result = aide.analyze(profile, history)
     ids = {step.toolId for step in result.plan.steps}
     assert "nuclei_scan.sim" not in ids
+
+
+def test_aide_analyze_records_child_spans(monkeypatch):
+    monkeypatch.setattr(telemetry_center, "_head_sample_rate", 1.0)
+    aide.cache.clear()
+    with telemetry_center.span("test.root") as root:
+        aide.analyze(make_profile(), [])
+    tree = telemetry_center.trace(root.trace_id)
+    analyze = tree[0]["children"][0]
+    assert analyze["name"] == "aide.analyze"
+    assert [child["name"] for child in analyze["children"]] == [
+        "tsa.build_plan",
+        "sacd.build_graph",
+        "roe.recommend_concurrency",
+    ]
+
+
+def _cached_engine(registry, max_entries=8):
+    cache = DecisionCache(max_entries=max_entries)
+    engine = AdvancedIntelligentDecisionEngine(
+        tsa=ToolSelectionAssistant(registry),
+        ipo=IntelligentParameterOptimizer(),
+        sacd=SmartAttackChainDiscovery(),
+        cache=cache,
+    )
+    return engine, cache
+
+
+def test_aide_memoizes_on_decision_inputs_only():
+    engine, cache = _cached_engine(ToolRegistry(tool_definitions))
+    first = engine.analyze(make_profile(), [])
+    same_inputs = engine.analyze(
+        make_profile(tags=["edge"], description="changed"),
+        [PriorToolResult(toolId="nuclei_scan.sim", success=False)],
+    )
+    skipped = engine.analyze(make_profile(), [PriorToolResult(toolId="nuclei_scan.sim", success=True)])
+    assert same_inputs is first
+    assert skipped is not first
+    assert "nuclei_scan.sim" not in {step.toolId for step in skipped.plan.steps}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_aide_cache_invalidates_on_registry_change_and_evicts_lru():
+    registry = ToolRegistry(tool_definitions)
+    engine, cache = _cached_engine(registry, max_entries=2)
+    before = engine.analyze(make_profile(), [])
+    definition = registry.get_definition("nuclei_scan.sim")
+    registry.register(replace(definition, decision_weight=definition.decision_weight * 10))
+    after = engine.analyze(make_profile(), [])
+    assert after is not before
+    assert after.plan.steps[0].toolId == "nuclei_scan.sim"
+    assert cache.stats()["invalidations"] == 1
+
+    for index in range(3):
+        engine.analyze(make_profile(targetId=f"app-{index}"), [])
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] >= 2
+
+
+class _SlowSACD(SmartAttackChainDiscovery):
+    def build_graph(self, profile):
+        time.sleep(0.3)
+        return super().build_graph(profile)
+
+
+class _BrokenTSA(ToolSelectionAssistant):
+    def build_plan(self, context):
+        raise RuntimeError("history store unavailable")
+
+
+@pytest.mark.asyncio
+async def test_aide_analyze_async_matches_sync_and_memoizes():
+    registry = ToolRegistry(tool_definitions)
+    engine, cache = _cached_engine(registry)
+    output = await engine.analyze_async(make_profile(), [])
+    assert not output.degraded
+    expected = _cached_engine(registry)[0].analyze(make_profile(), [])
+    assert (output.plan, output.graph, output.recommendedConcurrency) == (
+        expected.plan,
+        expected.graph,
+        expected.recommendedConcurrency,
+    )
+    assert await engine.analyze_async(make_profile(), []) is output
+    assert engine.analyze(make_profile(), []) is output
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_aide_analyze_async_degrades_slow_and_failing_stages(monkeypatch):
+    monkeypatch.setattr(telemetry_center, "_head_sample_rate", 1.0)
+    registry = ToolRegistry(tool_definitions)
+    cache = DecisionCache()
+    engine = AdvancedIntelligentDecisionEngine(
+        tsa=ToolSelectionAssistant(registry),
+        ipo=IntelligentParameterOptimizer(),
+        sacd=_SlowSACD(),
+        cache=cache,
+        stage_timeout=0.05,
+    )
+    started = time.perf_counter()
+    with telemetry_center.span("test.root") as root:
+        output = await engine.analyze_async(make_profile(), [])
+    assert time.perf_counter() - started < 0.25
+    assert output.degradedStages == ("sacd.build_graph",)
+    assert output.plan.steps and output.graph.nodes == [] and output.recommendedConcurrency >= 1
+    assert cache.stats()["size"] == 0  # degraded outputs are not memoized
+    analyze = telemetry_center.trace(root.trace_id)[0]["children"][0]
+    assert analyze["attributes"]["degraded"] == "sacd.build_graph"
+    assert {"tsa.build_plan", "roe.recommend_concurrency"} <= {child["name"] for child in analyze["children"]}
+
+    broken = AdvancedIntelligentDecisionEngine(
+        tsa=_BrokenTSA(registry), ipo=IntelligentParameterOptimizer(), sacd=SmartAttackChainDiscovery()
+    )
+    output = await broken.analyze_async(make_profile(), [])
+    assert output.degradedStages == ("tsa.build_plan",)
+    assert output.plan.steps == [] and output.graph.nodes
+
+
+@pytest.mark.asyncio
+async def test_analyze_target_route_reports_degradation():
+    response = await analyze_target(AnalyzeTargetPayload(target=make_profile()))
+    assert response.plan.steps and not response.degraded and response.degradedStages == []
+
+
+@pytest.mark.asyncio
+async def test_routes_refuse_to_act_on_degraded_analyses(monkeypatch):
+    registry = ToolRegistry(tool_definitions)
+    broken = AdvancedIntelligentDecisionEngine(
+        tsa=_BrokenTSA(registry), ipo=IntelligentParameterOptimizer(), sacd=SmartAttackChainDiscovery()
+    )
+    monkeypatch.setattr("tornado_ai.api.controllers.intelligence.aide", broken)
+    with pytest.raises(HTTPException) as excinfo:
+        await select_tools(SelectToolsPayload(target=make_profile()))
+    assert excinfo.value.status_code == 503
+    with pytest.raises(HTTPException) as excinfo:
+        await execute_plan(ExecutePlanPayload(target=make_profile()))
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.detail["degradedStages"] == ["tsa.build_plan"]
+
+    slow = AdvancedIntelligentDecisionEngine(
+        tsa=ToolSelectionAssistant(registry),
+        ipo=IntelligentParameterOptimizer(),
+        sacd=_SlowSACD(),
+        stage_timeout=0.05,
+    )
+    monkeypatch.setattr("tornado_ai.api.controllers.intelligence.aide", slow)
+    assert (await select_tools(SelectToolsPayload(target=make_profile()))).steps  # the plan itself is whole
+    with pytest.raises(HTTPException) as excinfo:
+        await execute_plan(ExecutePlanPayload(target=make_profile()))
+    assert excinfo.value.detail["degradedStages"] == ["sacd.build_graph"]
@@ -0,0 +1,103 @@
+import math
+import random
+
+from tornado_ai.core.decision import sacd
+from tornado_ai.core.decision.attack_graph import AttackGraphBuilder
+from tornado_ai.shared.types import TargetProfile
+
+
+def _random_builder(seed: int, nodes: int = 9, edges: int = 22) -> AttackGraphBuilder:
+    rng = random.Random(seed)
+    builder = AttackGraphBuilder()
+    for index in range(nodes):
+        builder.add_node(
+            f"n{index}",
+            likelihood=rng.uniform(0.3, 1.0),
+            entry=index in (0, 1),
+            goal=index in (nodes - 1, nodes - 2),
+        )
+    for _ in range(edges):
+        source, target = rng.sample(range(nodes), 2)
+        builder.add_edge(f"n{source}", f"n{target}", likelihood=rng.uniform(0.1, 1.0))
+    return builder
+
+
+def _all_simple_paths(builder: AttackGraphBuilder):
+    graph = builder.build()
+    likelihood = {node.id: node.likelihood for node in graph.to_model("t").nodes}
+    edges = {(source, target): value for (source, target), (value, _) in builder._edges.items()}
+    ids = builder._ids
+    adjacency = {}
+    for source, target in edges:
+        adjacency.setdefault(ids[source], []).append(ids[target])
+    edge_likelihood = {(ids[source], ids[target]): value for (source, target), value in edges.items()}
+    found = []
+
+    def walk(path, value):
+        if path[-1] in graph.goals:
+            found.append((value, tuple(path)))
+            return
+        for nxt in adjacency.get(path[-1], []):
+            if nxt not in path:
+                walk(path + [nxt], value * edge_likelihood[(path[-1], nxt)] * likelihood[nxt])
+
+    for entry in graph.entries:
+        walk([entry], likelihood[entry])
+    return sorted(found, key=lambda item: -item[0])
+
+
+def test_k_best_paths_match_exhaustive_enumeration():
+    for seed in range(25):
+        builder = _random_builder(seed)
+        expected = _all_simple_paths(builder)
+        paths = builder.build().k_best_paths(6)
+        assert len(paths) == min(6, len(expected))
+        for path, (likelihood, _) in zip(paths, expected):
+            assert math.isclose(path.likelihood, likelihood, rel_tol=1e-9)
+        assert len({path.nodes for path in paths}) == len(paths)
+
+
+def test_choke_points_rank_the_bridge_between_entry_and_goals():
+    builder = AttackGraphBuilder()
+    builder.add_node("internet", entry=True)
+    for host in ("web1", "web2", "web3"):
+        builder.add_edge("internet", host, likelihood=0.8)
+        builder.add_edge(host, "jump", likelihood=0.5)
+    for goal in ("db", "dc"):
+        builder.add_node(goal, phase="maintain", goal=True)
+        builder.add_edge("jump", goal, likelihood=0.9)
+    graph = builder.build()
+
+    points = graph.choke_points(3)
+    assert points[0].node == "jump"
+    assert math.isclose(points[0].score, 1.0)
+    assert {point.node for point in points[1:]} <= {"web1", "web2", "web3"}
+    assert graph.best_path(goals=["db"]).nodes[-2:] == ("jump", "db")
+
+
+def test_analyze_graph_materializes_only_the_returned_subgraph():
+    builder = AttackGraphBuilder()
+    builder.add_node("internet", entry=True)
+    for index in range(200):
+        builder.add_edge("internet", f"host{index}", likelihood=0.1 + index / 1000)
+        builder.add_edge(f"host{index}", "crown-jewel", likelihood=0.5)
+    builder.add_node("crown-jewel", phase="maintain", goal=True)
+
+    analysis = sacd.analyze_graph("corp", builder.build(), paths=2)
+    assert [path.nodes for path in analysis.paths] == [
+        ["internet", "host199", "crown-jewel"],
+        ["internet", "host198", "crown-jewel"],
+    ]
+    assert {node.id for node in analysis.graph.nodes} == {"internet", "host199", "host198", "crown-jewel"}
+    assert len(analysis.graph.edges) == 4
+
+
+def test_template_graph_keeps_stage_layout():
+    profile = TargetProfile.model_validate(
+        {"targetId": "c1", "assetKind": "cloud", "environment": "production", "cvss": 8.0, "criticality": "high"}
+    )
+    graph = sacd.build_graph(profile)
+    assert [node.id for node in graph.nodes] == ["recon", "access", "priv", "impact", "persistence"]
+    analysis = sacd.analyze_graph("c1", sacd.template(profile).build())
+    assert analysis.paths[0].nodes == ["recon", "access", "priv", "persistence"]
+    assert math.isclose(analysis.paths[0].likelihood, 0.9 * 0.7 * 0.6 * 0.55)
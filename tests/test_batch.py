@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from tornado_ai.api.controllers.intelligence import AnalyzeBatchPayload, analyze_batch
+from tornado_ai.core.decision import batch_analyzer, tsa
+from tornado_ai.core.decision.batch import BatchAnalyzer
+from tornado_ai.core.decision.tsa import ToolSelectionAssistant, ToolSelectionContext
+from tornado_ai.shared.types import PriorToolResult, TargetProfile, ToolPlan
+from tornado_ai.tools.definitions import tool_definitions
+from tornado_ai.tools.registry import ToolRegistry
+
+
+def _profile(index: int, asset_kind: str, cvss: float) -> TargetProfile:
+    return TargetProfile.model_validate(
+        {
+            "targetId": f"t-{index}",
+            "assetKind": asset_kind,
+            "environment": "production",
+            "criticality": "high",
+            "cvss": cvss,
+        }
+    )
+
+
+def _profiles():
+    kinds = ["webapp", "api", "mobile", "cloud", "infrastructure", "binary", "iot"]
+    return [_profile(index, kinds[index % len(kinds)], (index * 37 % 101) / 10) for index in range(210)]
+
+
+def test_batch_plans_match_build_plan_with_history():
+    profiles = _profiles()
+    history = {
+        profile.targetId: [
+            PriorToolResult(toolId="nmap_scan.sim", success=True),
+            PriorToolResult(toolId="nuclei_scan.sim", success=False),
+        ]
+        for profile in profiles[::4]
+    }
+    # Only the latest result per tool counts: a failed re-run brings nmap back.
+    history.update(
+        {
+            profile.targetId: [
+                PriorToolResult(toolId="nmap_scan.sim", success=True),
+                PriorToolResult(toolId="nmap_scan.sim", success=False),
+            ]
+            for profile in profiles[1::4]
+        }
+    )
+    plans = list(batch_analyzer.plans(profiles, history, chunk_size=64))
+    expected = [
+        tsa.build_plan(ToolSelectionContext(profile=profile, history=history.get(profile.targetId, [])))
+        for profile in profiles
+    ]
+    assert plans == expected
+
+
+def test_batch_matrix_follows_registry_changes():
+    registry = ToolRegistry(tool_definitions)
+    analyzer = BatchAnalyzer(registry, ToolSelectionAssistant(registry))
+    profile = _profile(0, "webapp", 9.8)
+    assert any(step.toolId == "nmap_scan.sim" for step in next(analyzer.plans([profile])).steps)
+    registry.unregister("nmap_scan.sim")
+    assert all(step.toolId != "nmap_scan.sim" for step in next(analyzer.plans([profile])).steps)
+
+
+@pytest.mark.asyncio
+async def test_analyze_batch_streams_ndjson_in_chunks():
+    profiles = _profiles()[:25]
+    response = await analyze_batch(AnalyzeBatchPayload(targets=profiles, chunkSize=10))
+    assert response.media_type == "application/x-ndjson"
+    chunks = [chunk async for chunk in response.body_iterator]
+    assert len(chunks) == 3
+    lines = "".join(chunks).splitlines()
+    assert [ToolPlan.model_validate(json.loads(line)).targetId for line in lines] == [p.targetId for p in profiles]
@@ -0,0 +1,70 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from tornado_ai.api.controllers.telemetry import get_chrome_trace
+from tornado_ai.core.observability import telemetry_center
+from tornado_ai.core.observability.chrome_trace import stream_chrome_trace
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+
+
+def _nests_properly(events):
+    by_tid = {}
+    for event in events:
+        by_tid.setdefault(event["tid"], []).append(event)
+    for lane in by_tid.values():
+        open_ends = []
+        for event in sorted(lane, key=lambda item: (item["ts"], -item["dur"])):
+            end = event["ts"] + event["dur"]
+            while open_ends and open_ends[-1] <= event["ts"]:
+                open_ends.pop()
+            if open_ends and end > open_ends[-1]:
+                return False
+            open_ends.append(end)
+    return True
+
+
+@pytest.mark.asyncio
+async def test_chrome_trace_splits_interleaved_spans_into_nested_lanes():
+    center = TelemetryCenter(head_sample_rate=1.0)
+
+    def _blocking_step():
+        with center.span("adapter.run"):
+            pass
+
+    async def analysis(name):
+        with center.span("aide.analyze", target=name):
+            with center.span("tsa.build_plan"):
+                await asyncio.sleep(0.02)
+            await asyncio.to_thread(_blocking_step)
+
+    await asyncio.gather(analysis("a"), analysis("b"))
+    document = json.loads("".join(stream_chrome_trace(center.recent_spans(0))))
+
+    events = [event for event in document["traceEvents"] if event["ph"] == "X"]
+    assert len(events) == 6
+    assert _nests_properly(events)
+    names = {
+        event["tid"]: event["args"]["name"]
+        for event in document["traceEvents"]
+        if event["ph"] == "M" and event["name"] == "thread_name"
+    }
+    loop_thread = threading.current_thread().name
+    aide_lanes = {names[event["tid"]] for event in events if event["name"] == "aide.analyze"}
+    assert aide_lanes == {loop_thread, f"{loop_thread} #1"}
+    adapter_lanes = {names[event["tid"]] for event in events if event["name"] == "adapter.run"}
+    assert loop_thread not in adapter_lanes
+    child = next(event for event in events if event["name"] == "tsa.build_plan")
+    assert child["args"]["parentId"]
+
+
+@pytest.mark.asyncio
+async def test_trace_endpoint_streams_recent_spans_for_one_trace():
+    with telemetry_center.span("export.trace") as span:
+        span.force_keep()
+    response = await get_chrome_trace(60.0, span.trace_id)
+    body = "".join([chunk async for chunk in response.body_iterator])
+    events = [event for event in json.loads(body)["traceEvents"] if event["ph"] == "X"]
+    assert [event["name"] for event in events] == ["export.trace"]
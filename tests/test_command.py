@@ -3,6 +3,7 @@ import asyncio
 import pytest
 
 from tornado_ai.api.controllers.command import CommandPayload, execute_command
+from tornado_ai.core.decision.performance import ToolPerformanceStore
 
 
 @pytest.mark.asyncio
@@ -13,3 +14,18 @@ async def test_execute_command_uses_cache(tmp_path, monkeypatch):
     assert first.result.status == "completed"
     second = await execute_command(payload)
     assert second.result.cached is True
+
+
+@pytest.mark.asyncio
+async def test_uncached_executions_are_recorded_per_asset_kind(tmp_path, monkeypatch):
+    monkeypatch.setattr("tornado_ai.api.controllers.command.AUDIT_PATH", tmp_path / "audit.log.jsonl")
+    store = ToolPerformanceStore(min_samples=1)
+    monkeypatch.setattr("tornado_ai.api.controllers.command.tool_performance", store)
+    payload = CommandPayload(
+        toolId="nmap_scan.sim", params={"targets": ["10.0.0.9"]}, useCache=False, assetKind="infrastructure"
+    )
+    await execute_command(payload)
+    await execute_command(payload.model_copy(update={"useCache": True}))
+    await execute_command(payload.model_copy(update={"useCache": True}))  # cache hit: not an execution
+    stats = store.stats("nmap_scan.sim", "infrastructure")
+    assert (stats.count, stats.successes) == (2, 2)
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from tornado_ai.core.control.center import ControlCenter
+from tornado_ai.core.decision.concurrency import AdaptiveConcurrencyController
+from tornado_ai.core.decision.scheduler import PlanExecutor
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+from tornado_ai.shared.types import ToolExecutionResult, ToolPlan, ToolPlanStep
+
+
+def _controller(**overrides):
+    options = {"global_ceiling": 16, "target_ceiling": 8, "cooldown": 0.0, "center": TelemetryCenter()}
+    options.update(overrides)
+    return AdaptiveConcurrencyController(**options)
+
+
+def _plan(target_id, count):
+    return ToolPlan(
+        targetId=target_id,
+        summary="test",
+        steps=[
+            ToolPlanStep(toolId=f"{target_id}-{index}", rationale="", score=1.0, category="network")
+            for index in range(count)
+        ],
+    )
+
+
+def test_window_grows_additively_and_shrinks_multiplicatively():
+    controller = _controller()
+    assert controller.limit("t", initial=2) == 2
+    for _ in range(3):  # 2 -> 2.5 -> 2.9 -> 3.24: about a window's worth of completions per slot
+        assert controller.try_acquire("t")
+        controller.release("t", "nmap_scan.sim", "success")
+    assert controller.limit("t") == 3
+    for _ in range(40):
+        controller.try_acquire("t")
+        controller.release("t", "nmap_scan.sim", "success")
+    assert controller.limit("t") == 8  # target ceiling
+    controller.try_acquire("t")
+    controller.release("t", "nmap_scan.sim", "error")
+    assert controller.limit("t") == 4
+    assert controller.stats()["global"]["limit"] == 16  # errors only cut the target's window
+    controller.try_acquire("t")
+    controller.release("t", "nmap_scan.sim", "timeout")
+    assert controller.limit("t") == 2
+    assert controller.stats()["global"]["limit"] == 8
+
+
+def test_decrease_happens_once_per_cooldown():
+    controller = _controller(cooldown=60.0)
+    controller.window("t", initial=8)
+    for _ in range(3):
+        controller.try_acquire("t")
+        controller.release("t", "nmap_scan.sim", "error")
+    assert controller.limit("t") == 4
+
+
+def test_admission_respects_both_windows_and_scan_guardrails():
+    center = ControlCenter()
+    profile = center.snapshot().scanProfiles[0]
+    assert center.max_parallel_tasks(profile.targets[0]) == profile.guardrails.maxParallelTasks
+    assert center.max_parallel_tasks("unknown") is None
+
+    controller = _controller(global_ceiling=3, ceilings=center.max_parallel_tasks)
+    guarded = profile.targets[0]
+    assert controller.limit(guarded, initial=10) == profile.guardrails.maxParallelTasks
+    assert controller.try_acquire("a", initial=2) and controller.try_acquire("a")
+    assert not controller.try_acquire("a")
+    assert controller.try_acquire("b")
+    assert not controller.try_acquire("b")  # global window is full
+    controller.release("a", "x", "success")
+    assert controller.try_acquire("b")
+
+
+def test_slow_adapter_latency_shrinks_the_global_window():
+    center = TelemetryCenter()
+    latency = center.histogram("adapter.latency", labelnames=("tool",)).labels("nuclei_scan.sim")
+    controller = _controller(center=center)
+    for _ in range(100):
+        latency.observe(0.01)
+    assert controller.latency_healthy("nuclei_scan.sim")
+    for _ in range(30):
+        latency.observe(1.0)
+    assert not controller.latency_healthy("nuclei_scan.sim")
+    controller.try_acquire("t", initial=4)
+    controller.release("t", "nuclei_scan.sim", "success")
+    assert controller.stats()["global"]["limit"] == 8
+    assert controller.limit("t") == 4  # the target's own window holds
+
+
+@pytest.mark.asyncio
+async def test_plans_share_the_global_window_and_feed_back_outcomes():
+    center = TelemetryCenter()
+    controller = _controller(global_ceiling=2, center=center)
+    running = {"now": 0, "peak": 0}
+
+    async def runner(step):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.005)
+        running["now"] -= 1
+        if step.toolId == "b-0":
+            raise asyncio.TimeoutError()
+        return ToolExecutionResult(toolId=step.toolId, status="completed", output={})
+
+    executor = PlanExecutor(lambda tool_id: 1.0, limiter=controller)
+    first, second = await asyncio.gather(
+        executor.execute(_plan("a", 4), runner, concurrency=4),
+        executor.execute(_plan("b", 4), runner, concurrency=4),
+    )
+    assert running["peak"] == 2
+    assert all(step.status == "completed" for step in first.steps)
+    assert [step.status for step in second.steps].count("errored") == 1
+    stats = controller.stats()
+    assert stats["global"]["inFlight"] == 0
+    decreases = center.counter("roe.concurrency.adjustments", labelnames=("scope", "direction"))
+    assert decreases.labels("global", "decrease").value == 1
+    assert stats["targets"]["b"]["limit"] < 4
@@ -0,0 +1,131 @@
+import asyncio
+import gc
+import json
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from tornado_ai.api.controllers.debug import (
+    heap_diff,
+    heap_top,
+    run_profile,
+    start_heap_tracing,
+    stop_heap_tracing,
+    take_heap_snapshot,
+)
+from tornado_ai.auth.middleware import require_admin_token, require_feature, require_permission
+from tornado_ai.config import config
+from tornado_ai.core.control.center import control_center
+from tornado_ai.core.observability.memory import ProcessMetricsSampler
+from tornado_ai.core.observability.openmetrics import OpenMetricsRenderer
+from tornado_ai.core.observability.profiler import SamplingProfiler, sampling_profiler
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+
+
+def _busy_worker(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profiler_samples_other_threads_as_collapsed_and_speedscope():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_worker, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        profile = SamplingProfiler(interval=0.002).run(0.2)
+    finally:
+        stop.set()
+        worker.join()
+    assert profile.samples > 10
+    assert any(line.startswith("busy-worker;") and "_busy_worker" in line for line in profile.collapsed().splitlines())
+    document = profile.speedscope()
+    busy = next(item for item in document["profiles"] if item["name"] == "busy-worker")
+    assert busy["type"] == "sampled" and len(busy["samples"]) == len(busy["weights"])
+    assert all(index < len(document["shared"]["frames"]) for sample in busy["samples"] for index in sample)
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoint_labels_event_loop_and_rejects_concurrent_runs():
+    first = asyncio.ensure_future(run_profile(0.2, "collapsed"))
+    await asyncio.sleep(0.05)
+    with pytest.raises(HTTPException) as excinfo:
+        await run_profile(0.1)
+    assert excinfo.value.status_code == 409
+    response = await first
+    assert any(line.startswith("event-loop;") for line in response.body.decode().splitlines())
+    assert not sampling_profiler.running
+
+    payload = json.loads((await run_profile(0.05)).body)
+    assert payload["$schema"].startswith("https://www.speedscope.app")
+
+
+def test_debug_guards_require_admin_and_feature_toggle(monkeypatch):
+    token = require_admin_token()
+    with pytest.raises(HTTPException) as excinfo:
+        token("Bearer anything")
+    assert excinfo.value.status_code == 404  # disabled until a token is configured
+    monkeypatch.setattr(config.server, "admin_token", "s3cret")
+    token("Bearer s3cret")
+    for header in (None, "Bearer wrong", "s3cret", "Basic s3cret"):
+        with pytest.raises(HTTPException) as excinfo:
+            token(header)
+        assert excinfo.value.status_code == 401
+
+    guard = require_permission("configure_system")
+    assert guard("admin") == "admin"
+    for role, status in ((None, 401), ("viewer", 403)):
+        with pytest.raises(HTTPException) as excinfo:
+            guard(role)
+        assert excinfo.value.status_code == status
+
+    feature = require_feature("observability.deep-metrics")
+    feature()
+    control_center.update_features([{"id": "observability.deep-metrics", "enabled": False}])
+    try:
+        with pytest.raises(HTTPException) as excinfo:
+            feature()
+        assert excinfo.value.status_code == 404
+    finally:
+        control_center.update_features([{"id": "observability.deep-metrics", "enabled": True}])
+
+
+class _Retained:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_heap_snapshots_group_growth_by_tornado_module():
+    await start_heap_tracing()
+    try:
+        first = await take_heap_snapshot()
+        retained = [_Retained() for _ in range(5000)]
+        second = await take_heap_snapshot()
+        diff = await heap_diff(first["id"], second["id"])
+    finally:
+        await stop_heap_tracing()
+    assert second["tracedBytes"] > 0
+    grown = next(item for item in diff["modules"] if item["module"] == "test_debug")
+    assert grown["countDiff"] >= len(retained)
+    with pytest.raises(HTTPException) as excinfo:
+        await heap_top(snapshot_id=10_000)
+    assert excinfo.value.status_code == 404
+    with pytest.raises(HTTPException) as excinfo:
+        await take_heap_snapshot()
+    assert excinfo.value.status_code == 409
+
+
+def test_process_metrics_sampler_feeds_rss_and_gc_series():
+    center = TelemetryCenter()
+    sampler = ProcessMetricsSampler(center)
+    sampler.sample()
+    gc.collect()
+    sampler.sample()
+    snapshot = center.snapshot()
+    assert snapshot["gauges"]["process.rss"] > 0
+    assert 'gc.count{generation="0"}' in snapshot["gauges"]
+    assert snapshot["counters"]['gc.collections{generation="2"}'] >= 1
+    assert center.snapshot(window="1m")["gauges"]["process.rss"] == snapshot["gauges"]["process.rss"]
+    text = OpenMetricsRenderer(center, ttl=0).render()
+    assert "# TYPE process_rss_bytes gauge" in text
+    assert "# TYPE gc_count gauge" in text and 'gc_count{generation="0"} ' in text
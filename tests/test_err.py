@@ -0,0 +1,178 @@
+import random
+from time import monotonic
+
+import pytest
+from fastapi import HTTPException
+
+from tornado_ai.api.controllers.command import CommandPayload, execute_command
+from tornado_ai.core.decision.err import CircuitOpenError, ErrorRecoveryAndResilience, RetryPolicy
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+from tornado_ai.shared.types import ToolExecutionResult
+from tornado_ai.tools.registry import tool_registry
+
+
+def _engine(**overrides):
+    delays = []
+
+    async def sleep(seconds):
+        delays.append(seconds)
+
+    options = {
+        "registry": tool_registry,
+        "retry": RetryPolicy(attempts=3, base_delay=0.1, max_delay=1.0),
+        "failure_threshold": 3,
+        "reset_timeout": 30.0,
+        "center": TelemetryCenter(),
+        "sleep": sleep,
+        "rng": random.Random(7),
+    }
+    options.update(overrides)
+    return ErrorRecoveryAndResilience(**options), delays
+
+
+def _completed(tool_id, params):
+    return ToolExecutionResult(toolId=tool_id, status="completed", output={"params": params})
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried_with_jittered_backoff():
+    engine, delays = _engine()
+    calls = []
+
+    def attempt(tool_id, params):
+        calls.append(tool_id)
+        if len(calls) < 3:
+            raise ConnectionError("reset by peer")
+        return _completed(tool_id, params)
+
+    result = await engine.execute("sqlmap_scan.sim", {}, attempt, target_id="t")
+    assert result.status == "completed" and len(calls) == 3
+    assert len(delays) == 2 and 0 <= delays[0] <= 0.1 and 0 <= delays[1] <= 0.2
+    assert engine.breaker("sqlmap_scan.sim").state == "closed"
+    assert engine.breaker("sqlmap_scan.sim").failures == 0
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_recovers_through_a_probe():
+    engine, _ = _engine(retry=RetryPolicy(attempts=1))
+    calls = []
+
+    def broken(tool_id, params):
+        calls.append(tool_id)
+        return ToolExecutionResult(toolId=tool_id, status="errored", output={})
+
+    for _ in range(3):
+        assert (await engine.execute("sqlmap_scan.sim", {}, broken)).status == "errored"
+    assert engine.breaker("sqlmap_scan.sim").state == "open"
+    with pytest.raises(CircuitOpenError):
+        await engine.execute("sqlmap_scan.sim", {}, broken)
+    assert len(calls) == 3  # the open breaker never reached the tool
+
+    engine.breaker("sqlmap_scan.sim").changed_at = monotonic() - 31
+    result = await engine.execute("sqlmap_scan.sim", {}, _completed)
+    assert result.status == "completed"
+    assert engine.breaker_states()["tools"]["sqlmap_scan.sim"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_target_breaker_isolates_one_target():
+    engine, _ = _engine(retry=RetryPolicy(attempts=1))
+
+    def flaky_on_a(tool_id, params):
+        if params["target"] == "a":
+            raise TimeoutError()
+        return _completed(tool_id, params)
+
+    for index in range(6):
+        target = "a" if index % 2 == 0 else "b"
+        try:
+            await engine.execute("sqlmap_scan.sim", {"target": target}, flaky_on_a, target_id=target)
+        except TimeoutError:
+            pass
+    assert engine.breaker("sqlmap_scan.sim", "a").state == "open"
+    assert engine.breaker("sqlmap_scan.sim").state == "closed"  # successes on b keep the tool healthy
+    with pytest.raises(CircuitOpenError):
+        await engine.execute("sqlmap_scan.sim", {"target": "a"}, flaky_on_a, target_id="a")
+    assert (await engine.execute("sqlmap_scan.sim", {"target": "b"}, flaky_on_a, target_id="b")).status == "completed"
+    states = engine.breaker_states()
+    assert [(entry["targetId"], entry["state"]) for entry in states["targets"]] == [("a", "open")]
+
+
+def test_breaker_bound_only_evicts_closed_target_breakers():
+    engine, _ = _engine(max_breakers=2)
+    engine.breaker("sqlmap_scan.sim").failure(monotonic())
+    tripped = engine.breaker("sqlmap_scan.sim", "a")
+    tripped.state = "open"
+    for index in range(10):
+        engine.breaker("sqlmap_scan.sim", f"t-{index}")
+    assert engine.breaker("sqlmap_scan.sim", "a") is tripped
+    assert engine.breaker("sqlmap_scan.sim").failures == 1
+    states = engine.breaker_states()
+    assert states["tools"]["sqlmap_scan.sim"]["failures"] == 1
+    assert [entry["targetId"] for entry in states["targets"]] == ["a"]
+    assert len(engine._target_breakers) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_tool_falls_back_to_alternate_with_its_parameters():
+    engine, delays = _engine()
+
+    def nmap_down(tool_id, params):
+        if tool_id == "nmap_scan.sim":
+            raise ConnectionError("scanner unavailable")
+        return _completed(tool_id, params)
+
+    params = {"targets": ["10.0.0.1"], "intensity": "high", "scripts": ["vuln"]}
+    result = await engine.execute("nmap_scan.sim", params, nmap_down)
+    assert result.toolId == "masscan_scan.sim"
+    assert result.output["params"] == {"targets": ["10.0.0.1"]}
+    assert result.telemetry["fallbackFrom"] == "nmap_scan.sim"
+    assert len(delays) == 2
+
+
+@pytest.mark.asyncio
+async def test_permanent_errors_are_not_retried():
+    engine, delays = _engine()
+    with pytest.raises(KeyError):
+        await engine.execute("missing.sim", {}, lambda tool_id, params: {}[tool_id])
+    assert delays == [] and engine.breaker("missing.sim").failures == 0
+
+
+@pytest.mark.asyncio
+async def test_command_rejects_open_breakers_with_503(tmp_path, monkeypatch):
+    monkeypatch.setattr("tornado_ai.api.controllers.command.AUDIT_PATH", tmp_path / "audit.log.jsonl")
+    engine, _ = _engine()
+    monkeypatch.setattr("tornado_ai.api.controllers.command.err", engine)
+    breaker = engine.breaker("sqlmap_scan.sim")
+    breaker.state, breaker.changed_at = "open", monotonic()
+    with pytest.raises(HTTPException) as excinfo:
+        await execute_command(CommandPayload(toolId="sqlmap_scan.sim", params={"target": "https://x"}, useCache=False))
+    assert excinfo.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_retries_and_alternates_stop_at_the_deadline():
+    engine, delays = _engine(retry=RetryPolicy(attempts=5, base_delay=10.0, max_delay=10.0, deadline=0.5))
+    calls = []
+
+    def down(tool_id, params):
+        calls.append(tool_id)
+        raise ConnectionError("scanner unavailable")
+
+    # Every backoff would overrun the deadline, so nothing sleeps and each candidate runs once.
+    with pytest.raises(ConnectionError):
+        await engine.execute("nmap_scan.sim", {"targets": ["10.0.0.1"]}, down)
+    assert delays == [] and calls == ["nmap_scan.sim", "masscan_scan.sim"]
+
+    calls.clear()
+    with pytest.raises(ConnectionError):
+        await engine.execute("nmap_scan.sim", {}, down, deadline=monotonic() - 1.0)
+    assert calls == ["nmap_scan.sim"]
+
+
+def test_alternates_come_from_the_fallback_actions():
+    engine, _ = _engine()
+    assert engine.alternates("nmap_scan.sim") == ["masscan_scan.sim"]
+    assert engine.fallback_actions("nmap_scan.sim")[-1] == "Switch to masscan for confirmation"
+    assert engine.alternates("nuclei_scan.sim") == []
+    assert engine.alternates("nmap_scan.sim") == _engine(registry=None)[0].alternates("nmap_scan.sim")
@@ -0,0 +1,112 @@
+import json
+import time
+
+from tornado_ai.core.observability.exporters import (
+    JsonlFileExporter,
+    LocalCollector,
+    OtlpJsonFileExporter,
+    SocketExporter,
+    TelemetryExportPipeline,
+    otlp_metrics,
+)
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+
+
+def _read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_pipeline_flushes_spans_and_metric_deltas_on_stop(tmp_path):
+    center = TelemetryCenter(head_sample_rate=1.0)
+    path = tmp_path / "telemetry.jsonl"
+    pipeline = TelemetryExportPipeline(center, [JsonlFileExporter(path)], flush_interval=60.0)
+    pipeline.start()
+    with center.span("export.root"):
+        with center.span("export.child"):
+            pass
+    center.counter("export.requests").labels().inc(3)
+    pipeline.stop()
+
+    records = _read_lines(path)
+    spans = [record for record in records if record["kind"] == "span"]
+    assert {span["name"] for span in spans} == {"export.root", "export.child"}
+    metrics = [record for record in records if record["kind"] == "metric"]
+    assert [m["delta"] for m in metrics if m["name"] == "export_requests"] == [3]
+    durations = {m["labels"]["span"]: m["count"] for m in metrics if m["name"] == "span_duration_seconds"}
+    assert durations == {"export.root": 1, "export.child": 1}
+    assert pipeline.stats()["exported"] == 2
+
+    # A second collection only reports what changed since the previous export.
+    center.counter("export.requests").labels().inc()
+    points = {point.name: point for point in pipeline.collect_metrics()}
+    assert points["export_requests"].value == 1
+    assert "span_duration_seconds" not in points
+
+    # Gauges export their last value, and only when it changed.
+    rss = center.gauge("process.rss", unit="bytes").labels()
+    rss.set(2048)
+    points = {point.name: point for point in pipeline.collect_metrics()}
+    assert (points["process_rss_bytes"].kind, points["process_rss_bytes"].value) == ("gauge", 2048)
+    assert "process_rss_bytes" not in {point.name for point in pipeline.collect_metrics()}
+    gauge = otlp_metrics([points["process_rss_bytes"]])["resourceMetrics"][0]["scopeMetrics"][0]["metrics"][0]
+    assert gauge["gauge"]["dataPoints"][0]["asDouble"] == 2048
+
+
+def test_pipeline_drops_when_queue_is_full():
+    center = TelemetryCenter(head_sample_rate=1.0)
+    pipeline = TelemetryExportPipeline(center, [], max_queue=2)
+    center.add_span_listener(pipeline.enqueue)
+    for _ in range(5):
+        with center.span("export.burst"):
+            pass
+    stats = pipeline.stats()
+    assert stats["queued"] == 2
+    assert stats["dropped"] == 3
+
+
+def test_otlp_file_and_socket_exporters(tmp_path):
+    center = TelemetryCenter(head_sample_rate=1.0)
+    collector = LocalCollector().start()
+    path = tmp_path / "otlp.jsonl"
+    pipeline = TelemetryExportPipeline(
+        center, [OtlpJsonFileExporter(path), SocketExporter(*collector.address)], flush_interval=60.0
+    )
+    pipeline.start()
+    with center.span("export.otlp", tool="nmap"):
+        pass
+    pipeline.stop()
+
+    traces, metrics = _read_lines(path)
+    span = traces["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert span["name"] == "export.otlp"
+    assert span["attributes"] == [{"key": "tool", "value": {"stringValue": "nmap"}}]
+    histogram = metrics["resourceMetrics"][0]["scopeMetrics"][0]["metrics"][0]
+    assert histogram["histogram"]["aggregationTemporality"] == 1
+
+    deadline = time.time() + 2.0
+    while len(collector.records) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    collector.stop()
+    assert {record["kind"] for record in collector.records} == {"span", "metric"}
+
+
+def test_metric_deltas_restart_after_resets():
+    center = TelemetryCenter()
+    pipeline = TelemetryExportPipeline(center, [])
+    requests = center.counter("export.requests").labels()
+    latency = center.histogram("export.latency").labels()
+    requests.inc(5)
+    latency.observe(0.002)
+    pipeline.collect_metrics()
+
+    center.reset()
+    requests.inc(7)  # higher than before the reset, but only 7 happened since
+    latency.observe(20.0)
+    points = {point.name: point for point in pipeline.collect_metrics()}
+    assert points["export_requests"].value == 7
+    assert points["export_requests"].start == center.reset_at
+    assert (points["export_latency_seconds"].count, points["export_latency_seconds"].total) == (1, 20.0)
+
+    requests.reset()  # a series reset on its own shows up as a decrease
+    requests.inc(2)
+    assert [point.value for point in pipeline.collect_metrics() if point.name == "export_requests"] == [2]
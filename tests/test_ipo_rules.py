@@ -0,0 +1,104 @@
+import json
+import os
+
+import pytest
+
+from tornado_ai.api.controllers.intelligence import (
+    OptimizeParametersBatchPayload,
+    OptimizeParametersPayload,
+    optimize_parameters_batch,
+)
+from tornado_ai.core.decision.ipo import IntelligentParameterOptimizer, compile_rules
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+from tornado_ai.shared.types import ParameterRuleSet, TargetProfile
+
+
+def _profile(environment="staging", criticality="medium", asset_kind="webapp"):
+    return TargetProfile(
+        targetId="t-1", assetKind=asset_kind, environment=environment, cvss=7.0, criticality=criticality
+    )
+
+
+def test_bundled_rules_reproduce_the_original_guardrails():
+    ipo = IntelligentParameterOptimizer()
+    base = {"targets": ["t-1"]}
+    production = _profile(environment="production")
+    assert ipo.suggest("masscan_scan.sim", base, production).suggestedParams == {"targets": ["t-1"], "rate": 1000}
+    assert ipo.suggest("masscan_scan.sim", base, _profile()).suggestedParams["rate"] == 5000
+    assert ipo.suggest("nuclei_scan.sim", {}, _profile(criticality="high")).suggestedParams == {
+        "severity": ["high", "critical"]
+    }
+    assert ipo.suggest("nuclei_scan.sim", {}, _profile()).suggestedParams == {"severity": ["medium", "high"]}
+    sqlmap = ipo.suggest("sqlmap_scan.sim", {"url": "u"}, production)
+    assert sqlmap.suggestedParams == {"url": "u", "risk": "2"}
+    assert sqlmap.rationale == "Adjust SQLMap risk profile according to environment sensitivity."
+    other = ipo.suggest("nmap_scan.sim", base, _profile(asset_kind="cloud"))
+    assert other.suggestedParams == base
+    assert other.rationale == "Standard parameter optimization for cloud."
+
+
+def test_rules_merge_by_priority_then_specificity_then_order():
+    rules = ParameterRuleSet.model_validate(
+        {
+            "rules": [
+                {"id": "env", "tool": "x", "environments": ["production"], "params": {"rate": 1}, "rationale": "env"},
+                {"id": "tool", "tool": "x", "params": {"rate": 2, "depth": 1}, "rationale": "tool"},
+                {"id": "all", "params": {"timeout": 30}},
+                {"id": "pinned", "tool": "x", "params": {"depth": 9}, "priority": 10},
+            ],
+            "defaultRationale": "{toolId} on {environment}",
+        }
+    )
+    index = compile_rules(rules)
+    entry = index.lookup("x", "production", "low")
+    assert entry.sources == ("all", "tool", "env", "pinned")
+    assert entry.params == {"timeout": 30, "rate": 1, "depth": 9}
+    assert entry.rationale == "env"
+    ipo = IntelligentParameterOptimizer(rules=rules)
+    suggestion = ipo.suggest("unknown", {}, _profile())
+    assert suggestion.suggestedParams == {"timeout": 30}
+    assert suggestion.rationale == "unknown on staging"
+    # Suggestions get their own copies of rule values.
+    ipo.suggest("x", {}, _profile()).suggestedParams["depth"] = 0
+    assert index.lookup("x", "staging", "medium").params["depth"] == 9
+
+
+def test_batch_matches_single_suggestions():
+    ipo = IntelligentParameterOptimizer()
+    requests = [
+        (tool, {"targets": ["t"]}, _profile(environment, criticality))
+        for tool in ("masscan_scan.sim", "nuclei_scan.sim", "sqlmap_scan.sim", "nmap_scan.sim")
+        for environment in ("production", "lab")
+        for criticality in ("low", "high")
+    ]
+    assert ipo.suggest_many(requests) == [ipo.suggest(*request) for request in requests]
+
+
+def test_rule_file_hot_reloads_and_survives_bad_edits(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"rules": [{"id": "a", "tool": "x", "params": {"rate": 1}}]}))
+    center = TelemetryCenter()
+    ipo = IntelligentParameterOptimizer(path=path, reload_interval=0.0, center=center)
+    assert ipo.suggest("x", {}, _profile()).suggestedParams == {"rate": 1}
+
+    path.write_text(json.dumps({"rules": [{"id": "a", "tool": "x", "params": {"rate": 22}}]}))
+    os.utime(path, ns=(1, 1))
+    assert ipo.suggest("x", {}, _profile()).suggestedParams == {"rate": 22}
+    assert ipo.version == 1
+
+    path.write_text(json.dumps({"rules": [{"id": "a", "tool": "x", "rationale": "{missing}"}]}))
+    os.utime(path, ns=(2, 2))
+    assert ipo.suggest("x", {}, _profile()).suggestedParams == {"rate": 22}
+    reloads = center.counter("ipo.rules.reloads", labelnames=("outcome",))
+    assert (reloads.labels("loaded").value, reloads.labels("failed").value) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_returns_one_suggestion_per_item():
+    items = [
+        OptimizeParametersPayload(toolId=tool, target=_profile(environment="production"), params={"targets": ["t"]})
+        for tool in ("masscan_scan.sim", "nmap_scan.sim")
+    ]
+    suggestions = await optimize_parameters_batch(OptimizeParametersBatchPayload(items=items))
+    assert [suggestion.toolId for suggestion in suggestions] == ["masscan_scan.sim", "nmap_scan.sim"]
+    assert suggestions[0].suggestedParams["rate"] == 1000
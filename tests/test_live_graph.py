@@ -0,0 +1,105 @@
+import asyncio
+import heapq
+import json
+import math
+import random
+
+import pytest
+
+from tornado_ai.api.controllers.command import CommandPayload, execute_command
+from tornado_ai.api.controllers.intelligence import LiveGraphPayload, stream_live_graph_updates, update_live_graph
+from tornado_ai.core.decision import live_graphs, sacd
+from tornado_ai.core.decision.attack_graph import _cost
+from tornado_ai.core.decision.live_graph import LiveAttackGraph, LiveGraphRegistry
+from tornado_ai.shared.types import PriorToolResult, TargetProfile
+from tornado_ai.tools.registry import tool_registry
+
+
+def _profile(target_id: str, asset_kind: str = "webapp") -> TargetProfile:
+    return TargetProfile.model_validate(
+        {
+            "targetId": target_id,
+            "assetKind": asset_kind,
+            "environment": "staging",
+            "cvss": 7.0,
+            "criticality": "high",
+        }
+    )
+
+
+def _recomputed(graph: LiveAttackGraph):
+    """Best cost to every goal from scratch (paths end at the first goal)."""
+
+    distances = {}
+    heap = [(_cost(graph._likelihoods[entry]), entry) for entry in graph._entries]
+    heapq.heapify(heap)
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if node in distances:
+            continue
+        distances[node] = distance
+        if node in graph._goals:
+            continue
+        for (source, target), (likelihood, _) in graph._edges.items():
+            if source == node and target not in distances:
+                heapq.heappush(heap, (distance + _cost(likelihood) + _cost(graph._likelihoods[target]), target))
+    return {goal: distances.get(goal, math.inf) for goal in graph._goals}
+
+
+def test_incremental_repairs_match_full_recomputation():
+    for seed in range(40):
+        rng = random.Random(seed)
+        graph = LiveAttackGraph("fuzz", top=20)
+        for index in range(12):
+            graph.add_node(f"n{index}", likelihood=rng.uniform(0.2, 1.0), entry=index < 2, goal=index >= 9)
+        for _ in range(50):
+            if rng.random() < 0.6:
+                source, target = rng.sample(range(12), 2)
+                graph.add_edge(f"n{source}", f"n{target}", rng.uniform(0.05, 1.0))
+            else:
+                index = rng.randrange(12)
+                graph.add_node(f"n{index}", likelihood=rng.uniform(0.2, 1.0), entry=index < 2, goal=index >= 9)
+            graph.commit()
+            for goal, expected in _recomputed(graph).items():
+                assert math.isclose(graph._dist[goal], expected) or graph._dist[goal] == expected == math.inf
+
+
+def test_findings_reroute_top_paths_and_notify_listeners():
+    registry = LiveGraphRegistry(sacd, tool_registry)
+    received = []
+    registry.add_listener(received.append)
+    registry.graph_for(_profile("web-1"))
+    baseline = registry.current("web-1").paths[0]
+    assert baseline.nodes == ["recon", "access", "priv", "impact"]
+
+    critical = PriorToolResult(toolId="nuclei_scan.sim", success=True, findings=["CVE-2023-1234"], severity="critical")
+    update = registry.apply_results("web-1", [critical])
+    assert update is not None and received == [update]
+    assert update.paths[0].nodes == ["recon", "nuclei_scan.sim:CVE-2023-1234", "access", "priv", "impact"]
+    assert update.paths[0].likelihood > baseline.likelihood
+    assert update.changed == update.paths
+
+    assert registry.apply_results("web-1", [critical]) is None
+    assert registry.apply_results("web-1", [PriorToolResult(toolId="sqlmap_scan.sim", success=False)]) is None
+    assert len(received) == 1
+
+    analysis = registry.analysis("web-1", paths=2)
+    assert analysis.paths[0].nodes == update.paths[0].nodes
+    assert {node.id for node in analysis.graph.nodes} >= set(update.paths[0].nodes)
+
+
+@pytest.mark.asyncio
+async def test_command_results_feed_live_graph_and_stream(tmp_path, monkeypatch):
+    monkeypatch.setattr("tornado_ai.api.controllers.command.AUDIT_PATH", tmp_path / "audit.log.jsonl")
+    await update_live_graph(LiveGraphPayload(target=_profile("cloud-1", "cloud")))
+    response = await stream_live_graph_updates("cloud-1")
+    lines = response.body_iterator
+    pending = asyncio.ensure_future(lines.__anext__())
+    await asyncio.sleep(0)
+
+    await execute_command(CommandPayload(toolId="prowler_assess.sim", targetId="cloud-1", useCache=False))
+    update = json.loads(await asyncio.wait_for(pending, 1.0))
+    await lines.aclose()
+    assert update["targetId"] == "cloud-1"
+    assert "prowler_assess.sim:iam-admin-check" in update["paths"][0]["nodes"]
+    assert live_graphs.current("cloud-1").version == update["version"]
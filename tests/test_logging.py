@@ -0,0 +1,68 @@
+import json
+import logging
+
+from tornado_ai.core.metrics.logger import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RateLimitFilter,
+    SamplingFilter,
+)
+
+
+def _record(name="tornado_ai.test", level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_merges_structured_extra_fields():
+    payload = json.loads(JsonFormatter().format(_record(host="127.0.0.1", port=8000)))
+    assert payload["message"] == "hello world"
+    assert payload["host"] == "127.0.0.1"
+    assert payload["port"] == 8000
+    assert "args" not in payload and "msg" not in payload
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(maxsize=2)
+    args = ["mutable"]
+    for _ in range(5):
+        handler.handle(_record(msg="value %s", args=(args,)))
+    args.append("changed")
+    assert handler.queue.qsize() == 2
+    assert handler.queue.get_nowait().getMessage() == "value ['mutable']"
+
+
+def test_sampling_and_rate_limit_filters_apply_per_logger_prefix():
+    sampler = SamplingFilter({"tornado_ai.noisy": 0.0})
+    assert not sampler.filter(_record("tornado_ai.noisy.child"))
+    assert sampler.filter(_record("tornado_ai.noisy.child", level=logging.WARNING))
+    assert sampler.filter(_record("tornado_ai.quiet"))
+
+    now = [0.0]
+    limiter = RateLimitFilter({"tornado_ai.noisy": 2.0}, clock=lambda: now[0])
+    results = [limiter.filter(_record("tornado_ai.noisy")) for _ in range(5)]
+    assert results == [True, True, False, False, False]
+    now[0] = 1.0
+    record = _record("tornado_ai.noisy")
+    assert limiter.filter(record)
+    assert record.suppressed == 3
+    assert limiter.filter(_record("tornado_ai.other"))
+
+
+def test_fractional_rate_limits_let_a_record_through_per_interval():
+    now = [0.0]
+    limiter = RateLimitFilter({"tornado_ai.noisy": 0.2}, clock=lambda: now[0])
+    passed = []
+    for tick in range(21):
+        now[0] = float(tick)
+        if limiter.filter(_record("tornado_ai.noisy")):
+            passed.append(tick)
+    assert passed == [0, 5, 10, 15, 20]
+
+
+def test_json_formatter_timestamps_match_format_time():
+    record = _record()
+    assert json.loads(JsonFormatter().format(record))["timestamp"] == logging.Formatter().formatTime(record)
+    formatter = JsonFormatter(datefmt="%H:%M")
+    assert json.loads(formatter.format(record))["timestamp"] == logging.Formatter().formatTime(record, "%H:%M")
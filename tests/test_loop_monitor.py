@@ -0,0 +1,51 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from tornado_ai.core.observability.loop_monitor import InstrumentedThreadPoolExecutor, LoopMonitor
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+
+
+async def _blocking_handler() -> None:
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_records_lag_and_logs_blocking_stack(caplog):
+    center = TelemetryCenter()
+    monitor = LoopMonitor(center, interval=0.02, stall_threshold=0.1)
+    monitor.start(max_workers=2)
+    with caplog.at_level(logging.WARNING, logger="tornado_ai.loop_monitor"):
+        await asyncio.sleep(0.05)
+        await asyncio.get_running_loop().create_task(_blocking_handler(), name="slow-handler")
+        await asyncio.sleep(0.05)
+        await asyncio.get_running_loop().run_in_executor(None, time.sleep, 0.01)
+    await monitor.stop()
+
+    histograms = center.snapshot()["histograms"]
+    assert histograms["loop.lag"]["max"] >= 0.2
+    assert histograms["loop.tasks"]["count"] > 0
+    assert histograms["executor.wait"]["count"] == 1
+    assert center.snapshot()["counters"]["loop.stalls"] == 1
+    record = next(record for record in caplog.records if record.name == "tornado_ai.loop_monitor")
+    assert "slow-handler" in record.task
+    assert "_blocking_handler" in record.stack
+
+
+def test_instrumented_executor_tracks_busy_workers_and_queue_depth():
+    executor = InstrumentedThreadPoolExecutor(max_workers=1, center=TelemetryCenter())
+    release = threading.Event()
+    first = executor.submit(release.wait)
+    second = executor.submit(lambda: None)
+    time.sleep(0.05)
+    assert executor.busy == 1
+    assert executor.utilization == 1.0
+    assert executor.queue_depth == 1
+    release.set()
+    first.result()
+    second.result()
+    executor.shutdown()
+    assert executor.busy == 0
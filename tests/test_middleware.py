@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from tornado_ai.api.middleware import TelemetryMiddleware
+from tornado_ai.core.observability.slow_requests import SlowRequestLog
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+
+
+def _build_app(center: TelemetryCenter, slow_log: SlowRequestLog) -> FastAPI:
+    app = FastAPI()
+    api = APIRouter(prefix="/api")
+    items = APIRouter(prefix="/items")
+
+    @items.post("/{item_id}")
+    async def post_item(item_id: str, payload: dict):
+        with center.span("items.store"):
+            await asyncio.sleep(0.06 if item_id == "slow" else 0)
+        return {"id": item_id, **payload}
+
+    api.include_router(items)
+    app.include_router(api)
+    app.add_middleware(TelemetryMiddleware, center=center, slow_log=slow_log)
+    return app
+
+
+async def _call(app: FastAPI, method: str, path: str, body: bytes = b"") -> int:
+    messages = []
+    request = {"type": "http.request", "body": body, "more_body": False}
+
+    async def receive():
+        return request
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "scheme": "http",
+        "server": ("test", 80),
+        "client": ("test", 1),
+    }
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_records_route_latency_sizes_and_slow_requests():
+    center = TelemetryCenter(head_sample_rate=0.0, tail_latency_threshold=10.0)
+    slow_log = SlowRequestLog(threshold=0.05, capacity=2)
+    app = _build_app(center, slow_log)
+
+    assert await _call(app, "POST", "/api/items/fast", b'{"a": 1}') == 200
+    assert await _call(app, "POST", "/api/items/slow", b'{"a": 1}') == 200
+    assert await _call(app, "GET", "/nowhere") == 404
+
+    histograms = center.snapshot()["histograms"]
+    assert histograms['http.server.duration{method="POST",route="/api/items/{item_id}",status="200"}']["count"] == 2
+    assert histograms['http.server.duration{method="GET",route="__unmatched__",status="404"}']["count"] == 1
+    request_size = histograms['http.server.request.size{method="POST",route="/api/items/{item_id}"}']
+    assert request_size["max"] == pytest.approx(8, rel=0.02)
+    assert histograms['http.server.response.size{method="POST",route="/api/items/{item_id}"}']["count"] == 2
+
+    [entry] = slow_log.recent()
+    assert entry["route"] == "/api/items/{item_id}" and entry["path"] == "/api/items/slow"
+    [root] = entry["spans"]
+    assert root["name"] == "http.request"
+    assert [child["name"] for child in root["children"]] == ["items.store"]
@@ -0,0 +1,41 @@
+from tornado_ai.core.observability.openmetrics import OpenMetricsRenderer
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+
+
+def test_renders_labeled_counters_and_histograms():
+    center = TelemetryCenter(head_sample_rate=1.0)
+    center.increment_counter("adapter.runs", labels={"tool": "nmap_scan.sim"})
+    with center.span("command"):
+        center.observe_latency("adapter.latency", 0.02, {"tool": "nmap_scan.sim"})
+    text = OpenMetricsRenderer(center, ttl=0).render()
+
+    assert "# TYPE adapter_runs counter" in text
+    assert 'adapter_runs_total{tool="nmap_scan.sim"} 1' in text
+    assert "# TYPE adapter_latency_seconds histogram" in text
+    assert 'adapter_latency_seconds_bucket{tool="nmap_scan.sim",le="0.01"} 0' in text
+    assert 'adapter_latency_seconds_bucket{tool="nmap_scan.sim",le="0.025"} 1 # {trace_id=' in text
+    assert 'adapter_latency_seconds_count{tool="nmap_scan.sim"} 1' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_render_is_cached_until_ttl_expires():
+    center = TelemetryCenter()
+    renderer = OpenMetricsRenderer(center, ttl=60)
+    center.increment_counter("command.invocations")
+    first = renderer.render()
+    center.increment_counter("command.invocations")
+    assert renderer.render() is first
+    renderer.invalidate()
+    assert "command_invocations_total 2" in renderer.render()
+
+
+def test_reset_drops_cached_series_text():
+    center = TelemetryCenter()
+    renderer = OpenMetricsRenderer(center, ttl=60)
+    center.observe_latency("adapter.latency", 0.002)
+    assert 'adapter_latency_seconds_bucket{le="0.0025"} 1' in renderer.render()
+    center.reset()
+    center.observe_latency("adapter.latency", 20.0)  # same count, different buckets
+    text = renderer.render()
+    assert 'adapter_latency_seconds_bucket{le="0.0025"} 0' in text
+    assert 'adapter_latency_seconds_bucket{le="30"} 1' in text
@@ -0,0 +1,153 @@
+import json
+import statistics
+
+import pytest
+
+from tornado_ai.core.decision.batch import BatchAnalyzer
+from tornado_ai.core.decision.performance import ANY, ToolPerformanceStore, ToolStats
+from tornado_ai.core.decision.roe import ResourceOptimizationEngine
+from tornado_ai.core.decision.scheduler import PlanExecutor
+from tornado_ai.core.decision.tsa import ToolSelectionAssistant, ToolSelectionContext
+from tornado_ai.shared.types import TargetProfile, ToolPlan, ToolPlanStep
+from tornado_ai.tools.definitions import tool_definitions
+from tornado_ai.tools.registry import ToolRegistry
+
+
+def _profile(index: int, asset_kind: str = "webapp", cvss: float = 7.5) -> TargetProfile:
+    return TargetProfile.model_validate(
+        {
+            "targetId": f"t-{index}",
+            "assetKind": asset_kind,
+            "environment": "staging",
+            "criticality": "medium",
+            "cvss": cvss,
+        }
+    )
+
+
+def test_running_aggregates_match_full_history():
+    durations = [0.5, 2.0, 3.25, 0.01, 120.0, 7.5, 7.5]
+    stats = ToolStats()
+    for index, duration in enumerate(durations):
+        stats.observe(duration, success=index % 3 != 0, findings=index)
+    assert stats.count == len(durations)
+    assert stats.mean == pytest.approx(statistics.fmean(durations))
+    assert stats.stddev == pytest.approx(statistics.stdev(durations))
+    assert stats.success_rate == pytest.approx((4 + 1) / (7 + 2))
+    assert stats.finding_yield == pytest.approx(21 / 7)
+    # Quantiles are bucket upper bounds: never below the true value, at most 2x above.
+    true_median = statistics.median(durations)
+    assert true_median <= stats.quantile(0.5) <= 2 * true_median
+    assert stats.quantile(1.0) == 120.0
+    assert ToolStats.from_list(json.loads(json.dumps(stats.to_list()))) == stats
+
+
+def test_store_prefers_asset_kind_series_once_it_has_enough_samples():
+    store = ToolPerformanceStore(min_samples=3, refresh_seconds=0)
+    for _ in range(3):
+        store.record("nmap_scan.sim", "cloud", 10.0, True)
+    store.record("nmap_scan.sim", "webapp", 100.0, True)
+    assert store.estimate_duration("nmap_scan.sim", "cloud") == 10.0
+    # Too few webapp samples: fall back to the tool across asset kinds.
+    assert store.estimate_duration("nmap_scan.sim", "webapp") == pytest.approx(32.5)
+    assert store.estimate_duration("nuclei_scan.sim", "webapp") is None
+    estimator = store.durations("cloud", fallback=lambda tool_id: 60.0)
+    assert estimator("nmap_scan.sim") == 10.0 and estimator("nuclei_scan.sim") == 60.0
+    assert store.stats(ANY, "cloud").count == 3
+
+
+def test_snapshot_republishes_only_on_change_and_after_refresh():
+    store = ToolPerformanceStore(min_samples=2, refresh_seconds=3600)
+    assert store.version == 0
+    store.record("nmap_scan.sim", "webapp", 1.0, True)
+    store.record("nmap_scan.sim", "webapp", 1.0, True)
+    assert store.version == 0  # refresh interval not elapsed yet
+    store.refresh_seconds = 0
+    snapshot = store.snapshot()
+    assert snapshot.version == 1
+    assert snapshot.factor("nmap_scan.sim", "webapp") == pytest.approx(0.5 + 3 / 4)
+    assert snapshot.factor("nmap_scan.sim", "api") == snapshot.factors[("nmap_scan.sim", ANY)]
+    assert snapshot.factor("sqlmap_scan.sim", "webapp") == 1.0
+    assert snapshot.success_rates["webapp"] == pytest.approx(3 / 4)
+    store.record("other.sim", None, 1.0, True)  # below min_samples: nothing published changes
+    assert store.snapshot() is snapshot
+
+
+def test_store_persists_snapshot_and_replays_log(tmp_path):
+    path = tmp_path / "performance.json"
+    store = ToolPerformanceStore(compact_every=3, flush_interval=3600)
+    store.open(path)
+    log = path.with_name(path.name + ".log")
+    for index in range(4):
+        store.record("nmap_scan.sim", "webapp", float(index), index != 1, findings=2)
+        if index == 1:
+            assert log.read_text() == ""  # recording only buffers; the writer thread does the I/O
+            store.flush()
+            assert len(log.read_text().splitlines()) == 2
+    store.flush()
+    # Four logged records passed compact_every: all of them are in the snapshot now.
+    assert len(json.loads(path.read_text())) == 3
+    assert log.read_text() == ""
+    store.record("nmap_scan.sim", "webapp", 4.0, True, findings=2)
+    store.flush()
+    assert len(log.read_text().splitlines()) == 1
+    with log.open("a") as handle:
+        handle.write('["nmap_scan.sim","web')  # torn write from a crash
+
+    reopened = ToolPerformanceStore(min_samples=1)
+    reopened.open(path)
+    stats = reopened.stats("nmap_scan.sim", "webapp")
+    assert (stats.count, stats.successes, stats.findings) == (5, 4, 10)
+    assert stats.mean == pytest.approx(2.0)
+    assert log.read_text() == ""
+    reopened.record("nmap_scan.sim", "webapp", 5.0, True)
+    reopened.close()
+    assert reopened.path is None
+    assert json.loads(path.read_text())[0][1][0] == 6  # close() folds buffered records into the snapshot
+
+
+def test_observed_performance_reorders_plans_and_batch_matches():
+    registry = ToolRegistry(tool_definitions)
+    store = ToolPerformanceStore(min_samples=2, refresh_seconds=0)
+    tsa = ToolSelectionAssistant(registry, performance=store)
+    profile = _profile(0)
+    baseline = tsa.build_plan(ToolSelectionContext(profile=profile, history=[]))
+    version = tsa.version
+    leader, runner_up = baseline.steps[0].toolId, baseline.steps[1].toolId
+    for _ in range(20):
+        store.record(leader, "webapp", 5.0, False)
+        store.record(runner_up, "webapp", 5.0, True, findings=3)
+    assert tsa.version != version
+    plan = tsa.build_plan(ToolSelectionContext(profile=profile, history=[]))
+    assert plan.steps[0].toolId == runner_up
+    assert plan.steps.index(next(step for step in plan.steps if step.toolId == leader)) > 0
+
+    kinds = ["webapp", "api", "cloud", "iot"]
+    profiles = [_profile(index, kinds[index % 4], (index * 37 % 101) / 10) for index in range(120)]
+    analyzer = BatchAnalyzer(registry, tsa)
+    assert list(analyzer.plans(profiles, chunk_size=32)) == [
+        tsa.build_plan(ToolSelectionContext(profile=item, history=[])) for item in profiles
+    ]
+
+
+def test_roe_backs_off_for_asset_kinds_that_keep_failing():
+    store = ToolPerformanceStore(min_samples=3, refresh_seconds=0)
+    roe = ResourceOptimizationEngine(performance=store)
+    profile = _profile(0, "cloud")
+    assert roe.recommend_concurrency(profile) == 3
+    for _ in range(5):
+        store.record("prowler_scan.sim", "cloud", 1.0, False)
+    assert roe.recommend_concurrency(profile) == 2
+
+
+def test_plan_projection_uses_observed_durations():
+    store = ToolPerformanceStore(min_samples=1, refresh_seconds=0)
+    store.record("a", "iot", 2.0, True)
+    executor = PlanExecutor(durations=lambda tool_id: 60.0, estimators=store.durations)
+    plan = ToolPlan(
+        targetId="t",
+        summary="test",
+        steps=[ToolPlanStep(toolId=tool, rationale="", score=1.0, category="network") for tool in ("a", "b")],
+    )
+    assert executor.dag(plan, "iot").project(concurrency=1)[0] == 62.0
+    assert executor.dag(plan).project(concurrency=1)[0] == 120.0
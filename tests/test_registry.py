@@ -0,0 +1,46 @@
+from dataclasses import replace
+
+from tornado_ai.core.decision.tsa import ToolSelectionAssistant, ToolSelectionContext
+from tornado_ai.shared.types import TargetProfile
+from tornado_ai.tools.definitions import tool_definitions
+from tornado_ai.tools.registry import ToolRegistry
+
+
+def _clone(definition, suffix):
+    spec = definition.spec.model_copy(update={"id": f"{definition.spec.id}.{suffix}"})
+    return replace(definition, spec=spec)
+
+
+def test_indexes_are_cached_until_the_registry_changes():
+    registry = ToolRegistry(tool_definitions)
+    assert registry.summary() is registry.summary()
+    assert registry.categories() is registry.categories()
+    network = registry.by_category("network")
+    assert network and all(definition.spec.category == "network" for definition in network)
+    assert registry.by_permission("execute_tools")
+    assert registry.for_categories(["network", "osint"]) is registry.for_categories(["osint", "network"])
+
+    version = registry.version
+    extra = _clone(network[0], "copy")
+    registry.register(extra)
+    assert registry.version == version + 1
+    assert registry.by_category("network")[-1] is extra
+    assert registry.categories()["network"] == len(network) + 1
+    assert any(schema["name"] == extra.spec.id for schema in registry.json_schemas())
+
+    registry.unregister(extra.spec.id)
+    assert registry.version == version + 2
+    assert registry.categories()["network"] == len(network)
+
+
+def test_plan_only_considers_relevant_categories():
+    registry = ToolRegistry(tool_definitions)
+    binary = registry.by_category("binary")[0]
+    for index in range(500):
+        registry.register(_clone(binary, f"bulk{index}"))
+    profile = TargetProfile.model_validate(
+        {"targetId": "t1", "assetKind": "webapp", "environment": "production", "criticality": "high", "cvss": 7.5}
+    )
+    plan = ToolSelectionAssistant(registry).build_plan(ToolSelectionContext(profile=profile, history=[]))
+    assert plan.steps
+    assert all(step.category in {"webapp", "osint", "network"} for step in plan.steps)
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from tornado_ai.api.controllers.intelligence import ExecutePlanPayload, execute_plan
+from tornado_ai.core.decision.scheduler import PlanDAG, PlanExecutor
+from tornado_ai.shared.types import TargetProfile, ToolExecutionResult, ToolPlan, ToolPlanStep
+
+DURATIONS = {"a": 10, "b": 1, "c": 5, "d": 20, "e": 2}
+
+
+def _plan(*steps):
+    return ToolPlan(
+        targetId="t",
+        summary="test",
+        steps=[
+            ToolPlanStep(toolId=tool, rationale="", score=10 - index, category="network", prerequisites=list(prereqs))
+            for index, (tool, prereqs) in enumerate(steps)
+        ],
+    )
+
+
+def test_projection_prioritizes_longest_remaining_path():
+    # Score order would start a and b first and finish at 26; the critical path c -> d takes 25.
+    dag = PlanDAG(_plan(("a", ()), ("b", ()), ("c", ()), ("d", ("c", "missing"))), DURATIONS.__getitem__)
+    makespan, windows = dag.project(concurrency=2)
+    assert makespan == 25
+    assert dag.critical_path() == ["c", "d"]
+    assert windows[2] == (0, 5) and windows[3] == (5, 25)
+
+
+def test_cyclic_prerequisites_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        PlanDAG(_plan(("a", ("b",)), ("b", ("a",))), DURATIONS.__getitem__)
+
+
+@pytest.mark.asyncio
+async def test_executor_releases_dependents_and_skips_after_failures():
+    running = {"now": 0, "peak": 0}
+
+    async def runner(step):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(DURATIONS[step.toolId] / 1000)
+        running["now"] -= 1
+        if step.toolId == "b":
+            raise RuntimeError("adapter crashed")
+        return ToolExecutionResult(toolId=step.toolId, status="completed", output={})
+
+    plan = _plan(("a", ()), ("b", ()), ("c", ()), ("d", ("c",)), ("e", ("b",)))
+    report = await PlanExecutor(DURATIONS.__getitem__).execute(plan, runner, concurrency=2)
+    steps = {step.toolId: step for step in report.steps}
+
+    assert running["peak"] == 2
+    assert steps["d"].start >= steps["c"].end
+    assert steps["b"].status == "errored" and steps["b"].error == "adapter crashed"
+    assert steps["e"].status == "skipped" and steps["e"].start is None
+    assert report.projectedMakespan == 25
+    assert report.actualMakespan >= 0.025
+
+
+@pytest.mark.asyncio
+async def test_execute_plan_runs_aide_plan_through_command_surface(tmp_path, monkeypatch):
+    monkeypatch.setattr("tornado_ai.api.controllers.command.AUDIT_PATH", tmp_path / "audit.log.jsonl")
+    target = TargetProfile.model_validate(
+        {"targetId": "plan-1", "assetKind": "webapp", "environment": "lab", "cvss": 6.0, "criticality": "high"}
+    )
+    report = await execute_plan(ExecutePlanPayload(target=target))
+    steps = {step.toolId: step for step in report.steps}
+    assert report.concurrency >= 1
+    assert all(step.status in {"completed", "cached"} for step in report.steps)
+    assert steps["gobuster_scan.sim"].start >= steps["nmap_scan.sim"].end
+    assert report.criticalPath[0] == "nmap_scan.sim"
+    assert len((tmp_path / "audit.log.jsonl").read_text().splitlines()) == len(report.steps)
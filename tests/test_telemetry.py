@@ -0,0 +1,224 @@
+import random
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from tornado_ai.core.observability.histogram import Histogram
+from tornado_ai.core.observability.metrics import HistogramSeries
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+
+
+def test_histogram_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-3.0, 1.0) for _ in range(20_000)]
+    histogram = Histogram("latency", relative_accuracy=0.01)
+    for value in values:
+        histogram.observe(value)
+
+    ordered = sorted(values)
+    snapshot = histogram.snapshot()
+    for label, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999)):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert snapshot[label] == pytest.approx(exact, rel=0.011)
+    assert snapshot["count"] == len(values)
+    assert snapshot["min"] == ordered[0]
+    assert snapshot["max"] == ordered[-1]
+
+
+def test_histogram_memory_is_bounded_and_mergeable():
+    left = Histogram("left", max_buckets=32)
+    right = Histogram("right", max_buckets=32)
+    for exponent in range(-8, 4):
+        left.observe(10.0**exponent)
+        right.observe(2 * 10.0**exponent)
+    assert len(left._buckets) <= 32
+
+    left.merge(right)
+    assert left.count == 24
+    assert left.maximum == 2000.0
+    with pytest.raises(ValueError):
+        left.merge(Histogram("coarse", relative_accuracy=0.05))
+
+
+def test_telemetry_snapshot_reports_extended_percentiles():
+    center = TelemetryCenter()
+    for _ in range(3):
+        center.observe_latency("adapter.test", 0.25)
+    stats = center.snapshot()["histograms"]["adapter.test"]
+    assert stats["count"] == 3
+    assert set(stats) >= {"p50", "p90", "p95", "p99", "p999"}
+    assert stats["p99"] == pytest.approx(0.25, rel=0.01)
+
+
+def test_span_buffer_is_bounded():
+    center = TelemetryCenter(span_capacity=8, head_sample_rate=1.0)
+    for index in range(20):
+        with center.span("work", index=index):
+            pass
+    spans = center.recent_spans(0)
+    assert len(spans) == 8
+    assert spans[-1].attributes["index"] == 19
+    assert center.snapshot()["histograms"]['span.duration{span="work"}']["count"] == 20
+
+
+def test_child_spans_link_to_parent_trace():
+    center = TelemetryCenter(head_sample_rate=1.0)
+    with center.span("parent") as parent:
+        with center.span("child"):
+            pass
+    tree = center.trace(parent.trace_id)
+    assert [node["name"] for node in tree] == ["parent"]
+    assert [child["name"] for child in tree[0]["children"]] == ["child"]
+
+
+def test_tail_sampling_keeps_slow_and_failed_traces():
+    center = TelemetryCenter(head_sample_rate=0.0, tail_latency_threshold=0.0)
+    with center.span("slow"):
+        pass
+    assert [span.name for span in center.recent_spans()] == ["slow"]
+
+    center = TelemetryCenter(head_sample_rate=0.0, tail_latency_threshold=60.0)
+    with center.span("fast"):
+        pass
+    with pytest.raises(RuntimeError):
+        with center.span("failing"):
+            with center.span("inner"):
+                raise RuntimeError("boom")
+    assert [span.name for span in center.recent_spans()] == ["inner", "failing"]
+    assert center.snapshot()["spanBuffer"]["tracesSampledOut"] == 1
+
+
+def test_rolling_windows_expire_old_buckets():
+    from tornado_ai.core.observability.windows import RollingCounter, RollingHistogram
+
+    counter = RollingCounter(horizon=3600, resolution=10)
+    latency = RollingHistogram("latency")
+    counter.add(30, now=990.0)
+    latency.observe(5.0, now=990.0)
+    counter.add(12, now=1_295.0)
+    latency.observe(0.1, now=1_295.0)
+
+    assert counter.total(300, now=1_299.0) == 12
+    assert counter.total(3600, now=1_299.0) == 42
+    assert counter.rate(60, now=1_299.0) == pytest.approx(12 / 59)
+    assert latency.merged(60, now=1_299.0).count == 1
+    assert latency.merged(3600, now=1_299.0).maximum == 5.0
+
+
+def test_batched_observations_match_single_observations():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(-6.0, 2.0) for _ in range(5_000)] + [0.0, -1.0]
+    batched, single = Histogram("batched"), Histogram("single")
+    batched.observe_many(values)
+    for value in values:
+        single.observe(value)
+    assert batched.snapshot() == pytest.approx(single.snapshot())
+    assert batched.cumulative_counts([1e-4, 1e-3, 1e-2]) == single.cumulative_counts([1e-4, 1e-3, 1e-2])
+
+
+def test_handles_fold_updates_into_window_buckets(monkeypatch):
+    clock = SimpleNamespace(now=990.0, start=lambda: None)
+    monkeypatch.setattr("tornado_ai.core.observability.metrics.coarse_clock", clock)
+    center = TelemetryCenter(head_sample_rate=1.0)
+    runs = center.counter("adapter.runs").labels()
+    latency = center.histogram("adapter.latency").labels()
+    runs.inc(30)
+    latency.observe(5.0)
+    clock.now = 1_295.0
+    runs.inc(12)
+    with center.span("command"):
+        latency.observe(0.1)
+        latency.observe(0.2)
+
+    assert runs.window.total(300, now=1_299.0) == 12
+    assert runs.window.total(3600, now=1_299.0) == 42
+    assert latency.window.merged(60, now=1_299.0).count == 2
+    assert latency.histogram.count == 3
+    assert latency.exemplar.value == 0.1  # the first sampled observation of the bucket
+    clock.now = 1_305.0
+    with center.span("command"):
+        latency.observe(0.3)
+    assert latency.exemplar.value == 0.3
+
+
+def test_observations_racing_a_flush_are_not_lost():
+    latency = TelemetryCenter().histogram("adapter.latency").labels()
+
+    class _Racing(list):
+        def append(self, value):
+            # Another worker flushes between observe() reading the buffer and appending to it.
+            flusher = threading.Thread(target=lambda: latency.histogram)
+            flusher.start()
+            flusher.join()
+            super().append(value)
+
+    latency.observe(1.0)
+    latency._pending = _Racing(latency._pending)
+    latency.observe(2.0)
+    latency.observe(3.0)
+    assert latency.histogram.count == 3
+
+
+def test_concurrent_observations_are_counted_once(monkeypatch):
+    monkeypatch.setattr(HistogramSeries, "FOLD_EVERY", 4)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    try:
+        latency = TelemetryCenter().histogram("adapter.latency").labels()
+
+        def _work():
+            for _ in range(5_000):
+                latency.observe(0.01)
+
+        workers = [threading.Thread(target=_work) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert latency.histogram.count == 20_000
+
+
+def test_windowed_snapshot_reports_rates():
+    center = TelemetryCenter()
+    for _ in range(10):
+        center.increment_counter("command.invocations")
+        center.observe_latency("adapter.latency", 0.2, {"tool": "nmap_scan.sim"})
+    snapshot = center.snapshot(window="5m")
+    assert snapshot["window"] == "5m"
+    assert snapshot["counters"]["command.invocations"] == 10
+    assert snapshot["rates"]["command.invocations"] > 0
+    assert snapshot["histograms"]['adapter.latency{tool="nmap_scan.sim"}']["count"] == 10
+    with pytest.raises(ValueError):
+        center.windowed("2d")
+
+
+def test_prebound_handles_share_series_and_cap_cardinality():
+    center = TelemetryCenter()
+    requested = center.counter("command.requested", labelnames=("tool",), max_series=2)
+    handle = requested.labels("nmap_scan.sim")
+    assert requested.labels(tool="nmap_scan.sim") is handle
+    handle.inc()
+    center.increment_counter("command.requested", labels={"tool": "nmap_scan.sim"})
+    for tool_id in ("a", "b", "c"):
+        requested.labels(tool_id).inc()
+
+    counters = center.snapshot()["counters"]
+    assert counters['command.requested{tool="nmap_scan.sim"}'] == 2
+    assert counters['command.requested{tool="__overflow__"}'] == 2
+    assert len(requested.series) == 3
+    assert center.snapshot()["seriesOverflow"] == {"command.requested": 2}
+    with pytest.raises(ValueError):
+        center.histogram("command.requested")
+
+
+def test_reset_keeps_prebound_handles_live():
+    center = TelemetryCenter()
+    runs = center.counter("adapter.runs", labelnames=("tool",)).labels("nmap_scan.sim")
+    runs.inc()
+    center.reset()
+    runs.inc()
+    assert center.snapshot()["counters"]['adapter.runs{tool="nmap_scan.sim"}'] == 1
@@ -0,0 +1,127 @@
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from tornado_ai.api.controllers import command as command_module
+from tornado_ai.api.controllers.command import CommandPayload, execute_command
+from tornado_ai.core.decision.ipo import IntelligentParameterOptimizer
+from tornado_ai.core.decision.tuning import DEFAULT_SPACE_PATH, ParameterTuner, load_space, parameter_tuner
+from tornado_ai.core.observability.telemetry import TelemetryCenter
+from tornado_ai.shared.types import TargetProfile
+
+
+def _tuner(**overrides):
+    options = {"min_samples": 3, "rng": random.Random(7), "center": TelemetryCenter()}
+    options.update(overrides)
+    return ParameterTuner(load_space(DEFAULT_SPACE_PATH), **options)
+
+
+def _profile(environment="staging", criticality="medium"):
+    return TargetProfile(targetId="t-1", assetKind="webapp", environment=environment, cvss=7.0, criticality=criticality)
+
+
+def test_guardrails_bound_the_arms():
+    tuner = _tuner()
+    assert [arm["rate"] for arm in tuner.arms("masscan_scan.sim", {"rate": 1000})] == [500, 1000]
+    assert len(tuner.arms("masscan_scan.sim", {})) == 5
+    assert len(tuner.arms("sqlmap_scan.sim", {"risk": "2"})) == 6  # 3 levels x risks 1-2
+    assert tuner.arms("masscan_scan.sim", {"rate": 750}) == []  # guardrail is not a candidate: untuned
+    assert tuner.arms("nmap_scan.sim", {}) == []
+
+
+def test_bandit_explores_then_settles_on_best_findings_per_second():
+    tuner = _tuner()
+    findings_per_run = {500: 1, 1000: 2, 2500: 6, 5000: 4, 10000: 3}
+    picks = Counter()
+    for _ in range(200):
+        choice = tuner.choose("masscan_scan.sim", "webapp", {})
+        picks[choice.params["rate"]] += 1
+        rate = choice.params["rate"]
+        tuner.observe("masscan_scan.sim", "webapp", choice.params, 1.0, True, findings_per_run[rate])
+    assert all(picks[rate] >= 1 for rate in findings_per_run)
+    assert picks.most_common(1)[0][0] == 2500
+    choice = tuner.choose("masscan_scan.sim", "webapp", {"rate": 1000})
+    assert choice.params["rate"] == 1000 and choice.samples > 0
+
+
+def test_failures_earn_nothing_and_unknown_settings_are_ignored():
+    tuner = _tuner()
+    assert tuner.observe("masscan_scan.sim", "api", {"rate": 5000}, 0.5, False, 10)
+    assert tuner.stats("masscan_scan.sim", "api", {"rate": 5000}).mean == 0.0
+    assert not tuner.observe("masscan_scan.sim", "api", {"rate": 123}, 0.5, True, 10)
+    assert not tuner.observe("nmap_scan.sim", "api", {"rate": 5000}, 0.5, True, 10)
+    # Float spellings of a candidate count as that candidate.
+    assert tuner.observe("masscan_scan.sim", "api", {"rate": 5000.0}, 0.5, True, 1)
+    assert tuner.stats("masscan_scan.sim", "api", {"rate": 5000}).pulls == 2
+
+
+def test_state_persists_and_replays_log(tmp_path):
+    path = tmp_path / "tuning.json"
+    tuner = _tuner(compact_every=2, flush_interval=3600)
+    tuner.open(path)
+    log = path.with_name(path.name + ".log")
+    for findings in (1, 2, 3):
+        tuner.observe("sqlmap_scan.sim", "webapp", {"risk": "1", "level": "2"}, 2.0, True, findings)
+    assert log.read_text() == ""  # observing only buffers; the writer thread does the I/O
+    tuner.flush()
+    assert len(json.loads(path.read_text())) == 2  # webapp and "*" series
+    tuner.observe("sqlmap_scan.sim", "webapp", {"risk": "1", "level": "2"}, 2.0, True, 2)
+    tuner.flush()
+    with log.open("a") as handle:
+        handle.write('["sqlmap_scan.sim","web')  # torn write from a crash
+
+    reopened = _tuner()
+    reopened.open(path)
+    stats = reopened.stats("sqlmap_scan.sim", "webapp", {"risk": "1", "level": "2"})
+    assert (stats.pulls, stats.findings, stats.mean) == (4, 8, pytest.approx(1.0))
+    reopened.close()
+
+
+def test_clear_forgets_persisted_observations(tmp_path):
+    path = tmp_path / "tuning.json"
+    tuner = _tuner(flush_interval=3600)
+    tuner.open(path)
+    tuner.observe("masscan_scan.sim", "api", {"rate": 5000}, 1.0, True, 3)
+    tuner.flush()
+    tuner.observe("masscan_scan.sim", "api", {"rate": 5000}, 1.0, True, 3)
+    tuner.clear()
+    tuner.flush()
+    tuner.close()
+
+    reopened = _tuner()
+    reopened.open(path)
+    assert reopened.stats("masscan_scan.sim", "api", {"rate": 5000}) is None
+    reopened.close()
+
+
+def test_ipo_tuning_mode_stays_within_environment_guardrails():
+    tuner = _tuner()
+    ipo = IntelligentParameterOptimizer(tuner=tuner)
+    for _ in range(30):
+        suggestion = ipo.suggest("masscan_scan.sim", {"targets": ["t-1"]}, _profile(environment="production"))
+        rate = suggestion.suggestedParams["rate"]
+        assert rate in (500, 1000)
+        tuner.observe("masscan_scan.sim", "webapp", suggestion.suggestedParams, 1.0, True, rate // 500)
+    assert "findings/s" in suggestion.rationale
+    first = IntelligentParameterOptimizer(tuner=_tuner()).suggest("sqlmap_scan.sim", {}, _profile("production"))
+    assert first.suggestedParams == {"risk": "1", "level": "1"}
+    assert first.rationale.endswith("Exploring level='1', risk='1'.")
+    assert IntelligentParameterOptimizer().suggest("masscan_scan.sim", {}, _profile()).suggestedParams == {"rate": 5000}
+
+
+@pytest.mark.asyncio
+async def test_command_executions_feed_the_tuner(tmp_path, monkeypatch):
+    monkeypatch.setattr(command_module, "AUDIT_PATH", tmp_path / "audit.log.jsonl")
+    parameter_tuner.clear()
+    payload = CommandPayload(
+        toolId="masscan_scan.sim",
+        params={"targets": ["10.0.0.1"], "ports": "1-1000", "rate": 2500},
+        useCache=False,
+        assetKind="infrastructure",
+    )
+    await execute_command(payload)
+    stats = parameter_tuner.stats("masscan_scan.sim", "infrastructure", {"rate": 2500})
+    assert stats is not None and stats.pulls == 1
+    parameter_tuner.clear()
@@ -0,0 +1,87 @@
+import json
+from dataclasses import replace
+
+import pytest
+from fastapi import HTTPException
+
+from tornado_ai.api.controllers.command import CommandPayload, execute_command
+from tornado_ai.core.decision.ipo import DEFAULT_RULES_PATH
+from tornado_ai.core.decision.performance import ToolPerformanceStore
+from tornado_ai.core.decision.tuning import DEFAULT_SPACE_PATH
+from tornado_ai.tools.definitions import tool_definitions
+from tornado_ai.tools.registry import ToolRegistry
+from tornado_ai.tools.validation import ParameterValidator, ParameterValidators
+
+
+def test_compiled_schema_checks_types_enums_and_unknown_parameters():
+    validator = ParameterValidator.compile(
+        {"targets": "string[]", "intensity": "low|medium|high", "rate": "number?", "ports": "Port[]?"}
+    )
+    assert validator({"targets": ["10.0.0.1"], "intensity": "low", "rate": 1.5, "ports": [{"port": 22}]}) == []
+    errors = {
+        error.field: (error.message, error.kind)
+        for error in validator({"targets": ["a", 7], "intensity": "max", "rate": True, "url": "x"})
+    }
+    assert errors == {
+        "targets": ("item 1 must be a string", "type_error"),
+        "intensity": ("must be one of 'low', 'medium', 'high'", "type_error"),
+        "rate": ("must be a number", "type_error"),
+        "url": ("is not a parameter of this tool", "extra_forbidden"),
+    }
+    assert validator({}) == []
+    strict = ParameterValidator.compile({"targets": "string[]", "rate": "number?"}, strict=True)
+    assert [(error.field, error.kind) for error in strict({})] == [("targets", "missing")]
+
+
+def test_validators_are_cached_per_registry_version():
+    registry = ToolRegistry(tool_definitions)
+    validators = ParameterValidators(registry)
+    validator = validators.validator("masscan_scan.sim")
+    assert validators.validator("masscan_scan.sim") is validator
+    with pytest.raises(KeyError):
+        validators.validate("unknown.sim", {"anything": 1})
+    definition = registry.get_definition("masscan_scan.sim")
+    registry.register(
+        replace(definition, spec=definition.spec.model_copy(update={"inputSchema": {"targets": "string[]"}}))
+    )
+    assert [error.field for error in validators.validate("masscan_scan.sim", {"rate": 10})] == ["rate"]
+
+
+def test_bundled_guardrails_and_tuning_values_satisfy_the_schemas():
+    validators = ParameterValidators(ToolRegistry(tool_definitions))
+    for rule in json.loads(DEFAULT_RULES_PATH.read_text())["rules"]:
+        assert validators.validate(rule["tool"], rule["params"]) == [], rule["id"]
+    for tool_id, parameters in json.loads(DEFAULT_SPACE_PATH.read_text())["tools"].items():
+        for name, values in parameters.items():
+            for value in values:
+                assert validators.validate(tool_id, {name: value}) == [], (tool_id, name, value)
+
+
+@pytest.mark.asyncio
+async def test_invalid_commands_are_rejected_before_execution(tmp_path, monkeypatch):
+    monkeypatch.setattr("tornado_ai.api.controllers.command.AUDIT_PATH", tmp_path / "audit.log.jsonl")
+    store = ToolPerformanceStore(min_samples=1)
+    monkeypatch.setattr("tornado_ai.api.controllers.command.tool_performance", store)
+    payload = CommandPayload(toolId="sqlmap_scan.sim", params={"url": "https://x", "risk": 3}, useCache=False)
+    with pytest.raises(HTTPException) as excinfo:
+        await execute_command(payload)
+    assert excinfo.value.status_code == 422
+    assert {tuple(error["loc"]) for error in excinfo.value.detail} == {("params", "url"), ("params", "risk")}
+    assert store.stats("sqlmap_scan.sim") is None
+    assert not (tmp_path / "audit.log.jsonl").exists()
+
+
+@pytest.mark.asyncio
+async def test_unknown_tools_are_rejected_before_cache_and_execution(tmp_path, monkeypatch):
+    monkeypatch.setattr("tornado_ai.api.controllers.command.AUDIT_PATH", tmp_path / "audit.log.jsonl")
+
+    async def _unreachable(*args, **kwargs):
+        raise AssertionError("unknown tools must not reach the cache or ERR")
+
+    monkeypatch.setattr("tornado_ai.api.controllers.command.scm.resolve_async", _unreachable)
+    monkeypatch.setattr("tornado_ai.api.controllers.command.err.execute", _unreachable)
+    with pytest.raises(HTTPException) as excinfo:
+        await execute_command(CommandPayload(toolId="bogus"))
+    assert excinfo.value.status_code == 404
+    assert excinfo.value.detail == [{"loc": ["toolId"], "msg": "Unknown tool: bogus", "type": "unknown_tool"}]
+    assert not (tmp_path / "audit.log.jsonl").exists()
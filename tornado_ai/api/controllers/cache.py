@@ -2,7 +2,12 @@
 from __future__ import annotations
 
 from ...core.cache.manager import scm
+from ...core.decision import aide
 
 
 async def get_cache_stats() -> dict:
     return scm.stats()
+
+
+async def get_decision_cache_stats() -> dict:
+    return aide.cache.stats() if aide.cache is not None else {}
@@ -4,24 +4,40 @@ from __future__ import annotations
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from time import perf_counter
+from typing import Any, Dict, Optional
 
+from fastapi import HTTPException
 from pydantic import BaseModel, Field
 
 from ...core.cache.manager import scm
-from ...core.decision.err import err
+from ...core.decision import live_graphs, parameter_tuner, tool_performance
+from ...core.decision.err import CircuitOpenError, err
+from ...core.decision.live_graph import findings_from_execution
 from ...core.observability import telemetry_center
-from ...shared.types import ToolExecutionResult
+from ...shared.types import AssetKindLiteral, ToolExecutionResult
 from ...tools.adapters import run_dry
+from ...tools.validation import parameter_validators
 
 AUDIT_PATH = Path("data") / "audit.log.jsonl"
 
+_INVOCATIONS = telemetry_center.counter("command.invocations", help="Command API invocations").labels()
+# toolId comes straight from the request body, so cap how many series it can create.
+_REQUESTED = telemetry_center.counter(
+    "command.requested", labelnames=("tool",), max_series=256, help="Uncached command executions by tool"
+)
+_REJECTED = telemetry_center.counter(
+    "command.rejected", labelnames=("tool",), max_series=256, help="Commands rejected by parameter validation"
+)
+
 
 class CommandPayload(BaseModel):
     toolId: str
     params: Dict[str, Any] = Field(default_factory=dict)
     useCache: bool = True
     userId: str = "system"
+    targetId: Optional[str] = None
+    assetKind: Optional[AssetKindLiteral] = None
 
 
 class CommandResponse(BaseModel):
@@ -45,21 +61,69 @@ def _write_audit_entry(payload: CommandPayload, result: ToolExecutionResult) ->
         handle.write(json.dumps(event) + "\n")
 
 
+def validate_params(tool_id: str, params: Dict[str, Any]) -> None:
+    """Raise a 422 listing every problem with ``params`` before anything runs or is cached.
+
+    An unknown ``tool_id`` is a 404, raised just as early.
+    """
+
+    try:
+        errors = parameter_validators.validate(tool_id, params)
+    except KeyError as exc:
+        _REJECTED.labels(tool_id).inc()
+        raise HTTPException(
+            status_code=404, detail=[{"loc": ["toolId"], "msg": exc.args[0], "type": "unknown_tool"}]
+        ) from exc
+    if errors:
+        _REJECTED.labels(tool_id).inc()
+        raise HTTPException(status_code=422, detail=[error.to_dict() for error in errors])
+
+
 async def execute_command(payload: CommandPayload) -> CommandResponse:
-    telemetry_center.increment_counter("command.invocations")
+    _INVOCATIONS.inc()
+    validate_params(payload.toolId, payload.params)
+
+    def _attempt(tool_id: str, params: Dict[str, Any]) -> ToolExecutionResult:
+        _REQUESTED.labels(tool_id).inc()
+        started = perf_counter()
+        try:
+            result = run_dry(tool_id, params)
+        except KeyError:
+            raise
+        except Exception:
+            duration = perf_counter() - started
+            tool_performance.record(tool_id, payload.assetKind, duration, False)
+            parameter_tuner.observe(tool_id, payload.assetKind, params, duration, False)
+            raise
+        duration = perf_counter() - started
+        success = result.status == "completed"
+        findings = len(findings_from_execution(result))
+        tool_performance.record(tool_id, payload.assetKind, duration, success, findings)
+        parameter_tuner.observe(tool_id, payload.assetKind, params, duration, success, findings)
+        return result
 
-    def _produce() -> ToolExecutionResult:
-        telemetry_center.increment_counter(f"command.{payload.toolId}.requested")
-        return run_dry(payload.toolId, payload.params)
+    async def _produce() -> ToolExecutionResult:
+        return await err.execute(payload.toolId, payload.params, _attempt, target_id=payload.targetId)
 
-    if payload.useCache:
-        cached = scm.resolve(payload.toolId, payload.params, _produce)
-        result = cached.value
-        if cached.cached:
-            result = result.model_copy(update={"status": "cached", "cached": True})
-    else:
-        result = _produce()
+    try:
+        if payload.useCache:
+            # Only the requested tool's successful results are cached, never a fallback's.
+            cached = await scm.resolve_async(
+                payload.toolId,
+                payload.params,
+                _produce,
+                cacheable=lambda value: value.status == "completed" and value.toolId == payload.toolId,
+            )
+            result = cached.value
+            if cached.cached:
+                result = result.model_copy(update={"status": "cached", "cached": True})
+        else:
+            result = await _produce()
+    except CircuitOpenError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
 
     _write_audit_entry(payload, result)
+    if payload.targetId is not None and payload.targetId in live_graphs:
+        live_graphs.apply_execution(payload.targetId, result)
     fallback = err.fallback_actions(payload.toolId)
     return CommandResponse(result=result, fallbackActions=fallback)
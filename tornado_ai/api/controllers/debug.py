@@ -0,0 +1,59 @@
+"""Admin-only diagnostics for live workers."""
+from __future__ import annotations
+
+import asyncio
+from typing import Literal, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from ...core.observability.memory import HeapProfilerError, UnknownSnapshotError, heap_profiler
+from ...core.observability.profiler import ProfilerBusyError, sampling_profiler
+
+ProfileFormat = Literal["collapsed", "speedscope"]
+
+
+async def run_profile(seconds: float, format: ProfileFormat = "speedscope") -> Response:
+    try:
+        profile = await sampling_profiler.profile(seconds)
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    headers = {"X-Profile-Samples": str(profile.samples)}
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed(), headers=headers)
+    return JSONResponse(profile.speedscope(), headers=headers)
+
+
+async def start_heap_tracing(frames: int = 1) -> dict:
+    return heap_profiler.start(frames)
+
+
+async def stop_heap_tracing() -> dict:
+    return heap_profiler.stop()
+
+
+async def heap_status() -> dict:
+    return heap_profiler.status()
+
+
+def _heap_call(method, *args):
+    try:
+        return method(*args)
+    except UnknownSnapshotError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except HeapProfilerError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+async def take_heap_snapshot(limit: int = 20) -> dict:
+    # Snapshot statistics walk every traced block, so keep them off the event loop.
+    entry = await asyncio.to_thread(_heap_call, heap_profiler.take_snapshot)
+    return await asyncio.to_thread(_heap_call, heap_profiler.top, entry.id, limit)
+
+
+async def heap_top(snapshot_id: Optional[int] = None, limit: int = 20) -> dict:
+    return await asyncio.to_thread(_heap_call, heap_profiler.top, snapshot_id, limit)
+
+
+async def heap_diff(base: int, snapshot_id: Optional[int] = None, limit: int = 20) -> dict:
+    return await asyncio.to_thread(_heap_call, heap_profiler.diff, base, snapshot_id, limit)
@@ -28,7 +28,7 @@ async def get_health_status() -> HealthResponse:
     audit = audit_log_status()
     cache = scm.stats()
     telemetry = telemetry_center.snapshot()
-    categories = tool_registry.categories()
+    categories = dict(tool_registry.categories())
     return HealthResponse(
         status="ok",
         registrySize=size,
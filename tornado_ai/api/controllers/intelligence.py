@@ -1,16 +1,31 @@
 """Intelligence endpoints for AIDE, TSA, IPO, and SACD."""
 from __future__ import annotations
 
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from ...core.decision import aide
+from ...core.decision import aide, batch_analyzer, live_graphs, parameter_tuner, plan_executor, roe, tool_performance
+from ...core.decision.aide import AIDEOutput
+from ...core.decision.batch import DEFAULT_CHUNK_SIZE
 from ...shared.types import (
     AttackGraph,
+    AttackPathAnalysis,
+    AttackPathUpdate,
+    PlanExecutionReport,
     ParameterSuggestion,
     PriorToolResult,
     TargetProfile,
+    ToolExecutionResult,
     ToolPlan,
+    ToolPlanStep,
 )
+from ...tools.registry import tool_registry
+from ...tools.validation import parameter_validators
+from .command import CommandPayload, execute_command
 
 
 class AnalyzeTargetPayload(BaseModel):
@@ -22,6 +37,9 @@ class AnalyzeTargetResponse(BaseModel):
     plan: ToolPlan
     graph: AttackGraph
     recommendedConcurrency: int
+    # True when a stage did not finish in time (or failed) and a placeholder is returned.
+    degraded: bool = False
+    degradedStages: list[str] = Field(default_factory=list)
 
 
 class SelectToolsPayload(BaseModel):
@@ -29,20 +47,147 @@ class SelectToolsPayload(BaseModel):
     history: list[PriorToolResult] = Field(default_factory=list)
 
 
+class AnalyzeBatchPayload(BaseModel):
+    targets: list[TargetProfile]
+    history: dict[str, list[PriorToolResult]] = Field(default_factory=dict)
+    chunkSize: int = Field(default=DEFAULT_CHUNK_SIZE, ge=1, le=100_000)
+
+
+class ExecutePlanPayload(BaseModel):
+    target: TargetProfile
+    history: list[PriorToolResult] = Field(default_factory=list)
+    # Starting concurrency for a target the AIMD controller has not seen yet.
+    concurrency: Optional[int] = Field(default=None, ge=1, le=64)
+    userId: str = "system"
+
+
+class LiveGraphPayload(BaseModel):
+    target: TargetProfile
+    results: list[PriorToolResult] = Field(default_factory=list)
+
+
 class OptimizeParametersPayload(BaseModel):
     toolId: str
     target: TargetProfile
     params: dict = Field(default_factory=dict)
 
 
+class OptimizeParametersBatchPayload(BaseModel):
+    items: list[OptimizeParametersPayload] = Field(max_length=10_000)
+
+
 async def analyze_target(payload: AnalyzeTargetPayload) -> AnalyzeTargetResponse:
-    outcome = aide.analyze(payload.target, payload.history)
-    return AnalyzeTargetResponse(plan=outcome.plan, graph=outcome.graph, recommendedConcurrency=outcome.recommendedConcurrency)
+    outcome = await aide.analyze_async(payload.target, payload.history)
+    return AnalyzeTargetResponse(
+        plan=outcome.plan,
+        graph=outcome.graph,
+        recommendedConcurrency=outcome.recommendedConcurrency,
+        degraded=outcome.degraded,
+        degradedStages=list(outcome.degradedStages),
+    )
+
+
+def _unavailable(outcome: AIDEOutput, action: str) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail={"message": f"Cannot {action}: analysis stages degraded", "degradedStages": list(outcome.degradedStages)},
+    )
 
 
 async def select_tools(payload: SelectToolsPayload) -> ToolPlan:
-    return aide.analyze(payload.target, payload.history).plan
+    outcome = await aide.analyze_async(payload.target, payload.history)
+    if "tsa.build_plan" in outcome.degradedStages:
+        # The placeholder plan is empty; never pass it off as "no tools apply".
+        raise _unavailable(outcome, "select tools")
+    return outcome.plan
+
+
+async def analyze_batch(payload: AnalyzeBatchPayload) -> StreamingResponse:
+    return StreamingResponse(
+        batch_analyzer.stream(payload.targets, payload.history, payload.chunkSize),
+        media_type="application/x-ndjson",
+    )
+
+
+async def execute_plan(payload: ExecutePlanPayload) -> PlanExecutionReport:
+    """Analyze the target, then run its plan through the command surface in critical-path order."""
+
+    outcome = await aide.analyze_async(payload.target, payload.history)
+    if outcome.degraded:
+        # Placeholders (an empty plan, concurrency 1) must not be executed as if they were decisions.
+        raise _unavailable(outcome, "execute plan")
+    target = payload.target
+
+    def _base_params(tool_id: str) -> dict:
+        schema = tool_registry.get_definition(tool_id).spec.inputSchema
+        return {"targets": [target.targetId]} if "targets" in schema else {}
+
+    suggestions = aide.optimize_many([(step.toolId, _base_params(step.toolId), target) for step in outcome.plan.steps])
+    commands = {
+        suggestion.toolId: CommandPayload(
+            toolId=suggestion.toolId,
+            params=suggestion.suggestedParams,
+            userId=payload.userId,
+            targetId=target.targetId,
+            assetKind=target.assetKind,
+        )
+        for suggestion in suggestions
+    }
+    # Reject the whole plan up front rather than failing steps after they took a worker slot.
+    problems = []
+    for tool_id, command in commands.items():
+        try:
+            errors = parameter_validators.validate(tool_id, command.params)
+        except KeyError as exc:  # unregistered since the plan was built
+            problems.append({"loc": ["steps", tool_id], "msg": exc.args[0], "type": "unknown_tool"})
+            continue
+        problems.extend({**error.to_dict(), "loc": ["steps", tool_id, "params", error.field]} for error in errors)
+    if problems:
+        raise HTTPException(status_code=422, detail=problems)
+
+    async def _run(step: ToolPlanStep) -> ToolExecutionResult:
+        return (await execute_command(commands[step.toolId])).result
+
+    concurrency = payload.concurrency or outcome.recommendedConcurrency
+    return await plan_executor.execute(outcome.plan, _run, concurrency, asset_kind=payload.target.assetKind)
+
+
+async def update_live_graph(payload: LiveGraphPayload) -> AttackPathUpdate:
+    live_graphs.graph_for(payload.target)
+    update = live_graphs.apply_results(payload.target.targetId, payload.results)
+    return update if update is not None else live_graphs.current(payload.target.targetId)
+
+
+async def get_live_graph(target_id: str, paths: int = 3, choke_points: int = 5) -> AttackPathAnalysis:
+    try:
+        return live_graphs.analysis(target_id, paths=paths, choke_points=choke_points)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=exc.args[0]) from exc
+
+
+async def stream_live_graph_updates(target_id: Optional[str] = None) -> StreamingResponse:
+    async def _lines() -> AsyncIterator[str]:
+        async for update in live_graphs.updates(target_id):
+            yield json.dumps(update.model_dump(), separators=(",", ":")) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+async def get_tool_performance() -> dict:
+    return tool_performance.summary()
+
+
+async def get_parameter_tuning() -> dict:
+    return parameter_tuner.summary()
+
+
+async def get_concurrency() -> dict:
+    return roe.controller.stats() if roe.controller is not None else {}
 
 
 async def optimize_parameters(payload: OptimizeParametersPayload) -> ParameterSuggestion:
     return aide.optimize(payload.toolId, payload.params, payload.target)
+
+
+async def optimize_parameters_batch(payload: OptimizeParametersBatchPayload) -> list[ParameterSuggestion]:
+    return aide.optimize_many([(item.toolId, item.params, item.target) for item in payload.items])
@@ -0,0 +1,10 @@
+"""Prometheus/OpenMetrics exposition of telemetry."""
+from __future__ import annotations
+
+from fastapi import Response
+
+from ...core.observability.openmetrics import CONTENT_TYPE, openmetrics_renderer
+
+
+async def get_openmetrics() -> Response:
+    return Response(content=openmetrics_renderer.render(), media_type=CONTENT_TYPE)
@@ -1,8 +1,46 @@
 """Telemetry exposure for observability dashboards."""
 from __future__ import annotations
 
+from time import time
+from typing import Optional
+
+from fastapi.responses import StreamingResponse
+
+from ...core.decision.err import err
 from ...core.observability import telemetry_center
+from ...core.observability.chrome_trace import stream_chrome_trace
+from ...core.observability.slow_requests import slow_request_log
+
+
+async def get_telemetry_snapshot(window: str | None = None) -> dict:
+    return telemetry_center.snapshot(window)
+
+
+async def get_recent_traces(limit: int = 10) -> list[dict]:
+    return telemetry_center.recent_traces(limit)
+
+
+async def get_slow_requests(limit: int = 20) -> dict:
+    return {
+        "thresholdSeconds": slow_request_log.threshold,
+        "capacity": slow_request_log.capacity,
+        "requests": slow_request_log.recent(limit),
+    }
+
+
+async def get_breaker_states() -> dict:
+    return err.breaker_states()
 
 
-async def get_telemetry_snapshot() -> dict:
-    return telemetry_center.snapshot()
+async def get_chrome_trace(seconds: float = 60.0, trace_id: Optional[str] = None) -> StreamingResponse:
+    since = time() - seconds
+    spans = [
+        span
+        for span in telemetry_center.recent_spans(0)
+        if span.start + span.duration >= since and (trace_id is None or span.trace_id == trace_id)
+    ]
+    return StreamingResponse(
+        stream_chrome_trace(spans),
+        media_type="application/json",
+        headers={"Content-Disposition": 'attachment; filename="tornado-trace.json"'},
+    )
@@ -11,8 +11,9 @@ from ...shared.types import DashboardCard, VulnerabilityCard
 
 
 async def get_dashboard_cards() -> List[DashboardCard]:
-    metrics = telemetry_center.snapshot()
-    categories = tool_registry.categories()
+    recent = telemetry_center.windowed("1m")
+    latency = telemetry_center.windowed("5m")
+    categories = dict(tool_registry.categories())
     return [
         DashboardCard(
             id="tool-categories",
@@ -23,16 +24,16 @@ async def get_dashboard_cards() -> List[DashboardCard]:
         ),
         DashboardCard(
             id="telemetry-counters",
-            title="Telemetry Counters",
-            description="Latest recorded counters",
-            value=metrics.get("counters", {}),
+            title="Telemetry Rates",
+            description="Per-second counter rates over the last minute",
+            value={name: round(rate, 4) for name, rate in recent["rates"].items()},
             severity="success",
         ),
         DashboardCard(
             id="latency-p95",
             title="Adapter Latency P95",
-            description="Latency histogram (p95) for tool adapters",
-            value={name: hist.get("p95", 0.0) for name, hist in metrics.get("histograms", {}).items()},
+            description="Latency histogram (p95) over the last five minutes",
+            value={name: hist["p95"] for name, hist in latency["histograms"].items() if hist["count"]},
             severity="warning",
         ),
     ]
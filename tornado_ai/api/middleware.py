@@ -0,0 +1,117 @@
+"""ASGI middleware timing every HTTP request into the telemetry center."""
+from __future__ import annotations
+
+from time import perf_counter, time
+from typing import Any, Awaitable, Callable, Dict, MutableMapping
+
+from ..core.observability.slow_requests import SlowRequest, SlowRequestLog, slow_request_log
+from ..core.observability.telemetry import TelemetryCenter, telemetry_center
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+UNMATCHED_ROUTE = "__unmatched__"
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route including mount/include prefixes.
+
+    Routes of included routers only know their own path (``/telemetry/traces``),
+    so the static prefix is taken from the concrete request path.
+    """
+
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return UNMATCHED_ROUTE
+    path_parts = scope["path"].split("/")
+    template_parts = template.split("/")
+    prefix = "/".join(path_parts[: max(1, len(path_parts) - len(template_parts) + 1)])
+    return prefix + template
+
+
+class TelemetryMiddleware:
+    """Record latency by route/method/status and body sizes; keep slow requests with their spans.
+
+    The whole request runs inside an ``http.request`` root span, so spans opened
+    by handlers (AIDE stages, adapters) become its children and the slow log
+    can show which stage consumed the time.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        center: TelemetryCenter = telemetry_center,
+        slow_log: SlowRequestLog = slow_request_log,
+    ) -> None:
+        self.app = app
+        self._center = center
+        self._slow_log = slow_log
+        self._duration = center.histogram(
+            "http.server.duration", labelnames=("method", "route", "status"), help="HTTP request latency"
+        )
+        self._request_size = center.histogram(
+            "http.server.request.size", unit="bytes", labelnames=("method", "route"), help="HTTP request body size"
+        )
+        self._response_size = center.histogram(
+            "http.server.response.size", unit="bytes", labelnames=("method", "route"), help="HTTP response body size"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sizes: Dict[str, int] = {"request": 0, "response": 0, "status": 500}
+
+        async def _receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes["request"] += len(message.get("body", b""))
+            return message
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                sizes["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                sizes["response"] += len(message.get("body", b""))
+            await send(message)
+
+        method = scope["method"]
+        started_at = time()
+        start = perf_counter()
+        try:
+            with self._center.span("http.request", method=method, path=scope["path"]) as span:
+                try:
+                    await self.app(scope, _receive, _send)
+                finally:
+                    duration = perf_counter() - start
+                    route = route_template(scope)
+                    span.set_attribute("route", route)
+                    span.set_attribute("status", sizes["status"])
+                    slow = duration >= self._slow_log.threshold
+                    if slow:
+                        span.force_keep()
+        finally:
+            self._duration.labels(method, route, str(sizes["status"])).observe(duration, span)
+            self._request_size.labels(method, route).observe(sizes["request"])
+            self._response_size.labels(method, route).observe(sizes["response"])
+            if slow:
+                self._slow_log.record(
+                    SlowRequest(
+                        method=method,
+                        route=route,
+                        path=scope["path"],
+                        status=sizes["status"],
+                        duration=duration,
+                        start=started_at,
+                        trace_id=span.trace_id,
+                        spans=self._center.trace(span.trace_id),
+                    )
+                )
+
+
+__all__ = ["TelemetryMiddleware", "UNMATCHED_ROUTE", "route_template"]
@@ -3,7 +3,19 @@ from __future__ import annotations
 
 from fastapi import APIRouter, FastAPI
 
-from . import cache, checklists, command, control, health, intelligence, processes, telemetry, viz
+from . import (
+    cache,
+    checklists,
+    command,
+    control,
+    debug,
+    health,
+    intelligence,
+    metrics,
+    processes,
+    telemetry,
+    viz,
+)
 
 
 def register_routes(app: FastAPI) -> None:
@@ -17,4 +29,6 @@ def register_routes(app: FastAPI) -> None:
     api_router.include_router(processes.router)
     api_router.include_router(viz.router)
     api_router.include_router(checklists.router)
+    api_router.include_router(debug.router)
     app.include_router(api_router)
+    app.include_router(metrics.router)
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from ..controllers.cache import get_cache_stats
+from ..controllers.cache import get_cache_stats, get_decision_cache_stats
 
 router = APIRouter(prefix="/cache", tags=["cache"])
 
@@ -11,3 +11,8 @@ router = APIRouter(prefix="/cache", tags=["cache"])
 @router.get("/stats", summary="Retrieve SCM cache stats")
 async def get_stats():
     return await get_cache_stats()
+
+
+@router.get("/decisions", summary="Retrieve AIDE decision cache stats")
+async def get_decision_stats():
+    return await get_decision_cache_stats()
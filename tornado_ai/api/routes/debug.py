@@ -0,0 +1,66 @@
+"""Routes for on-demand diagnostics (admin token, admin role, ``observability.deep-metrics``)."""
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from ...auth.middleware import require_admin_token, require_feature, require_permission
+from ..controllers.debug import (
+    ProfileFormat,
+    heap_diff,
+    heap_status,
+    heap_top,
+    run_profile,
+    start_heap_tracing,
+    stop_heap_tracing,
+    take_heap_snapshot,
+)
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    dependencies=[
+        Depends(require_admin_token()),
+        Depends(require_permission("configure_system")),
+        Depends(require_feature("observability.deep-metrics")),
+    ],
+)
+
+
+@router.post("/profile", summary="Sample all thread stacks and return a flamegraph")
+async def post_profile(
+    seconds: float = Query(30.0, gt=0, le=300),
+    format: ProfileFormat = Query("speedscope"),
+):
+    return await run_profile(seconds, format)
+
+
+@router.get("/heap", summary="tracemalloc status and stored snapshots")
+async def get_heap_status():
+    return await heap_status()
+
+
+@router.post("/heap/start", summary="Start tracemalloc")
+async def post_heap_start(frames: int = Query(1, ge=1, le=64)):
+    return await start_heap_tracing(frames)
+
+
+@router.post("/heap/stop", summary="Stop tracemalloc (snapshots are kept)")
+async def post_heap_stop():
+    return await stop_heap_tracing()
+
+
+@router.post("/heap/snapshot", summary="Take a heap snapshot and return its top allocation sites")
+async def post_heap_snapshot(limit: int = Query(20, ge=1, le=500)):
+    return await take_heap_snapshot(limit)
+
+
+@router.get("/heap/top", summary="Top allocation sites and modules of a snapshot (latest by default)")
+async def get_heap_top(snapshot: Optional[int] = None, limit: int = Query(20, ge=1, le=500)):
+    return await heap_top(snapshot, limit)
+
+
+@router.get("/heap/diff", summary="Allocation growth between two snapshots, grouped by module")
+async def get_heap_diff(base: int, snapshot: Optional[int] = None, limit: int = Query(20, ge=1, le=500)):
+    return await heap_diff(base, snapshot, limit)
@@ -1,18 +1,39 @@
 """Routes exposing AIDE, TSA, IPO, and SACD."""
 from __future__ import annotations
 
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Query
 
 from ..controllers.intelligence import (
+    AnalyzeBatchPayload,
     AnalyzeTargetPayload,
     AnalyzeTargetResponse,
+    ExecutePlanPayload,
+    LiveGraphPayload,
+    OptimizeParametersBatchPayload,
     OptimizeParametersPayload,
     SelectToolsPayload,
+    analyze_batch,
     analyze_target,
+    execute_plan,
+    get_concurrency,
+    get_live_graph,
+    get_parameter_tuning,
+    get_tool_performance,
     optimize_parameters,
+    optimize_parameters_batch,
     select_tools,
+    stream_live_graph_updates,
+    update_live_graph,
+)
+from ...shared.types import (
+    AttackPathAnalysis,
+    AttackPathUpdate,
+    ParameterSuggestion,
+    PlanExecutionReport,
+    ToolPlan,
 )
-from ...shared.types import ToolPlan
 
 router = APIRouter(prefix="/intelligence", tags=["intelligence"])
 
@@ -22,11 +43,74 @@ async def post_analyze_target(payload: AnalyzeTargetPayload):
     return await analyze_target(payload)
 
 
+@router.post("/analyze-batch", summary="Score many targets and stream one ToolPlan per line (NDJSON)")
+async def post_analyze_batch(payload: AnalyzeBatchPayload):
+    return await analyze_batch(payload)
+
+
 @router.post("/select-tools", response_model=ToolPlan, summary="Select tools for a target")
 async def post_select_tools(payload: SelectToolsPayload):
     return await select_tools(payload)
 
 
+@router.post(
+    "/execute-plan",
+    response_model=PlanExecutionReport,
+    summary="Run a target's plan as a DAG, longest remaining path first",
+)
+async def post_execute_plan(payload: ExecutePlanPayload):
+    return await execute_plan(payload)
+
+
+@router.post(
+    "/live-graph", response_model=AttackPathUpdate, summary="Apply tool results to a target's live attack graph"
+)
+async def post_live_graph(payload: LiveGraphPayload):
+    return await update_live_graph(payload)
+
+
+@router.get("/live-graph/updates", summary="Stream top-path changes of live attack graphs (NDJSON)")
+async def get_live_graph_updates(targetId: Optional[str] = None):
+    return await stream_live_graph_updates(targetId)
+
+
+@router.get(
+    "/live-graph/{targetId}",
+    response_model=AttackPathAnalysis,
+    summary="k best attack paths and choke points of a live attack graph",
+)
+async def get_live_graph_analysis(
+    targetId: str,
+    paths: int = Query(3, ge=1, le=20),
+    chokePoints: int = Query(5, ge=0, le=50),
+):
+    return await get_live_graph(targetId, paths, chokePoints)
+
+
+@router.get("/tool-performance", summary="Observed per-tool durations, success rates and finding yields")
+async def get_performance():
+    return await get_tool_performance()
+
+
+@router.get("/parameter-tuning", summary="Findings-per-second estimates of tuned tool parameter settings")
+async def get_tuning():
+    return await get_parameter_tuning()
+
+
+@router.get("/concurrency", summary="Current AIMD concurrency windows (global and per target)")
+async def get_concurrency_windows():
+    return await get_concurrency()
+
+
 @router.post("/optimize-parameters", summary="Optimize parameters for a tool")
 async def post_optimize_parameters(payload: OptimizeParametersPayload):
     return await optimize_parameters(payload)
+
+
+@router.post(
+    "/optimize-parameters/batch",
+    response_model=list[ParameterSuggestion],
+    summary="Optimize parameters for many (tool, target) pairs against one rule table",
+)
+async def post_optimize_parameters_batch(payload: OptimizeParametersBatchPayload):
+    return await optimize_parameters_batch(payload)
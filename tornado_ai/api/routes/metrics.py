@@ -0,0 +1,13 @@
+"""Prometheus scrape endpoint."""
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from ..controllers.metrics import get_openmetrics
+
+router = APIRouter(tags=["telemetry"])
+
+
+@router.get("/metrics", summary="Telemetry in OpenMetrics text format", include_in_schema=False)
+async def get_metrics():
+    return await get_openmetrics()
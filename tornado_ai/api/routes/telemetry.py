@@ -1,13 +1,44 @@
 """Routes exposing observability telemetry."""
 from __future__ import annotations
 
-from fastapi import APIRouter
+from typing import Literal, Optional
 
-from ..controllers.telemetry import get_telemetry_snapshot
+from fastapi import APIRouter, Query
+
+from ..controllers.telemetry import (
+    get_breaker_states,
+    get_chrome_trace,
+    get_recent_traces,
+    get_slow_requests,
+    get_telemetry_snapshot,
+)
 
 router = APIRouter(prefix="/telemetry", tags=["telemetry"])
 
 
 @router.get("/", summary="Retrieve telemetry counters, histograms, and spans")
-async def get_telemetry():
-    return await get_telemetry_snapshot()
+async def get_telemetry(window: Optional[Literal["1m", "5m", "1h"]] = None):
+    return await get_telemetry_snapshot(window)
+
+
+@router.get("/traces", summary="Retrieve recently sampled traces as span trees")
+async def get_traces(limit: int = Query(10, ge=1, le=100)):
+    return await get_recent_traces(limit)
+
+
+@router.get("/slow", summary="Retrieve recent slow requests with their span trees")
+async def get_slow(limit: int = Query(20, ge=1, le=100)):
+    return await get_slow_requests(limit)
+
+
+@router.get("/breakers", summary="Retrieve ERR circuit breaker states per tool and unhealthy tool/target pairs")
+async def get_breakers():
+    return await get_breaker_states()
+
+
+@router.get("/trace", summary="Stream recorded spans as Chrome Trace Event / Perfetto JSON")
+async def get_trace_export(
+    seconds: float = Query(60.0, gt=0, le=3600),
+    traceId: Optional[str] = None,
+):
+    return await get_chrome_trace(seconds, traceId)
@@ -0,0 +1,66 @@
+"""Request guards built on the RBAC policy and the control surface."""
+from __future__ import annotations
+
+import hmac
+from typing import Callable, Optional, get_args
+
+from fastapi import Header, HTTPException
+
+from ...config import config
+from ...core.control.center import control_center
+from ...core.policy.rbac import Permission, Role, has_permission
+
+ROLE_HEADER = "X-Tornado-Role"
+
+
+def require_admin_token(token: Optional[str] = None) -> Callable[..., None]:
+    """Dependency authenticating callers by ``Authorization: Bearer <token>``.
+
+    ``token`` defaults to ``TORNADO_SERVER_ADMIN_TOKEN``, read per request; while
+    it is empty the guarded routes respond 404, so they are off by default.
+    """
+
+    def _guard(authorization: Optional[str] = Header(None)) -> None:
+        expected = config.server.admin_token if token is None else token
+        if not expected:
+            raise HTTPException(status_code=404, detail="Admin routes are disabled (no admin token configured)")
+        scheme, _, supplied = (authorization or "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.encode(), expected.encode()):
+            raise HTTPException(
+                status_code=401,
+                detail="Missing or invalid admin bearer token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+    return _guard
+
+
+def require_permission(permission: Permission) -> Callable[..., Role]:
+    """Dependency rejecting callers whose role (``X-Tornado-Role``) lacks ``permission``.
+
+    The role header is client-supplied and is not authentication: pair this with
+    :func:`require_admin_token` (or another authenticating guard) on anything
+    sensitive.
+    """
+
+    def _guard(x_tornado_role: Optional[str] = Header(None)) -> Role:
+        if x_tornado_role not in get_args(Role):
+            raise HTTPException(status_code=401, detail=f"Missing or unknown {ROLE_HEADER} header")
+        if not has_permission(x_tornado_role, permission):
+            raise HTTPException(status_code=403, detail=f"Role {x_tornado_role!r} lacks {permission!r}")
+        return x_tornado_role
+
+    return _guard
+
+
+def require_feature(feature_id: str) -> Callable[[], None]:
+    """Dependency returning 404 while the control-surface feature toggle is disabled."""
+
+    def _guard() -> None:
+        if not control_center.is_feature_enabled(feature_id):
+            raise HTTPException(status_code=404, detail=f"Feature {feature_id!r} is disabled")
+
+    return _guard
+
+
+__all__ = ["ROLE_HEADER", "require_admin_token", "require_feature", "require_permission"]
@@ -10,6 +10,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _parse_rules(raw: str) -> Dict[str, float]:
+    """Parse ``"tornado_ai.tools=0.1,tornado_ai.api=50"`` into a logger -> value map."""
+
+    rules: Dict[str, float] = {}
+    for item in raw.split(","):
+        name, sep, value = item.strip().partition("=")
+        if sep:
+            rules[name.strip()] = float(value)
+    return rules
+
+
 @dataclass
 class ServerConfig:
     host: str = field(default_factory=lambda: os.getenv("TORNADO_SERVER_HOST", "127.0.0.1"))
@@ -17,11 +28,18 @@ class ServerConfig:
     cors_enabled: bool = field(
         default_factory=lambda: os.getenv("TORNADO_SERVER_CORS", "true").lower() == "true"
     )
+    # Bearer token for the admin-only debug routes; they are disabled while it is empty.
+    admin_token: str = field(default_factory=lambda: os.getenv("TORNADO_SERVER_ADMIN_TOKEN", ""))
 
 
 @dataclass
 class LoggingConfig:
     level: str = field(default_factory=lambda: os.getenv("TORNADO_LOG_LEVEL", "INFO"))
+    queue_size: int = field(default_factory=lambda: int(os.getenv("TORNADO_LOG_QUEUE_SIZE", "10000")))
+    sampling: Dict[str, float] = field(default_factory=lambda: _parse_rules(os.getenv("TORNADO_LOG_SAMPLING", "")))
+    rate_limits: Dict[str, float] = field(
+        default_factory=lambda: _parse_rules(os.getenv("TORNADO_LOG_RATE_LIMIT", ""))
+    )
 
     def to_logging_dict(self) -> Dict[str, Any]:
         return {
@@ -32,10 +50,89 @@ class LoggingConfig:
         }
 
 
+@dataclass
+class TelemetryConfig:
+    span_capacity: int = field(default_factory=lambda: int(os.getenv("TORNADO_TELEMETRY_SPAN_CAPACITY", "4096")))
+    head_sample_rate: float = field(
+        default_factory=lambda: float(os.getenv("TORNADO_TELEMETRY_HEAD_SAMPLE_RATE", "0.1"))
+    )
+    tail_latency_ms: float = field(
+        default_factory=lambda: float(os.getenv("TORNADO_TELEMETRY_TAIL_LATENCY_MS", "250"))
+    )
+    export: str = field(default_factory=lambda: os.getenv("TORNADO_TELEMETRY_EXPORT", "none"))
+    export_path: str = field(
+        default_factory=lambda: os.getenv("TORNADO_TELEMETRY_EXPORT_PATH", "data/telemetry/telemetry.jsonl")
+    )
+    export_socket: str = field(
+        default_factory=lambda: os.getenv("TORNADO_TELEMETRY_EXPORT_SOCKET", "127.0.0.1:4319")
+    )
+    export_interval: float = field(
+        default_factory=lambda: float(os.getenv("TORNADO_TELEMETRY_EXPORT_INTERVAL", "5"))
+    )
+    export_queue: int = field(default_factory=lambda: int(os.getenv("TORNADO_TELEMETRY_EXPORT_QUEUE", "10000")))
+    loop_monitor: bool = field(
+        default_factory=lambda: os.getenv("TORNADO_TELEMETRY_LOOP_MONITOR", "true").lower() == "true"
+    )
+    loop_stall_ms: float = field(default_factory=lambda: float(os.getenv("TORNADO_TELEMETRY_LOOP_STALL_MS", "100")))
+    slow_request_ms: float = field(
+        default_factory=lambda: float(os.getenv("TORNADO_TELEMETRY_SLOW_REQUEST_MS", "500"))
+    )
+    slow_request_capacity: int = field(
+        default_factory=lambda: int(os.getenv("TORNADO_TELEMETRY_SLOW_REQUEST_CAPACITY", "100"))
+    )
+    process_interval: float = field(
+        default_factory=lambda: float(os.getenv("TORNADO_TELEMETRY_PROCESS_INTERVAL", "15"))
+    )
+
+
+@dataclass
+class DecisionConfig:
+    cache_size: int = field(default_factory=lambda: int(os.getenv("TORNADO_DECISION_CACHE_SIZE", "1024")))
+    cache_ttl: int = field(default_factory=lambda: int(os.getenv("TORNADO_DECISION_CACHE_TTL", "3600")))
+    live_graphs: int = field(default_factory=lambda: int(os.getenv("TORNADO_DECISION_LIVE_GRAPHS", "256")))
+    performance_path: str = field(
+        default_factory=lambda: os.getenv("TORNADO_DECISION_PERFORMANCE_PATH", "data/tool_performance.json")
+    )
+    performance_min_samples: int = field(
+        default_factory=lambda: int(os.getenv("TORNADO_DECISION_PERFORMANCE_MIN_SAMPLES", "5"))
+    )
+    performance_refresh: float = field(
+        default_factory=lambda: float(os.getenv("TORNADO_DECISION_PERFORMANCE_REFRESH", "30"))
+    )
+    concurrency_max: int = field(default_factory=lambda: int(os.getenv("TORNADO_DECISION_CONCURRENCY_MAX", "32")))
+    target_concurrency_max: int = field(
+        default_factory=lambda: int(os.getenv("TORNADO_DECISION_TARGET_CONCURRENCY_MAX", "8"))
+    )
+    retry_attempts: int = field(default_factory=lambda: int(os.getenv("TORNADO_DECISION_RETRY_ATTEMPTS", "3")))
+    retry_base_delay: float = field(
+        default_factory=lambda: float(os.getenv("TORNADO_DECISION_RETRY_BASE_DELAY", "0.2"))
+    )
+    retry_max_delay: float = field(default_factory=lambda: float(os.getenv("TORNADO_DECISION_RETRY_MAX_DELAY", "5")))
+    retry_deadline: float = field(
+        default_factory=lambda: float(os.getenv("TORNADO_DECISION_RETRY_DEADLINE", "30"))
+    )
+    breaker_threshold: int = field(default_factory=lambda: int(os.getenv("TORNADO_DECISION_BREAKER_THRESHOLD", "5")))
+    breaker_reset: float = field(default_factory=lambda: float(os.getenv("TORNADO_DECISION_BREAKER_RESET", "30")))
+    ipo_rules: str = field(default_factory=lambda: os.getenv("TORNADO_DECISION_IPO_RULES", ""))
+    ipo_reload: float = field(default_factory=lambda: float(os.getenv("TORNADO_DECISION_IPO_RELOAD", "5")))
+    stage_timeout: float = field(
+        default_factory=lambda: float(os.getenv("TORNADO_DECISION_STAGE_TIMEOUT", "2"))
+    )
+    tuning: bool = field(default_factory=lambda: os.getenv("TORNADO_DECISION_TUNING", "false").lower() == "true")
+    tuning_path: str = field(
+        default_factory=lambda: os.getenv("TORNADO_DECISION_TUNING_PATH", "data/parameter_tuning.json")
+    )
+    strict_params: bool = field(
+        default_factory=lambda: os.getenv("TORNADO_DECISION_STRICT_PARAMS", "false").lower() == "true"
+    )
+
+
 @dataclass
 class AppConfig:
     server: ServerConfig = field(default_factory=ServerConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
+    telemetry: TelemetryConfig = field(default_factory=TelemetryConfig)
+    decision: DecisionConfig = field(default_factory=DecisionConfig)
 
 
 config = AppConfig()
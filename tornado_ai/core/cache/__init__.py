@@ -64,6 +64,14 @@ class ContentAddressedCache(Generic[T]):
             self._store.pop(key, None)
             self._order.pop(key, None)
 
+    def clear(self) -> int:
+        """Drop every entry and return how many were removed."""
+
+        removed = len(self._store)
+        self._store.clear()
+        self._order.clear()
+        return removed
+
     def purge_expired(self) -> None:
         now = time()
         expired = [key for key, entry in self._store.items() if entry.expires_at < now]
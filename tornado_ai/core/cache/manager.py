@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from . import ContentAddressedCache
 
@@ -29,6 +29,24 @@ class SmartCachingManager:
         self._cache.set(key, value)
         return CacheResult(key=key, value=value, cached=False)
 
+    async def resolve_async(
+        self,
+        tool_id: str,
+        params: Optional[Dict[str, Any]],
+        producer: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> CacheResult:
+        """Like :meth:`resolve` for a coroutine producer; values failing ``cacheable`` are not stored."""
+
+        key = ContentAddressedCache.key_for(tool_id, params)
+        cached_value = self._cache.get(key)
+        if cached_value is not None:
+            return CacheResult(key=key, value=cached_value, cached=True)
+        value = await producer()
+        if cacheable(value):
+            self._cache.set(key, value)
+        return CacheResult(key=key, value=value, cached=False)
+
     def stats(self) -> Dict[str, int]:
         return self._cache.stats()
 
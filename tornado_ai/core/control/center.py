@@ -217,6 +217,19 @@ class ControlCenter:
     def snapshot(self) -> ControlSurface:
         return ControlSurface.model_validate(self._surface.model_dump())
 
+    def is_feature_enabled(self, feature_id: str) -> bool:
+        """Return True if ``feature_id`` exists and is enabled (no snapshot copy)."""
+
+        return any(feature.id == feature_id and feature.enabled for feature in self._surface.features)
+
+    def max_parallel_tasks(self, target: str) -> Optional[int]:
+        """Strictest ``maxParallelTasks`` among scan profiles listing ``target`` (no snapshot copy)."""
+
+        limits = [
+            profile.guardrails.maxParallelTasks for profile in self._surface.scanProfiles if target in profile.targets
+        ]
+        return min(limits) if limits else None
+
     def update_features(self, updates: Iterable[Union[FeatureToggle, FeatureTogglePatch, Mapping[str, Any]]]) -> ControlSurface:
         current = {feature.id: feature for feature in self._surface.features}
         for update in updates:
@@ -1,4 +1,26 @@
 """Decision intelligence engines used by Tornado AI."""
-from .registry import aide, ipo, sacd, tsa
+from .registry import (
+    aide,
+    batch_analyzer,
+    ipo,
+    live_graphs,
+    parameter_tuner,
+    plan_executor,
+    roe,
+    sacd,
+    tool_performance,
+    tsa,
+)
 
-__all__ = ["aide", "tsa", "ipo", "sacd"]
+__all__ = [
+    "aide",
+    "batch_analyzer",
+    "live_graphs",
+    "parameter_tuner",
+    "plan_executor",
+    "roe",
+    "tool_performance",
+    "tsa",
+    "ipo",
+    "sacd",
+]
@@ -1,22 +1,43 @@
-"""Advanced Intelligent Decision Engine (AIDE)."""
+"""Advanced Intelligent Decision Engine (AIDE).
+
+:meth:`AdvancedIntelligentDecisionEngine.analyze` runs TSA, SACD and ROE one
+after another. :meth:`~AdvancedIntelligentDecisionEngine.analyze_async` runs
+them concurrently in worker threads, each in its own span and with a timeout;
+a stage that times out or fails is replaced by a safe placeholder (an empty
+plan or graph, concurrency 1) and listed in ``degradedStages``. Degraded
+outputs are never memoized.
+"""
 from __future__ import annotations
 
+import asyncio
+import logging
 from dataclasses import dataclass
-from typing import List
+from typing import Any, Callable, List, Optional, Tuple
 
 from ...shared.types import AttackGraph, ParameterSuggestion, PriorToolResult, TargetProfile, ToolPlan
 from ..observability.telemetry import telemetry_center
 from .ipo import IntelligentParameterOptimizer
+from .memo import DecisionCache
 from .roe import roe
 from .sacd import SmartAttackChainDiscovery
 from .tsa import ToolSelectionAssistant, ToolSelectionContext
 
+logger = logging.getLogger(__name__)
+
+_UNAVAILABLE_PLAN = "Tool selection did not finish in time; retry the analysis."
+
 
 @dataclass
 class AIDEOutput:
     plan: ToolPlan
     graph: AttackGraph
     recommendedConcurrency: int
+    # Stages replaced by a placeholder because they timed out or failed.
+    degradedStages: Tuple[str, ...] = ()
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.degradedStages)
 
 
 class AdvancedIntelligentDecisionEngine:
@@ -25,16 +46,107 @@ class AdvancedIntelligentDecisionEngine:
         tsa: ToolSelectionAssistant,
         ipo: IntelligentParameterOptimizer,
         sacd: SmartAttackChainDiscovery,
+        cache: Optional[DecisionCache] = None,
+        stage_timeout: Optional[float] = None,
     ) -> None:
         self._tsa = tsa
         self._ipo = ipo
         self._sacd = sacd
+        self._cache = cache
+        self.stage_timeout = stage_timeout
+        self._degraded = telemetry_center.counter(
+            "aide.stage.degraded",
+            labelnames=("stage", "reason"),
+            help="AIDE stages replaced by a placeholder in concurrent analysis",
+        )
+
+    @property
+    def cache(self) -> Optional[DecisionCache]:
+        return self._cache
 
     def analyze(self, profile: TargetProfile, history: List[PriorToolResult]) -> AIDEOutput:
-        with telemetry_center.span("aide.analyze", targetId=profile.targetId):
+        """Plan, graph and concurrency for ``profile``; memoized when a cache is configured.
+
+        A memoized ``AIDEOutput`` is shared between callers and must not be mutated.
+        """
+
+        with telemetry_center.span("aide.analyze", targetId=profile.targetId) as span:
+            if self._cache is None:
+                return self._analyze(profile, history)
+            key = self._cache.key_for(profile, history, self._tsa.version)
+            output = self._cache.get(key)
+            span.set_attribute("cached", output is not None)
+            if output is None:
+                output = self._analyze(profile, history)
+                self._cache.set(key, output)
+            return output  # type: ignore[return-value]
+
+    async def analyze_async(
+        self, profile: TargetProfile, history: List[PriorToolResult], timeout: Optional[float] = None
+    ) -> AIDEOutput:
+        """:meth:`analyze` with the stages run concurrently, each bounded by ``timeout``.
+
+        ``timeout`` defaults to ``stage_timeout``; ``None`` waits for every stage.
+        """
+
+        timeout = self.stage_timeout if timeout is None else timeout
+        with telemetry_center.span("aide.analyze", targetId=profile.targetId, concurrent=True) as span:
+            key: Optional[str] = None
+            if self._cache is not None:
+                key = self._cache.key_for(profile, history, self._tsa.version)
+                cached = self._cache.get(key)
+                span.set_attribute("cached", cached is not None)
+                if cached is not None:
+                    return cached  # type: ignore[return-value]
             context = ToolSelectionContext(profile=profile, history=history)
+            (plan_ok, plan), (graph_ok, graph), (concurrency_ok, concurrency) = await asyncio.gather(
+                self._stage("tsa.build_plan", lambda: self._tsa.build_plan(context), timeout),
+                self._stage("sacd.build_graph", lambda: self._sacd.build_graph(profile), timeout),
+                self._stage("roe.recommend_concurrency", lambda: roe.recommend_concurrency(profile), timeout),
+            )
+            degraded = tuple(
+                name
+                for name, ok in (
+                    ("tsa.build_plan", plan_ok),
+                    ("sacd.build_graph", graph_ok),
+                    ("roe.recommend_concurrency", concurrency_ok),
+                )
+                if not ok
+            )
+            output = AIDEOutput(
+                plan=plan if plan_ok else ToolPlan(targetId=profile.targetId, steps=[], summary=_UNAVAILABLE_PLAN),
+                graph=graph if graph_ok else AttackGraph(targetId=profile.targetId, nodes=[], edges=[]),
+                recommendedConcurrency=concurrency if concurrency_ok else 1,
+                degradedStages=degraded,
+            )
+            if degraded:
+                span.set_attribute("degraded", ",".join(degraded))
+            elif key is not None:
+                self._cache.set(key, output)  # type: ignore[union-attr]
+            return output
+
+    async def _stage(self, name: str, compute: Callable[[], Any], timeout: Optional[float]) -> Tuple[bool, Any]:
+        def _run() -> Any:
+            with telemetry_center.span(name):
+                return compute()
+
+        try:
+            return True, await asyncio.wait_for(asyncio.to_thread(_run), timeout)
+        except asyncio.TimeoutError:
+            # The worker thread finishes in the background; its result is dropped.
+            self._degraded.labels(name, "timeout").inc()
+        except Exception:  # noqa: BLE001 - a failed stage degrades the analysis instead of failing it
+            logger.warning("AIDE stage %s failed", name, exc_info=True)
+            self._degraded.labels(name, "error").inc()
+        return False, None
+
+    def _analyze(self, profile: TargetProfile, history: List[PriorToolResult]) -> AIDEOutput:
+        context = ToolSelectionContext(profile=profile, history=history)
+        with telemetry_center.span("tsa.build_plan"):
             plan = self._tsa.build_plan(context)
+        with telemetry_center.span("sacd.build_graph"):
             graph = self._sacd.build_graph(profile)
+        with telemetry_center.span("roe.recommend_concurrency"):
             concurrency = roe.recommend_concurrency(profile)
         return AIDEOutput(plan=plan, graph=graph, recommendedConcurrency=concurrency)
 
@@ -42,5 +154,9 @@ class AdvancedIntelligentDecisionEngine:
         with telemetry_center.span("aide.optimize", toolId=tool_id):
             return self._ipo.suggest(tool_id, params, profile)
 
+    def optimize_many(self, requests: List[Tuple[str, dict, TargetProfile]]) -> List[ParameterSuggestion]:
+        with telemetry_center.span("aide.optimize_many", count=len(requests)):
+            return self._ipo.suggest_many(requests)
+
 
 __all__ = ["AdvancedIntelligentDecisionEngine", "AIDEOutput"]
@@ -0,0 +1,487 @@
+"""Compact attack-graph engine used by SACD.
+
+Graphs are assembled with :class:`AttackGraphBuilder` and frozen into
+:class:`CompactAttackGraph`, which keeps the topology in CSR arrays (forward
+and reverse) instead of lists of Pydantic nodes and edges. Every node carries
+the likelihood that it can be compromised once reached and every edge the
+likelihood that it can be traversed, so a path's likelihood is the product of
+its entry node, edges and nodes. Searching over ``-log(likelihood)`` turns the
+most likely path into a shortest path:
+
+* :meth:`CompactAttackGraph.best_path` -- Dijkstra from all entry points;
+* :meth:`CompactAttackGraph.k_best_paths` -- Yen's loopless k-shortest paths,
+  with every spur search run as A* guided by exact distances to the goals from
+  one reverse Dijkstra, so spurs expand little more than the path they return;
+* :meth:`CompactAttackGraph.choke_points` -- Brandes dependency accumulation
+  from the entry points toward the goals (source-to-goal betweenness).
+
+Pydantic models are only built by :meth:`CompactAttackGraph.to_model` for the
+subgraph that is returned.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ...shared.types import AttackGraph, AttackPathEdge, AttackPathNode
+
+PHASES: Tuple[str, ...] = ("recon", "weaponize", "deliver", "exploit", "maintain")
+_PHASE_CODES = {phase: code for code, phase in enumerate(PHASES)}
+_MIN_LIKELIHOOD = 1e-12
+_INF = math.inf
+
+
+def _cost(likelihood: float) -> float:
+    return -math.log(min(1.0, max(likelihood, _MIN_LIKELIHOOD)))
+
+
+@dataclass(frozen=True)
+class AttackPath:
+    nodes: Tuple[str, ...]
+    likelihood: float
+
+
+@dataclass(frozen=True)
+class ChokePoint:
+    node: str
+    score: float
+
+
+class AttackGraphBuilder:
+    """Accumulate nodes and edges; parallel edges keep the most likely one."""
+
+    def __init__(self) -> None:
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._labels: List[str] = []
+        self._phases = array("B")
+        self._likelihoods = array("d")
+        self._entries: Set[int] = set()
+        self._goals: Set[int] = set()
+        self._edges: Dict[Tuple[int, int], Tuple[float, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._index
+
+    def add_node(
+        self,
+        node_id: str,
+        label: Optional[str] = None,
+        phase: str = "recon",
+        likelihood: float = 1.0,
+        entry: bool = False,
+        goal: bool = False,
+    ) -> int:
+        """Add or update a node and return its index."""
+
+        index = self._index.get(node_id)
+        if index is None:
+            index = self._index[node_id] = len(self._ids)
+            self._ids.append(node_id)
+            self._labels.append(label or node_id)
+            self._phases.append(_PHASE_CODES[phase])
+            self._likelihoods.append(likelihood)
+        else:
+            if label:
+                self._labels[index] = label
+            self._phases[index] = _PHASE_CODES[phase]
+            self._likelihoods[index] = likelihood
+        if entry:
+            self._entries.add(index)
+        if goal:
+            self._goals.add(index)
+        return index
+
+    def add_edge(self, source: str, target: str, likelihood: float = 1.0, description: str = "") -> None:
+        """Add an edge; unknown endpoints are created as plain nodes."""
+
+        source_index = self._index.get(source)
+        if source_index is None:
+            source_index = self.add_node(source)
+        target_index = self._index.get(target)
+        if target_index is None:
+            target_index = self.add_node(target)
+        key = (source_index, target_index)
+        current = self._edges.get(key)
+        if current is None or likelihood > current[0]:
+            self._edges[key] = (likelihood, description)
+
+    def build(self) -> "CompactAttackGraph":
+        return CompactAttackGraph(
+            ids=tuple(self._ids),
+            labels=tuple(self._labels),
+            phases=array("B", self._phases),
+            likelihoods=array("d", self._likelihoods),
+            entries=frozenset(self._entries),
+            goals=frozenset(self._goals),
+            edges=self._edges,
+        )
+
+
+def _csr(node_count: int, pairs: Sequence[Tuple[int, int]]) -> Tuple[array, array, array]:
+    """CSR offsets/columns for ``pairs`` plus the original position of every slot."""
+
+    indptr = array("l", [0]) * (node_count + 1)
+    for source, _ in pairs:
+        indptr[source + 1] += 1
+    for node in range(node_count):
+        indptr[node + 1] += indptr[node]
+    cursor = array("l", indptr)
+    indices = array("l", [0]) * len(pairs)
+    positions = array("l", [0]) * len(pairs)
+    for position, (source, target) in enumerate(pairs):
+        slot = cursor[source]
+        cursor[source] = slot + 1
+        indices[slot] = target
+        positions[slot] = position
+    return indptr, indices, positions
+
+
+class CompactAttackGraph:
+    """Immutable attack graph stored as forward and reverse CSR arrays."""
+
+    def __init__(
+        self,
+        ids: Tuple[str, ...],
+        labels: Tuple[str, ...],
+        phases: array,
+        likelihoods: array,
+        entries: frozenset,
+        goals: frozenset,
+        edges: Dict[Tuple[int, int], Tuple[float, str]],
+    ) -> None:
+        self._ids = ids
+        self._index = {node_id: index for index, node_id in enumerate(ids)}
+        self._labels = labels
+        self._phases = phases
+        self._likelihoods = likelihoods
+        self._node_costs = array("d", (_cost(value) for value in likelihoods))
+        pairs = list(edges)
+        descriptions: Dict[str, int] = {}
+        self._edge_sources = array("l", (source for source, _ in pairs))
+        self._edge_targets = array("l", (target for _, target in pairs))
+        self._edge_likelihoods = array("d", (edges[pair][0] for pair in pairs))
+        self._edge_descriptions = array(
+            "l", (descriptions.setdefault(edges[pair][1], len(descriptions)) for pair in pairs)
+        )
+        self._descriptions = tuple(descriptions)
+        edge_costs = [
+            _cost(likelihood) + self._node_costs[target]
+            for likelihood, target in zip(self._edge_likelihoods, self._edge_targets)
+        ]
+        # Traversal cost of u -> v includes compromising v.
+        self._indptr, self._indices, self._slot_positions = _csr(len(ids), pairs)
+        self._costs = array("d", (edge_costs[position] for position in self._slot_positions))
+        self._rindptr, self._rindices, reverse_positions = _csr(len(ids), [(target, source) for source, target in pairs])
+        self._rcosts = array("d", (edge_costs[position] for position in reverse_positions))
+        self._entries = entries or frozenset(
+            node for node in range(len(ids)) if self._rindptr[node] == self._rindptr[node + 1]
+        )
+        self._goals = goals or frozenset(node for node in range(len(ids)) if self._indptr[node] == self._indptr[node + 1])
+
+    @property
+    def node_count(self) -> int:
+        return len(self._ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._indices)
+
+    @property
+    def entries(self) -> List[str]:
+        return [self._ids[node] for node in sorted(self._entries)]
+
+    @property
+    def goals(self) -> List[str]:
+        return [self._ids[node] for node in sorted(self._goals)]
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._index
+
+    # -- searches -----------------------------------------------------------------
+
+    def _resolve(self, node_ids: Optional[Iterable[str]], default: frozenset) -> frozenset:
+        if node_ids is None:
+            return default
+        return frozenset(self._index[node_id] for node_id in node_ids)
+
+    def _distances_to(self, goals: frozenset) -> List[float]:
+        """Exact cost from every node to the nearest goal (reverse Dijkstra)."""
+
+        indptr, indices, costs = self._rindptr.tolist(), self._rindices.tolist(), self._rcosts.tolist()
+        distances = [_INF] * len(self._ids)
+        heap = [(0.0, goal) for goal in goals]
+        for goal in goals:
+            distances[goal] = 0.0
+        heapq.heapify(heap)
+        pop, push = heapq.heappop, heapq.heappush
+        while heap:
+            distance, node = pop(heap)
+            if distance > distances[node]:
+                continue
+            for slot in range(indptr[node], indptr[node + 1]):
+                candidate = distance + costs[slot]
+                neighbour = indices[slot]
+                if candidate < distances[neighbour]:
+                    distances[neighbour] = candidate
+                    push(heap, (candidate, neighbour))
+        return distances
+
+    def _search(
+        self,
+        starts: Dict[int, float],
+        goals: frozenset,
+        heuristic: List[float],
+        adjacency: Tuple[list, list, list],
+        banned_nodes: Set[int] = frozenset(),  # type: ignore[assignment]
+        banned_first: Set[int] = frozenset(),  # type: ignore[assignment]
+    ) -> Optional[Tuple[float, List[int]]]:
+        """A* from ``starts`` (node -> cost so far) to any goal.
+
+        ``banned_first`` removes edges leaving the (single) start node; it is
+        how Yen's algorithm excludes deviations already taken.
+        """
+
+        indptr, indices, costs = adjacency
+        best: Dict[int, float] = {}
+        parents: Dict[int, int] = {}
+        heap = []
+        for node, cost in starts.items():
+            if heuristic[node] < _INF:
+                best[node] = cost
+                parents[node] = -1
+                heap.append((cost + heuristic[node], cost, node))
+        heapq.heapify(heap)
+        pop, push = heapq.heappop, heapq.heappush
+        closed: Set[int] = set()
+        while heap:
+            _, cost, node = pop(heap)
+            if node in closed:
+                continue
+            if node in goals:
+                path = [node]
+                while parents[path[-1]] != -1:
+                    path.append(parents[path[-1]])
+                path.reverse()
+                return cost, path
+            closed.add(node)
+            excluded = banned_first if node in starts else ()
+            for slot in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[slot]
+                if neighbour in closed or neighbour in banned_nodes or neighbour in excluded:
+                    continue
+                candidate = cost + costs[slot]
+                if candidate < best.get(neighbour, _INF):
+                    best[neighbour] = candidate
+                    parents[neighbour] = node
+                    push(heap, (candidate + heuristic[neighbour], candidate, neighbour))
+        return None
+
+    def _adjacency(self) -> Tuple[list, list, list]:
+        return self._indptr.tolist(), self._indices.tolist(), self._costs.tolist()
+
+    def _to_path(self, cost: float, nodes: Sequence[int]) -> AttackPath:
+        return AttackPath(nodes=tuple(self._ids[node] for node in nodes), likelihood=math.exp(-cost))
+
+    def best_path(
+        self, sources: Optional[Iterable[str]] = None, goals: Optional[Iterable[str]] = None
+    ) -> Optional[AttackPath]:
+        """Most likely path from any source (default: entries) to any goal."""
+
+        paths = self.k_best_paths(1, sources, goals)
+        return paths[0] if paths else None
+
+    def k_best_paths(
+        self, k: int, sources: Optional[Iterable[str]] = None, goals: Optional[Iterable[str]] = None
+    ) -> List[AttackPath]:
+        """The ``k`` most likely loopless paths, most likely first (Yen).
+
+        A path ends at the first goal it reaches; goals are never crossed.
+        """
+
+        source_set = self._resolve(sources, self._entries)
+        goal_set = self._resolve(goals, self._goals)
+        if k <= 0 or not source_set or not goal_set:
+            return []
+        heuristic = self._distances_to(goal_set)
+        adjacency = self._adjacency()
+        indptr, indices, costs = adjacency
+        node_costs = self._node_costs
+        starts = {node: node_costs[node] for node in source_set}
+        first = self._search(starts, goal_set, heuristic, adjacency)
+        if first is None:
+            return []
+        accepted: List[Tuple[float, List[int]]] = [first]
+        seen = {tuple(first[1])}
+        candidates: List[Tuple[float, List[int]]] = []
+        while len(accepted) < k:
+            _, previous = accepted[-1]
+            # Spur from the virtual source: start at an entry no accepted path used.
+            used_entries = {path[0] for _, path in accepted}
+            spur = self._search(
+                {node: cost for node, cost in starts.items() if node not in used_entries}, goal_set, heuristic, adjacency
+            )
+            if spur is not None and tuple(spur[1]) not in seen:
+                seen.add(tuple(spur[1]))
+                heapq.heappush(candidates, spur)
+            root_cost = node_costs[previous[0]]
+            for position in range(len(previous) - 1):
+                spur_node = previous[position]
+                root = previous[: position + 1]
+                banned_first = {path[position + 1] for _, path in accepted if path[: position + 1] == root}
+                spur = self._search(
+                    {spur_node: root_cost},
+                    goal_set,
+                    heuristic,
+                    adjacency,
+                    banned_nodes=set(root[:-1]),
+                    banned_first=banned_first,
+                )
+                if spur is not None:
+                    total = root[:-1] + spur[1]
+                    key = tuple(total)
+                    if key not in seen:
+                        seen.add(key)
+                        heapq.heappush(candidates, (spur[0], total))
+                following = previous[position + 1]
+                for slot in range(indptr[spur_node], indptr[spur_node + 1]):
+                    if indices[slot] == following:
+                        root_cost += costs[slot]
+                        break
+            if not candidates:
+                break
+            accepted.append(heapq.heappop(candidates))
+        return [self._to_path(cost, nodes) for cost, nodes in accepted]
+
+    def choke_points(
+        self,
+        limit: int = 10,
+        sources: Optional[Iterable[str]] = None,
+        goals: Optional[Iterable[str]] = None,
+    ) -> List[ChokePoint]:
+        """Rank nodes by the share of most likely source-to-goal paths through them.
+
+        A score of 1.0 means every optimal path to every reachable goal crosses
+        the node; sources and goals themselves are not ranked.
+        """
+
+        source_set = self._resolve(sources, self._entries)
+        goal_set = self._resolve(goals, self._goals)
+        indptr, indices, costs = self._adjacency()
+        node_count = len(self._ids)
+        distances = [_INF] * node_count
+        sigma = [0] * node_count
+        parents: List[List[int]] = [[] for _ in range(node_count)]
+        order: List[int] = []
+        done = [False] * node_count
+        heap = []
+        for node in source_set:
+            distances[node] = self._node_costs[node]
+            sigma[node] = 1
+            heap.append((distances[node], node))
+        heapq.heapify(heap)
+        pop, push = heapq.heappop, heapq.heappush
+        while heap:
+            distance, node = pop(heap)
+            if done[node]:
+                continue
+            done[node] = True
+            order.append(node)
+            if node in goal_set:
+                continue
+            paths = sigma[node]
+            for slot in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[slot]
+                if done[neighbour]:
+                    continue
+                candidate = distance + costs[slot]
+                current = distances[neighbour]
+                if candidate < current - 1e-12:
+                    distances[neighbour] = candidate
+                    sigma[neighbour] = paths
+                    parents[neighbour] = [node]
+                    push(heap, (candidate, neighbour))
+                elif candidate <= current + 1e-12:
+                    sigma[neighbour] += paths
+                    parents[neighbour].append(node)
+        reached_goals = [goal for goal in goal_set if done[goal] and goal not in source_set]
+        if not reached_goals:
+            return []
+        dependency = [0.0] * node_count
+        for node in reversed(order):
+            weight = dependency[node] + (1.0 if node in goal_set else 0.0)
+            share = weight / sigma[node]
+            for parent in parents[node]:
+                dependency[parent] += sigma[parent] * share
+        total = len(reached_goals)
+        ranked = sorted(
+            (
+                (dependency[node] / total, node)
+                for node in order
+                if dependency[node] > 0 and node not in source_set and node not in goal_set
+            ),
+            key=lambda item: (-item[0], item[1]),
+        )
+        return [ChokePoint(node=self._ids[node], score=score) for score, node in ranked[:limit]]
+
+    # -- export -------------------------------------------------------------------
+
+    def to_model(self, target_id: str, node_ids: Optional[Iterable[str]] = None) -> AttackGraph:
+        """Pydantic view of the subgraph induced by ``node_ids`` (default: whole graph)."""
+
+        if node_ids is None:
+            selected = range(len(self._ids))
+            keep: Optional[Set[int]] = None
+        else:
+            keep = {self._index[node_id] for node_id in node_ids}
+            selected = sorted(keep)
+        nodes = [
+            AttackPathNode(
+                id=self._ids[node],
+                label=self._labels[node],
+                phase=PHASES[self._phases[node]],
+                likelihood=self._likelihoods[node],
+            )
+            for node in selected
+        ]
+        if keep is None:
+            positions: Iterable[int] = range(len(self._edge_sources))
+        else:
+            positions = sorted(
+                self._slot_positions[slot]
+                for source in keep
+                for slot in range(self._indptr[source], self._indptr[source + 1])
+                if self._indices[slot] in keep
+            )
+        edges = [
+            AttackPathEdge(
+                source=self._ids[self._edge_sources[position]],
+                target=self._ids[self._edge_targets[position]],
+                description=self._descriptions[self._edge_descriptions[position]],
+            )
+            for position in positions
+        ]
+        return AttackGraph(targetId=target_id, nodes=nodes, edges=edges)
+
+    def paths_subgraph(self, target_id: str, paths: Iterable[AttackPath]) -> AttackGraph:
+        """Pydantic view of the subgraph induced by the nodes on ``paths``."""
+
+        nodes: Dict[str, None] = {}
+        for path in paths:
+            nodes.update(dict.fromkeys(path.nodes))
+        return self.to_model(target_id, nodes)
+
+
+__all__ = [
+    "AttackGraphBuilder",
+    "AttackPath",
+    "ChokePoint",
+    "CompactAttackGraph",
+    "PHASES",
+]
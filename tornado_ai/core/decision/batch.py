@@ -0,0 +1,213 @@
+"""Vectorized TSA scoring for large batches of targets.
+
+Every target x tool pair in a chunk is scored with one matrix expression::
+
+    scores = round(outer(1 + unique(cvss) / 10, decision_weight) + cvss_bias, 2)
+
+(multiplied by the observed-performance factor of each asset kind x tool pair
+once the performance store has published any) and filtered with a boolean mask built from the asset-kind category
+priorities (``priority_mask[asset_kind][tool_category]``) and each target's
+history (tools whose latest result succeeded). Rows are ordered with a
+stable argsort, so plans match :meth:`ToolSelectionAssistant.build_plan` step
+for step. Plans are emitted as
+newline-delimited ``ToolPlan`` JSON assembled from per-tool fragments that are
+encoded once, which keeps serialization from dominating large batches.
+
+NumPy is optional (``pip install tornado-ai[batch]``); without it each target
+falls back to ``build_plan``.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, get_args
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the optional extra
+    np = None  # type: ignore[assignment]
+
+from ...shared.types import AssetKindLiteral, PriorToolResult, TargetProfile, ToolPlan
+from ...tools.registry import ToolRegistry
+from ..observability.telemetry import telemetry_center
+from .memo import successful_tools
+from .tsa import ToolSelectionAssistant, ToolSelectionContext
+
+DEFAULT_CHUNK_SIZE = 2048
+
+_TARGETS = telemetry_center.counter("aide.batch.targets", help="Targets scored by batch analysis").labels()
+_CHUNK_LATENCY = telemetry_center.histogram("aide.batch.chunk", help="Time to score and encode one chunk").labels()
+
+
+@dataclass(frozen=True)
+class _ToolMatrix:
+    """Per-TSA-version arrays describing every tool."""
+
+    version: Hashable
+    weights: "np.ndarray"
+    bias: "np.ndarray"
+    factors: Optional["np.ndarray"]
+    category_codes: "np.ndarray"
+    priority_mask: "np.ndarray"
+    asset_codes: Mapping[str, int]
+    tool_codes: Mapping[str, int]
+    step_prefixes: Tuple[str, ...]
+    step_suffixes: Tuple[str, ...]
+
+
+class BatchAnalyzer:
+    def __init__(self, registry: ToolRegistry, tsa: ToolSelectionAssistant) -> None:
+        self._registry = registry
+        self._tsa = tsa
+        self._matrix: Optional[_ToolMatrix] = None
+
+    @property
+    def vectorized(self) -> bool:
+        return np is not None
+
+    def _tool_matrix(self) -> _ToolMatrix:
+        matrix = self._matrix
+        version = self._tsa.version
+        if matrix is not None and matrix.version == version:
+            return matrix
+        definitions = self._registry.list_definitions()
+        categories = sorted({definition.spec.category for definition in definitions})
+        category_index = {category: index for index, category in enumerate(categories)}
+        asset_kinds = list(get_args(AssetKindLiteral))
+        priority_mask = np.zeros((len(asset_kinds), len(categories)), dtype=bool)
+        for row, asset_kind in enumerate(asset_kinds):
+            for category in self._tsa.priorities_for(asset_kind):
+                if category in category_index:
+                    priority_mask[row, category_index[category]] = True
+        performance = self._tsa.performance_snapshot()
+        factors = None
+        if performance.factors:
+            factors = np.array(
+                [
+                    [performance.factor(definition.spec.id, asset_kind) for definition in definitions]
+                    for asset_kind in asset_kinds
+                ],
+                dtype=float,
+            )
+        prefixes: List[str] = []
+        suffixes: List[str] = []
+        for definition in definitions:
+            spec = definition.spec
+            rationale = self._tsa._CATEGORY_RATIONALES.get(spec.category)
+            prefixes.append(
+                f'{{"toolId":{json.dumps(spec.id)},"rationale":{json.dumps(rationale)},"score":'
+                if rationale is not None
+                else ""
+            )
+            suffixes.append(
+                f',"category":{json.dumps(spec.category)},'
+                f'"prerequisites":{json.dumps(self._tsa._prerequisites_for(spec.id, spec.category))}}}'
+            )
+        matrix = self._matrix = _ToolMatrix(
+            version=version,
+            weights=np.fromiter((definition.decision_weight for definition in definitions), dtype=float),
+            bias=np.fromiter((definition.cvss_bias for definition in definitions), dtype=float),
+            factors=factors,
+            category_codes=np.fromiter(
+                (category_index[definition.spec.category] for definition in definitions), dtype=np.intp
+            ),
+            priority_mask=priority_mask,
+            asset_codes={asset_kind: index for index, asset_kind in enumerate(asset_kinds)},
+            tool_codes={definition.spec.id: index for index, definition in enumerate(definitions)},
+            step_prefixes=tuple(prefixes),
+            step_suffixes=tuple(suffixes),
+        )
+        return matrix
+
+    def stream(
+        self,
+        targets: Sequence[TargetProfile],
+        history: Optional[Mapping[str, Sequence[PriorToolResult]]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[str]:
+        """Yield newline-delimited ``ToolPlan`` JSON, one string per chunk of targets."""
+
+        history = history or {}
+        for start in range(0, len(targets), chunk_size):
+            chunk = targets[start : start + chunk_size]
+            began = perf_counter()
+            if np is None:
+                lines = [self._fallback_line(profile, history.get(profile.targetId, ())) for profile in chunk]
+            else:
+                lines = self._score_chunk(chunk, history)
+            _CHUNK_LATENCY.observe(perf_counter() - began)
+            _TARGETS.inc(len(chunk))
+            yield "\n".join(lines) + "\n"
+
+    def plans(
+        self,
+        targets: Sequence[TargetProfile],
+        history: Optional[Mapping[str, Sequence[PriorToolResult]]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[ToolPlan]:
+        for chunk in self.stream(targets, history, chunk_size):
+            for line in chunk.splitlines():
+                yield ToolPlan.model_validate_json(line)
+
+    def _fallback_line(self, profile: TargetProfile, history: Iterable[PriorToolResult]) -> str:
+        plan = self._tsa.build_plan(ToolSelectionContext(profile=profile, history=list(history)))
+        return plan.model_dump_json()
+
+    def _score_chunk(
+        self, chunk: Sequence[TargetProfile], history: Mapping[str, Sequence[PriorToolResult]]
+    ) -> List[str]:
+        matrix = self._tool_matrix()
+        cvss = np.fromiter((profile.cvss for profile in chunk), dtype=float, count=len(chunk))
+        assets = np.fromiter((matrix.asset_codes[profile.assetKind] for profile in chunk), dtype=np.intp, count=len(chunk))
+        # Scores only depend on CVSS, so the matrix is computed over the distinct
+        # values of the chunk. Rounding uses the builtin so ties on the second
+        # decimal resolve exactly as in ``build_plan`` (``np.round`` differs).
+        distinct, inverse = np.unique(cvss, return_inverse=True)
+        raw = np.outer(1.0 + distinct / 10, matrix.weights) + matrix.bias
+        if matrix.factors is not None:
+            # Performance factors also depend on the asset kind: score the
+            # distinct (CVSS, asset kind) pairs instead.
+            kinds = len(matrix.asset_codes)
+            pairs, inverse = np.unique(inverse * kinds + assets, return_inverse=True)
+            raw = raw[pairs // kinds] * matrix.factors[pairs % kinds]
+        table = np.array([[round(value, 2) for value in row] for row in raw.tolist()], dtype=float).reshape(raw.shape)
+        scores = table[inverse]
+        mask = matrix.priority_mask[assets][:, matrix.category_codes]
+        if history:
+            rows: List[int] = []
+            cols: List[int] = []
+            for row, profile in enumerate(chunk):
+                # Like ``build_plan``, only the latest result per tool counts.
+                for tool_id in successful_tools(history.get(profile.targetId, ())):
+                    column = matrix.tool_codes.get(tool_id)
+                    if column is not None:
+                        rows.append(row)
+                        cols.append(column)
+            if rows:
+                mask[rows, cols] = False
+        order = np.argsort(np.where(mask, -scores, np.inf), axis=1, kind="stable")
+        counts = mask.sum(axis=1).tolist()
+        score_rows = scores.tolist()
+        prefixes = matrix.step_prefixes
+        suffixes = matrix.step_suffixes
+        lines: List[str] = []
+        for row, profile in enumerate(chunk):
+            row_scores = score_rows[row]
+            steps = []
+            for column in order[row, : counts[row]].tolist():
+                prefix = prefixes[column] or self._dynamic_prefix(column, profile)
+                steps.append(f"{prefix}{row_scores[column]!r}{suffixes[column]}")
+            lines.append(
+                f'{{"targetId":{json.dumps(profile.targetId)},"steps":[{",".join(steps)}],'
+                f'"summary":{json.dumps(self._tsa.summarize(profile, counts[row]))}}}'
+            )
+        return lines
+
+    def _dynamic_prefix(self, column: int, profile: TargetProfile) -> str:
+        spec = self._registry.list_definitions()[column].spec
+        rationale = self._tsa._rationale_for(spec.category, profile)
+        return f'{{"toolId":{json.dumps(spec.id)},"rationale":{json.dumps(rationale)},"score":'
+
+
+__all__ = ["BatchAnalyzer", "DEFAULT_CHUNK_SIZE"]
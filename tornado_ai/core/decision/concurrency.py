@@ -0,0 +1,209 @@
+"""Adaptive (AIMD) concurrency limits for tool execution.
+
+Each target has a congestion window, and so does the whole worker pool. A
+task may start only while both have room. Every healthy completion grows
+both windows by ``increase / window`` (about ``+increase`` per window's worth
+of completions, as in TCP congestion avoidance); unhealthy ones shrink them
+multiplicatively, at most once per ``cooldown`` so one burst of failures is
+one cut:
+
+* an error shrinks the target's window,
+* a timeout shrinks the target's and the global window,
+* a tool whose recent adapter latency (p90 over ``latency_window`` seconds of
+  ``adapter.latency`` in :class:`TelemetryCenter`) exceeds ``latency_tolerance``
+  times its long-run median shrinks the global window, since the workers (not
+  one target) are saturated; target windows hold.
+
+Target windows never exceed their ``ScanGuardrail.maxParallelTasks`` (the
+strictest scan profile listing the target, re-read on every admission) or
+``target_ceiling`` otherwise.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic, time
+from typing import Callable, Dict, List, Literal, Optional
+
+from ...config import config
+from ..control.center import control_center
+from ..observability.telemetry import TelemetryCenter, telemetry_center
+
+Outcome = Literal["success", "error", "timeout"]
+
+
+@dataclass
+class AIMDWindow:
+    limit: float
+    ceiling: int
+    in_flight: int = 0
+    decreased_at: float = -math.inf
+
+    @property
+    def size(self) -> int:
+        return max(1, min(self.ceiling, int(self.limit)))
+
+    def admits(self) -> bool:
+        return self.in_flight < self.size
+
+    def increase(self, step: float) -> bool:
+        if self.limit >= self.ceiling:
+            self.limit = float(self.ceiling)
+            return False
+        self.limit = min(float(self.ceiling), self.limit + step / max(1.0, self.limit))
+        return True
+
+    def decrease(self, factor: float, now: float, cooldown: float) -> bool:
+        if now - self.decreased_at < cooldown:
+            return False
+        self.limit = max(1.0, min(self.limit, float(self.ceiling)) * factor)
+        self.decreased_at = now
+        return True
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"limit": self.size, "window": round(self.limit, 3), "ceiling": self.ceiling, "inFlight": self.in_flight}
+
+
+class AdaptiveConcurrencyController:
+    def __init__(
+        self,
+        global_ceiling: int = 32,
+        target_ceiling: int = 8,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+        latency_tolerance: float = 2.0,
+        latency_window: int = 60,
+        min_latency_samples: int = 20,
+        ceilings: Optional[Callable[[str], Optional[int]]] = None,
+        max_targets: int = 1024,
+        center: TelemetryCenter = telemetry_center,
+    ) -> None:
+        if not 0.0 < decrease < 1.0:
+            raise ValueError("decrease must be between 0 and 1")
+        self.target_ceiling = target_ceiling
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.latency_tolerance = latency_tolerance
+        self.latency_window = latency_window
+        self.min_latency_samples = min_latency_samples
+        self._ceilings = ceilings
+        self._max_targets = max_targets
+        self._global = AIMDWindow(limit=float(global_ceiling), ceiling=global_ceiling)
+        self._targets: "OrderedDict[str, AIMDWindow]" = OrderedDict()
+        self._waiters: List["asyncio.Future[None]"] = []
+        self._latency = center.histogram("adapter.latency", labelnames=("tool",), help="Dry-run adapter execution latency")
+        adjustments = center.counter(
+            "roe.concurrency.adjustments",
+            labelnames=("scope", "direction"),
+            help="AIMD concurrency window changes",
+        )
+        self._adjusted = {
+            (scope, direction): adjustments.labels(scope, direction)
+            for scope in ("target", "global")
+            for direction in ("increase", "decrease")
+        }
+
+    def window(self, target_id: str, initial: Optional[int] = None) -> AIMDWindow:
+        """The target's window, created at ``initial`` (default: its ceiling) on first use."""
+
+        ceiling = self.target_ceiling
+        if self._ceilings is not None:
+            guardrail = self._ceilings(target_id)
+            if guardrail is not None:
+                ceiling = max(1, guardrail)
+        window = self._targets.get(target_id)
+        if window is not None:
+            self._targets.move_to_end(target_id)
+            window.ceiling = ceiling
+            return window
+        start = float(min(ceiling, initial if initial is not None else ceiling))
+        window = self._targets[target_id] = AIMDWindow(limit=max(1.0, start), ceiling=ceiling)
+        if len(self._targets) > self._max_targets:
+            for stale, candidate in list(self._targets.items()):
+                if candidate.in_flight == 0 and stale != target_id:
+                    del self._targets[stale]
+                    break
+        return window
+
+    def limit(self, target_id: str, initial: Optional[int] = None) -> int:
+        return min(self.window(target_id, initial).size, self._global.size)
+
+    def try_acquire(self, target_id: str, initial: Optional[int] = None) -> bool:
+        window = self.window(target_id, initial)
+        if not (window.admits() and self._global.admits()):
+            return False
+        window.in_flight += 1
+        self._global.in_flight += 1
+        return True
+
+    def release(self, target_id: str, tool_id: str, outcome: Outcome) -> None:
+        window = self._targets.get(target_id)
+        if window is not None:
+            window.in_flight = max(0, window.in_flight - 1)
+        self._global.in_flight = max(0, self._global.in_flight - 1)
+        now = monotonic()
+        latency_healthy = self.latency_healthy(tool_id)
+        if window is not None and (outcome != "success" or latency_healthy):
+            self._adjust("target", window, outcome == "success", now)
+        self._adjust("global", self._global, outcome != "timeout" and latency_healthy, now)
+        self._wake()
+
+    def forfeit(self, target_id: str) -> None:
+        """Free a slot without feeding back an outcome (the task was cancelled)."""
+
+        window = self._targets.get(target_id)
+        if window is not None:
+            window.in_flight = max(0, window.in_flight - 1)
+        self._global.in_flight = max(0, self._global.in_flight - 1)
+        self._wake()
+
+    def released(self) -> "asyncio.Future[None]":
+        """Future resolved by the next :meth:`release` (to wait for a free slot)."""
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        return waiter
+
+    def latency_healthy(self, tool_id: str) -> bool:
+        series = self._latency.series.get((("tool", tool_id),))
+        if series is None or series.histogram.count < self.min_latency_samples:
+            return True
+        recent = series.window.merged(self.latency_window, time())
+        if not recent.count:
+            return True
+        return recent.quantile(0.9) <= self.latency_tolerance * series.histogram.quantile(0.5)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "global": self._global.to_dict(),
+            "targets": {target_id: window.to_dict() for target_id, window in self._targets.items()},
+        }
+
+    def _wake(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _adjust(self, scope: str, window: AIMDWindow, healthy: bool, now: float) -> None:
+        if healthy:
+            changed = window.increase(self.increase)
+        else:
+            changed = window.decrease(self.decrease, now, self.cooldown)
+        if changed:
+            self._adjusted[(scope, "increase" if healthy else "decrease")].inc()
+
+
+def build_concurrency_controller() -> AdaptiveConcurrencyController:
+    return AdaptiveConcurrencyController(
+        global_ceiling=config.decision.concurrency_max,
+        target_ceiling=config.decision.target_concurrency_max,
+        ceilings=control_center.max_parallel_tasks,
+    )
+
+
+__all__ = ["AIMDWindow", "AdaptiveConcurrencyController", "Outcome", "build_concurrency_controller"]
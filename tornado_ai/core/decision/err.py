@@ -1,20 +1,370 @@
-"""Error Recovery & Resilience (ERR) helpers."""
+"""Error Recovery & Resilience (ERR): retries, circuit breakers and fallbacks.
+
+Every execution goes through two circuit breakers, one for the tool and one
+for the (tool, target) pair. After ``failure_threshold`` consecutive failures
+a breaker opens and calls fail fast with :class:`CircuitOpenError` for
+``reset_timeout`` seconds; then a single probe is let through (half-open) and
+its outcome closes or re-opens the breaker. Failed attempts (exceptions or
+``errored`` results) are retried with full-jitter exponential backoff while the
+breakers allow it, within an overall deadline. When the tool stays
+unavailable, the tools named by its fallback actions (e.g. masscan for nmap)
+are tried with the parameters they accept.
+
+Lookup/type/value errors (an unknown tool, malformed parameters) are treated
+as permanent: they are neither retried nor counted against a breaker.
+"""
 from __future__ import annotations
 
-from typing import Dict, List
+import asyncio
+import inspect
+import random
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple, Union
+
+from ...config import config
+from ...shared.types import ToolExecutionResult
+from ...tools.registry import ToolRegistry, tool_registry
+from ..observability.telemetry import TelemetryCenter, telemetry_center
+
+BreakerState = Literal["closed", "open", "half_open"]
+Attempt = Callable[[str, Dict[str, Any]], Union[ToolExecutionResult, Awaitable[ToolExecutionResult]]]
+
+_PERMANENT = (LookupError, TypeError, ValueError)
+
+
+@dataclass(frozen=True)
+class FallbackAction:
+    description: str
+    # The tool this action switches to, tried automatically when the original stays unavailable.
+    tool: Optional[str] = None
+
+
+_FALLBACK_ACTIONS: Dict[str, Tuple[FallbackAction, ...]] = {
+    "nmap_scan.sim": (
+        FallbackAction("Retry with reduced intensity"),
+        FallbackAction("Switch to masscan for confirmation", tool="masscan_scan.sim"),
+    ),
+    "nuclei_scan.sim": (
+        FallbackAction("Validate target availability"),
+        FallbackAction("Run with smaller template set"),
+    ),
+    "sqlmap_scan.sim": (
+        FallbackAction("Confirm injection point manually"),
+        FallbackAction("Try time-based payloads"),
+    ),
+}
+_DEFAULT_ACTIONS = ["Review tool configuration", "Escalate to human analyst"]
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, tool_id: str, target_id: Optional[str] = None) -> None:
+        scope = f"{tool_id} on {target_id}" if target_id is not None else tool_id
+        super().__init__(f"Circuit breaker open for {scope}")
+        self.tool_id = tool_id
+        self.target_id = target_id
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    # Seconds one execution may spend on retries and alternates (``None``: unbounded).
+    deadline: Optional[float] = None
+
+    def delay(self, retry: int, rng: random.Random) -> float:
+        """Full jitter: uniform in ``[0, min(max_delay, base_delay * 2**retry)]``."""
+
+        return rng.uniform(0.0, min(self.max_delay, self.base_delay * (2**retry)))
+
+
+@dataclass
+class CircuitBreaker:
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    state: BreakerState = "closed"
+    failures: int = 0
+    changed_at: float = 0.0
+    probe_started: Optional[float] = None
+
+    def ready(self, now: float) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            return now - self.changed_at >= self.reset_timeout
+        # Half-open admits one probe; a probe that never reported back is replaced.
+        return self.probe_started is None or now - self.probe_started >= self.reset_timeout
+
+    def acquire(self, now: float) -> Optional[BreakerState]:
+        """Claim a call slot (``ready`` must be true); returns the new state on a transition."""
+
+        if self.state == "closed":
+            return None
+        transition: Optional[BreakerState] = None
+        if self.state == "open":
+            self.state, self.changed_at = "half_open", now
+            transition = "half_open"
+        self.probe_started = now
+        return transition
+
+    def success(self, now: float) -> Optional[BreakerState]:
+        self.failures = 0
+        self.probe_started = None
+        if self.state == "closed":
+            return None
+        self.state, self.changed_at = "closed", now
+        return "closed"
+
+    def failure(self, now: float) -> Optional[BreakerState]:
+        self.failures += 1
+        self.probe_started = None
+        if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+            self.state, self.changed_at = "open", now
+            return "open"
+        return None
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "since": round(now - self.changed_at, 3)}
 
 
 class ErrorRecoveryAndResilience:
+    def __init__(
+        self,
+        registry: Optional[ToolRegistry] = None,
+        retry: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_breakers: int = 4096,
+        center: TelemetryCenter = telemetry_center,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._registry = registry
+        self.retry = retry or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._max_breakers = max_breakers
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        # Tool breakers are few (validated tool ids) and kept for good; the
+        # (tool, target) pairs are LRU-bounded, evicting only closed breakers.
+        self._tool_breakers: Dict[str, CircuitBreaker] = {}
+        self._target_breakers: "OrderedDict[Tuple[str, str], CircuitBreaker]" = OrderedDict()
+        self._transitions = center.counter(
+            "err.breaker.transitions", labelnames=("scope", "state"), help="Circuit breaker state changes"
+        )
+        self._rejected = center.counter(
+            "err.breaker.rejected", labelnames=("tool",), max_series=256, help="Calls failed fast by an open breaker"
+        )
+        self._retries = center.counter("err.retries", labelnames=("tool",), max_series=256, help="Retried tool attempts")
+        self._fallbacks = center.counter(
+            "err.fallbacks", labelnames=("tool",), max_series=256, help="Executions served by an alternate tool"
+        )
+        self._expired = center.counter(
+            "err.deadline.expired",
+            labelnames=("tool",),
+            max_series=256,
+            help="Executions that stopped retrying at their deadline",
+        )
+
     def fallback_actions(self, tool_id: str) -> List[str]:
-        mapping: Dict[str, List[str]] = {
-            "nmap_scan.sim": ["Retry with reduced intensity", "Switch to masscan for confirmation"],
-            "nuclei_scan.sim": ["Validate target availability", "Run with smaller template set"],
-            "sqlmap_scan.sim": ["Confirm injection point manually", "Try time-based payloads"],
-        }
-        return mapping.get(tool_id, ["Review tool configuration", "Escalate to human analyst"])
+        actions = _FALLBACK_ACTIONS.get(tool_id)
+        if actions is None:
+            return list(_DEFAULT_ACTIONS)
+        return [action.description for action in actions]
+
+    def alternates(self, tool_id: str) -> List[str]:
+        """Tools named by ``tool_id``'s fallback actions (those registered, with a registry)."""
+
+        tools = [action.tool for action in _FALLBACK_ACTIONS.get(tool_id, ()) if action.tool is not None]
+        if self._registry is not None:
+            tools = [tool for tool in tools if tool in self._registry]
+        return tools
+
+    def breaker(self, tool_id: str, target_id: Optional[str] = None) -> CircuitBreaker:
+        """The tool's breaker, or the (tool, target) pair's when ``target_id`` is given."""
+
+        if target_id is None:
+            breaker = self._tool_breakers.get(tool_id)
+            if breaker is None:
+                breaker = self._tool_breakers[tool_id] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+        key = (tool_id, target_id)
+        breaker = self._target_breakers.get(key)
+        if breaker is None:
+            breaker = self._target_breakers[key] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            if len(self._target_breakers) > self._max_breakers:
+                self._evict()
+        else:
+            self._target_breakers.move_to_end(key)
+        return breaker
+
+    def _evict(self) -> None:
+        # Forgetting an open or half-open breaker would silently close it, so
+        # those stay (past the bound if need be) until they recover.
+        for key, breaker in self._target_breakers.items():
+            if breaker.state == "closed":
+                del self._target_breakers[key]
+                return
+
+    def breaker_states(self) -> Dict[str, Any]:
+        """Every tool breaker, and the (tool, target) breakers that are not healthy."""
+
+        now = monotonic()
+        tools: Dict[str, Any] = {}
+        targets: List[Dict[str, Any]] = []
+        for tool_id, breaker in self._tool_breakers.items():
+            tools[tool_id] = breaker.to_dict(now)
+        for (tool_id, target_id), breaker in self._target_breakers.items():
+            if breaker.state != "closed" or breaker.failures:
+                targets.append({"toolId": tool_id, "targetId": target_id, **breaker.to_dict(now)})
+        return {"tools": tools, "targets": targets}
+
+    def reset(self) -> None:
+        self._tool_breakers.clear()
+        self._target_breakers.clear()
+
+    async def execute(
+        self,
+        tool_id: str,
+        params: Dict[str, Any],
+        attempt: Attempt,
+        target_id: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> ToolExecutionResult:
+        """Run ``attempt`` for ``tool_id`` (then its alternates) with retries behind the breakers.
+
+        Returns the first successful result, annotated with ``fallbackFrom`` in
+        its telemetry when an alternate produced it; otherwise the last
+        ``errored`` result, or re-raises the last failure. No retry or
+        alternate starts after ``deadline`` (a ``time.monotonic()`` value,
+        by default ``retry.deadline`` seconds from now); a backoff that would
+        end past it is not slept.
+        """
+
+        if deadline is None and self.retry.deadline is not None:
+            deadline = monotonic() + self.retry.deadline
+        failure: Union[ToolExecutionResult, BaseException, None] = None
+        for candidate in [tool_id, *self.alternates(tool_id)]:
+            if failure is not None and deadline is not None and monotonic() >= deadline:
+                self._expired.labels(tool_id).inc()
+                break
+            candidate_params = params if candidate == tool_id else self._params_for(candidate, params)
+            try:
+                result = await self._attempts(candidate, candidate_params, attempt, target_id, deadline)
+            except _PERMANENT:
+                if candidate == tool_id:
+                    raise
+                continue
+            except Exception as exc:  # noqa: BLE001 - the next alternate may still succeed
+                failure = exc
+                continue
+            if result.status == "errored":
+                failure = result
+                continue
+            if candidate != tool_id:
+                self._fallbacks.labels(tool_id).inc()
+                result = result.model_copy(update={"telemetry": {**result.telemetry, "fallbackFrom": tool_id}})
+            return result
+        if isinstance(failure, BaseException):
+            raise failure
+        assert failure is not None
+        return failure
+
+    async def _attempts(
+        self,
+        tool_id: str,
+        params: Dict[str, Any],
+        attempt: Attempt,
+        target_id: Optional[str],
+        deadline: Optional[float] = None,
+    ) -> ToolExecutionResult:
+        breakers = [("tool", self.breaker(tool_id))]
+        if target_id is not None:
+            breakers.append(("target", self.breaker(tool_id, target_id)))
+        failure: Union[ToolExecutionResult, Exception, None] = None
+        for retry in range(max(1, self.retry.attempts)):
+            if retry:
+                delay = self.retry.delay(retry - 1, self._rng)
+                if deadline is not None and monotonic() + delay >= deadline:
+                    self._expired.labels(tool_id).inc()
+                    break
+                self._retries.labels(tool_id).inc()
+                await self._sleep(delay)
+            now = monotonic()
+            if not all(breaker.ready(now) for _, breaker in breakers):
+                self._rejected.labels(tool_id).inc()
+                if failure is None:
+                    raise CircuitOpenError(tool_id, target_id)
+                break
+            for scope, breaker in breakers:
+                self._record(scope, breaker.acquire(now))
+            try:
+                outcome = attempt(tool_id, params)
+                result = await outcome if inspect.isawaitable(outcome) else outcome
+            except _PERMANENT:
+                for _, breaker in breakers:
+                    breaker.probe_started = None
+                raise
+            except Exception as exc:  # noqa: BLE001 - counted against the breakers and retried
+                failure = exc
+            else:
+                if result.status != "errored":
+                    now = monotonic()
+                    for scope, breaker in breakers:
+                        self._record(scope, breaker.success(now))
+                    return result
+                failure = result
+            now = monotonic()
+            for scope, breaker in breakers:
+                self._record(scope, breaker.failure(now))
+        if isinstance(failure, Exception):
+            raise failure
+        assert failure is not None
+        return failure
+
+    def _record(self, scope: str, transition: Optional[BreakerState]) -> None:
+        if transition is not None:
+            self._transitions.labels(scope, transition).inc()
+
+    def _params_for(self, tool_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the parameters ``tool_id`` declares (all of them without a registry)."""
+
+        if self._registry is None:
+            return dict(params)
+        try:
+            schema = self._registry.get_definition(tool_id).spec.inputSchema
+        except KeyError:
+            return dict(params)
+        return {key: value for key, value in params.items() if key in schema}
+
+
+def build_err() -> ErrorRecoveryAndResilience:
+    return ErrorRecoveryAndResilience(
+        registry=tool_registry,
+        retry=RetryPolicy(
+            attempts=config.decision.retry_attempts,
+            base_delay=config.decision.retry_base_delay,
+            max_delay=config.decision.retry_max_delay,
+            deadline=config.decision.retry_deadline or None,
+        ),
+        failure_threshold=config.decision.breaker_threshold,
+        reset_timeout=config.decision.breaker_reset,
+    )
 
 
-err = ErrorRecoveryAndResilience()
+err = build_err()
 
 
-__all__ = ["ErrorRecoveryAndResilience", "err"]
+__all__ = [
+    "BreakerState",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "ErrorRecoveryAndResilience",
+    "FallbackAction",
+    "RetryPolicy",
+    "build_err",
+    "err",
+]
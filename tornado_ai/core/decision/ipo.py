@@ -1,35 +1,265 @@
-"""Intelligent Parameter Optimizer (IPO)."""
+"""Intelligent Parameter Optimizer (IPO).
+
+Guardrails come from a declarative rule table (``data/ipo/rules.json`` unless
+``TORNADO_DECISION_IPO_RULES`` points elsewhere). A rule names a tool (or
+``"*"``) and optionally the environments and criticalities it applies to.
+Loading compiles the table into a dispatch index holding the merged
+parameters and rationale for every (tool, environment, criticality), so a
+suggestion is a single dictionary lookup however many rules there are.
+With tuning enabled (``TORNADO_DECISION_TUNING``), parameters in the tuning
+space are then chosen by :class:`~.tuning.ParameterTuner`, never beyond the
+rule values.
+
+Where several rules match, they are applied by ascending ``priority``, then
+specificity (how many of tool, environment and criticality they pin), then
+file order; later rules override earlier parameters and rationale. A tool
+without a rule of its own gets the ``"*"`` rules.
+
+The file is re-read when its modification time changes (checked at most
+every ``reload_interval`` seconds). A file that fails to load is logged and
+the previous rules stay in force.
+"""
 from __future__ import annotations
 
-from typing import Dict
+import copy
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Optional, Tuple, get_args
+
+from ...config import config
+from ...shared.types import (
+    CriticalityLiteral,
+    EnvironmentLiteral,
+    ParameterRule,
+    ParameterRuleSet,
+    ParameterSuggestion,
+    TargetProfile,
+)
+from ..observability.telemetry import TelemetryCenter, telemetry_center
+from .tuning import ParameterTuner, parameter_tuner
+
+logger = logging.getLogger(__name__)
+
+ANY = "*"
+DEFAULT_RULES_PATH = Path(__file__).resolve().parents[3] / "data" / "ipo" / "rules.json"
+
+_ENVIRONMENTS: Tuple[str, ...] = get_args(EnvironmentLiteral)
+_CRITICALITIES: Tuple[str, ...] = get_args(CriticalityLiteral)
+
+RuleKey = Tuple[str, str, str]
+
+# Placeholders a rationale may use.
+_TEMPLATE_FIELDS = ("toolId", "assetKind", "environment", "criticality")
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    params: Dict[str, Any]
+    rationale: str
+    # Ids of the rules merged into this entry, in application order.
+    sources: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class RuleIndex:
+    entries: Dict[RuleKey, CompiledRule]
+    rule_count: int
+    version: int = 0
+
+    def lookup(self, tool_id: str, environment: str, criticality: str) -> CompiledRule:
+        entry = self.entries.get((tool_id, environment, criticality))
+        if entry is None:
+            entry = self.entries[(ANY, environment, criticality)]
+        return entry
+
+
+def compile_rules(rule_set: ParameterRuleSet, version: int = 0) -> RuleIndex:
+    """Fold ``rule_set`` into a :class:`RuleIndex` covering every tool it names."""
+
+    def _specificity(rule: ParameterRule) -> int:
+        return (rule.tool != ANY) + (rule.environments is not None) + (rule.criticalities is not None)
+
+    for template in [rule_set.defaultRationale, *(rule.rationale for rule in rule_set.rules if rule.rationale)]:
+        try:
+            template.format(**dict.fromkeys(_TEMPLATE_FIELDS, ""))
+        except (IndexError, KeyError) as exc:
+            raise ValueError(f"Unknown placeholder {exc} in rationale {template!r}") from exc
+    ordered = sorted(
+        enumerate(rule_set.rules), key=lambda item: (item[1].priority, _specificity(item[1]), item[0])
+    )
+    tools = {ANY, *(rule.tool for rule in rule_set.rules)}
+    entries: Dict[RuleKey, CompiledRule] = {}
+    for tool_id in tools:
+        for environment in _ENVIRONMENTS:
+            for criticality in _CRITICALITIES:
+                params: Dict[str, Any] = {}
+                rationale = rule_set.defaultRationale
+                sources: List[str] = []
+                for _, rule in ordered:
+                    if rule.tool not in (ANY, tool_id):
+                        continue
+                    if rule.environments is not None and environment not in rule.environments:
+                        continue
+                    if rule.criticalities is not None and criticality not in rule.criticalities:
+                        continue
+                    params.update(rule.params)
+                    if rule.rationale is not None:
+                        rationale = rule.rationale
+                    sources.append(rule.id)
+                entries[(tool_id, environment, criticality)] = CompiledRule(params, rationale, tuple(sources))
+    return RuleIndex(entries=entries, rule_count=len(rule_set.rules), version=version)
 
-from ...shared.types import ParameterSuggestion, TargetProfile
+
+def load_rules(path: Path) -> ParameterRuleSet:
+    with path.open("r", encoding="utf-8") as handle:
+        rule_set = ParameterRuleSet.model_validate(json.load(handle))
+    seen = set()
+    for rule in rule_set.rules:
+        if rule.id in seen:
+            raise ValueError(f"Duplicate parameter rule id: {rule.id}")
+        seen.add(rule.id)
+    return rule_set
 
 
 class IntelligentParameterOptimizer:
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        rules: Optional[ParameterRuleSet] = None,
+        reload_interval: Optional[float] = None,
+        tuner: Optional[ParameterTuner] = None,
+        center: TelemetryCenter = telemetry_center,
+    ) -> None:
+        """Use ``rules`` as given, or load them from ``path`` (default: the bundled table).
+
+        With a ``path`` and a ``reload_interval``, the file is re-read when it
+        changes; ``reload_interval=None`` disables the check. With a ``tuner``,
+        tunable parameters are set by it, bounded by the rule values.
+        """
+
+        self._path = Path(path) if path is not None else (None if rules is not None else DEFAULT_RULES_PATH)
+        self.reload_interval = reload_interval
+        self._tuner = tuner
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._checked_at = monotonic()
+        self._reloads = center.counter(
+            "ipo.rules.reloads", labelnames=("outcome",), help="Parameter rule table reloads"
+        )
+        if rules is not None:
+            self._index = compile_rules(rules)
+        else:
+            assert self._path is not None
+            self._stamp = self._file_stamp()
+            self._index = compile_rules(load_rules(self._path))
+
+    @property
+    def index(self) -> RuleIndex:
+        return self._index
+
+    @property
+    def tuner(self) -> Optional[ParameterTuner]:
+        return self._tuner
+
+    @property
+    def version(self) -> int:
+        return self._index.version
+
     def suggest(self, tool_id: str, params: Dict[str, object], profile: TargetProfile) -> ParameterSuggestion:
-        guardrails = self._guardrails_for(tool_id, profile)
-        suggested = {**params, **guardrails}
-        rationale = self._rationale(tool_id, profile)
+        self._maybe_reload()
+        return self._suggest(self._index, tool_id, params, profile)
+
+    def suggest_many(
+        self, requests: Iterable[Tuple[str, Dict[str, object], TargetProfile]]
+    ) -> List[ParameterSuggestion]:
+        """:meth:`suggest` for many (tool, params, profile) triples against one rule table."""
+
+        self._maybe_reload()
+        index = self._index
+        return [self._suggest(index, tool_id, params, profile) for tool_id, params, profile in requests]
+
+    def reload(self) -> bool:
+        """Re-read the rule file; on failure keep the current rules and return ``False``."""
+
+        if self._path is None:
+            return False
+        try:
+            stamp = self._file_stamp()
+            index = compile_rules(load_rules(self._path), version=self._index.version + 1)
+        except (OSError, ValueError) as exc:  # includes JSON and schema validation errors
+            logger.warning("Keeping previous IPO rules; cannot load %s: %s", self._path, exc)
+            self._reloads.labels("failed").inc()
+            return False
+        self._index = index
+        self._stamp = stamp
+        self._reloads.labels("loaded").inc()
+        return True
+
+    def _maybe_reload(self) -> None:
+        if self._path is None or self.reload_interval is None:
+            return
+        now = monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            stamp = self._file_stamp()
+        except OSError:
+            stamp = None
+        if stamp != self._stamp:
+            # A failed reload leaves the old stamp, so the file is retried on the next check.
+            self.reload()
+
+    def _file_stamp(self) -> Tuple[int, int]:
+        assert self._path is not None
+        stat = os.stat(self._path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _suggest(
+        self, index: RuleIndex, tool_id: str, params: Dict[str, object], profile: TargetProfile
+    ) -> ParameterSuggestion:
+        entry = index.lookup(tool_id, profile.environment, profile.criticality)
+        # Rule values are shared by every suggestion; callers get their own copies.
+        suggested = {**params, **copy.deepcopy(entry.params)}
+        rationale = entry.rationale.format(
+            toolId=tool_id,
+            assetKind=profile.assetKind,
+            environment=profile.environment,
+            criticality=profile.criticality,
+        )
+        if self._tuner is not None:
+            choice = self._tuner.choose(tool_id, profile.assetKind, entry.params)
+            if choice is not None:
+                suggested.update(copy.deepcopy(choice.params))
+                settings = ", ".join(f"{name}={value!r}" for name, value in choice.params.items())
+                if choice.samples:
+                    rationale += (
+                        f" Tuned {settings} ({choice.findings_per_second:.2f} findings/s over {choice.samples} runs)."
+                    )
+                else:
+                    rationale += f" Exploring {settings}."
         return ParameterSuggestion(toolId=tool_id, suggestedParams=suggested, rationale=rationale)
 
-    def _guardrails_for(self, tool_id: str, profile: TargetProfile) -> Dict[str, object]:
-        if tool_id == "masscan_scan.sim":
-            return {"rate": 1000 if profile.environment == "production" else 5000}
-        if tool_id == "nuclei_scan.sim":
-            return {"severity": ["high", "critical"] if profile.criticality == "high" else ["medium", "high"]}
-        if tool_id == "sqlmap_scan.sim":
-            return {"risk": "2" if profile.environment == "production" else "3"}
-        return {}
-
-    def _rationale(self, tool_id: str, profile: TargetProfile) -> str:
-        if tool_id == "masscan_scan.sim":
-            return "Throttle scan rate to respect production-safe guardrails."
-        if tool_id == "nuclei_scan.sim":
-            return "Filter templates to focus on impactful vulnerabilities."
-        if tool_id == "sqlmap_scan.sim":
-            return "Adjust SQLMap risk profile according to environment sensitivity."
-        return f"Standard parameter optimization for {profile.assetKind}."
-
-
-__all__ = ["IntelligentParameterOptimizer"]
+
+def build_ipo() -> IntelligentParameterOptimizer:
+    path = Path(config.decision.ipo_rules) if config.decision.ipo_rules else None
+    interval = config.decision.ipo_reload
+    return IntelligentParameterOptimizer(
+        path=path,
+        reload_interval=interval if interval > 0 else None,
+        tuner=parameter_tuner if config.decision.tuning else None,
+    )
+
+
+__all__ = [
+    "CompiledRule",
+    "DEFAULT_RULES_PATH",
+    "IntelligentParameterOptimizer",
+    "RuleIndex",
+    "build_ipo",
+    "compile_rules",
+    "load_rules",
+]
@@ -0,0 +1,135 @@
+"""Snapshot plus append-only log persistence for running aggregates.
+
+A store keeps its aggregates in memory and describes every update as a small
+JSON entry. :class:`SnapshotJournal` persists them as a compact snapshot of
+the aggregates (``path``) and a log of the entries recorded since
+(``path`` + ``.log``), which is replayed on load.
+
+``append`` only buffers the entry, so the request path never touches the
+disk: a writer thread appends the buffered entries to the log every
+``flush_interval`` seconds and, once ``compact_every`` entries were logged,
+rewrites the snapshot atomically and starts a fresh log. A crash loses at
+most the last ``flush_interval`` seconds of entries.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import IO, Any, Callable, ContextManager, List, Optional, Tuple
+
+_SEPARATORS = (",", ":")
+
+
+class SnapshotJournal:
+    """Persist a store's aggregates as ``path`` plus a ``.log`` of entries since.
+
+    ``lock`` is the store's own lock: the store holds it around updating its
+    aggregates and calling :meth:`append`, and the journal takes it around
+    ``rows()`` when compacting, so a snapshot never double counts an entry
+    that is still buffered.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        lock: ContextManager[Any],
+        rows: Callable[[], List[Any]],
+        compact_every: int = 1000,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.log_path = path.with_name(path.name + ".log")
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+        self._lock = lock
+        self._rows = rows
+        self._pending: List[List[Any]] = []
+        self._log: Optional[IO[str]] = None
+        self._logged = 0
+        # Serializes file operations between the writer thread and callers.
+        self._io = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self) -> Tuple[List[Any], List[List[Any]]]:
+        """The snapshot rows and the logged entries since (empty when absent)."""
+
+        rows = json.loads(self.path.read_text(encoding="utf-8")) if self.path.exists() else []
+        entries: List[List[Any]] = []
+        if self.log_path.exists():
+            with self.log_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue  # a torn final line from a crash
+        return rows, entries
+
+    def start(self) -> None:
+        """Fold the loaded log into a fresh snapshot and start the writer thread."""
+
+        self.compact()
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="tornado-journal-writer", daemon=True)
+            self._thread.start()
+
+    def append(self, entry: List[Any]) -> None:
+        """Buffer ``entry`` for the writer thread; the caller holds the store's lock."""
+
+        self._pending.append(entry)
+
+    def flush(self) -> None:
+        """Write the buffered entries now, compacting when ``compact_every`` is reached."""
+
+        with self._io:
+            with self._lock:
+                entries, self._pending = self._pending, []
+            if entries and self._log is not None:
+                self._log.write("".join(json.dumps(entry, separators=_SEPARATORS) + "\n" for entry in entries))
+                self._log.flush()
+                self._logged += len(entries)
+            if self._logged >= self.compact_every:
+                self._compact()
+
+    def compact(self) -> None:
+        """Write the current aggregates as the snapshot and start an empty log."""
+
+        with self._io:
+            self._compact()
+
+    def close(self) -> None:
+        """Stop the writer thread and leave everything in the snapshot."""
+
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        with self._io:
+            self._compact()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.flush_interval):
+            self.flush()
+
+    def _compact(self) -> None:
+        with self._lock:
+            payload = json.dumps(self._rows(), separators=_SEPARATORS)
+            # Buffered entries are part of the rows now.
+            self._pending = []
+        if self._log is not None:
+            self._log.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        staging = self.path.with_name(self.path.name + ".tmp")
+        staging.write_text(payload, encoding="utf-8")
+        os.replace(staging, self.path)
+        self._log = self.log_path.open("w", encoding="utf-8")
+        self._logged = 0
+
+
+__all__ = ["SnapshotJournal"]
@@ -0,0 +1,398 @@
+"""Incrementally maintained per-target attack graphs fed by tool results.
+
+A :class:`LiveAttackGraph` starts from the SACD stage template and keeps a
+shortest-path tree over ``-log(likelihood)`` from the entry points. Tool
+results are translated into node/edge deltas (one node per finding, wired
+between the kill-chain stages its tool category informs) and each delta only
+repairs the part of the tree it touches:
+
+* cheaper edges or more likely nodes relax outward from the changed node
+  (Dijkstra seeded with that node only);
+* more expensive ones detach the subtree hanging below the change and re-root
+  it from its boundary.
+
+The best path to every goal is read off the tree, and when the top paths
+change a :class:`~tornado_ai.shared.types.AttackPathUpdate` is published to
+listeners.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ...config import config
+from ...shared.types import (
+    AttackPathAnalysis,
+    AttackPathUpdate,
+    PriorToolResult,
+    RankedAttackPath,
+    TargetProfile,
+    ToolExecutionResult,
+)
+from ...tools.registry import ToolRegistry
+from ..observability.telemetry import telemetry_center
+from .attack_graph import AttackGraphBuilder, _cost
+from .sacd import SmartAttackChainDiscovery
+
+UNCONFIRMED_LIKELIHOOD = 0.5
+"""Prior for stage transitions no finding supports yet."""
+
+SEVERITY_LIKELIHOOD = {"none": 0.15, "info": 0.15, "low": 0.35, "medium": 0.6, "high": 0.85, "critical": 0.95}
+
+# category -> (stage the finding extends, stage it leads to, phase of the finding node)
+_CATEGORY_STAGES = {
+    "network": ("recon", "access", "recon"),
+    "osint": ("recon", "access", "recon"),
+    "webapp": ("recon", "access", "exploit"),
+    "cloud": ("access", "priv", "exploit"),
+    "binary": ("access", "priv", "exploit"),
+    "ctf": ("access", "priv", "exploit"),
+}
+_IDENTITY_KEYS = ("id", "check", "host", "name", "domain", "alert", "service", "port")
+_SEVERITY_KEYS = ("severity", "risk", "exposure")
+
+_INF = math.inf
+
+Finding = Tuple[str, float]
+Listener = Callable[[AttackPathUpdate], None]
+
+_DELTAS = telemetry_center.counter("sacd.live.deltas", help="Tool results applied to live attack graphs").labels()
+_REPAIRED = telemetry_center.histogram(
+    "sacd.live.repaired", unit="", help="Nodes whose best path changed per applied result"
+).labels()
+
+
+def _likelihood(severity: Any, confidence: Any = None) -> float:
+    if isinstance(confidence, (int, float)) and not isinstance(confidence, bool):
+        return min(1.0, max(0.0, float(confidence)))
+    return SEVERITY_LIKELIHOOD.get(str(severity).lower(), SEVERITY_LIKELIHOOD["low"])
+
+
+def findings_from_result(result: PriorToolResult) -> List[Finding]:
+    if not result.success:
+        return []
+    likelihood = _likelihood(result.severity)
+    return [(finding, likelihood) for finding in result.findings]
+
+
+def findings_from_execution(result: ToolExecutionResult) -> List[Finding]:
+    """Findings in an adapter's output: items of any list, identified by their first known key."""
+
+    if result.status not in {"completed", "cached"}:
+        return []
+    findings: List[Finding] = []
+    for value in result.output.values():
+        if not isinstance(value, list):
+            continue
+        for item in value:
+            if isinstance(item, dict):
+                identity = next((item[key] for key in _IDENTITY_KEYS if key in item), None)
+                if identity is None:
+                    continue
+                severity = next((item[key] for key in _SEVERITY_KEYS if key in item), "low")
+                findings.append((str(identity), _likelihood(severity, item.get("confidence"))))
+            elif isinstance(item, str):
+                findings.append((item, SEVERITY_LIKELIHOOD["low"]))
+    return findings
+
+
+class LiveAttackGraph(AttackGraphBuilder):
+    """Builder that keeps best paths from the entry points current after every change."""
+
+    def __init__(self, target_id: str, top: int = 5) -> None:
+        super().__init__()
+        self.target_id = target_id
+        self.version = 0
+        self._top = top
+        self._node_costs: List[float] = []
+        self._out: List[Dict[int, float]] = []
+        self._in: List[Dict[int, float]] = []
+        self._dist: List[float] = []
+        self._parent: List[int] = []
+        self._children: List[Set[int]] = []
+        self._changed: Set[int] = set()
+        self._top_paths: List[RankedAttackPath] = []
+
+    # -- builder overrides --------------------------------------------------------
+
+    def add_node(
+        self,
+        node_id: str,
+        label: Optional[str] = None,
+        phase: str = "recon",
+        likelihood: float = 1.0,
+        entry: bool = False,
+        goal: bool = False,
+    ) -> int:
+        existing = self._index.get(node_id)
+        was_entry = existing is not None and existing in self._entries
+        was_goal = existing is not None and existing in self._goals
+        index = super().add_node(node_id, label, phase, likelihood, entry, goal)
+        cost = _cost(likelihood)
+        if existing is None:
+            self._node_costs.append(cost)
+            self._out.append({})
+            self._in.append({})
+            self._dist.append(_INF)
+            self._parent.append(-1)
+            self._children.append(set())
+            self._relax_into(index)
+            return index
+        previous, self._node_costs[index] = self._node_costs[index], cost
+        if goal and not was_goal:
+            # Paths now end here; whatever hung below it must be re-rooted.
+            for child in list(self._children[index]):
+                self._detach(child)
+        if cost > previous:
+            self._detach(index)
+        elif cost < previous or (entry and not was_entry):
+            self._relax_into(index)
+        return index
+
+    def add_edge(self, source: str, target: str, likelihood: float = 1.0, description: str = "") -> None:
+        super().add_edge(source, target, likelihood, description)
+        source_index, target_index = self._index[source], self._index[target]
+        cost = _cost(self._edges[(source_index, target_index)][0])
+        if self._out[source_index].get(target_index, _INF) <= cost:
+            return
+        self._out[source_index][target_index] = cost
+        self._in[target_index][source_index] = cost
+        if self._dist[source_index] < _INF and source_index not in self._goals:
+            self._repair([(self._dist[source_index] + cost + self._node_costs[target_index], target_index, source_index)])
+
+    # -- incremental shortest-path tree ------------------------------------------------
+
+    def _candidates(self, node: int, excluded: Set[int] = frozenset()) -> Iterable[Tuple[float, int, int]]:  # type: ignore[assignment]
+        node_cost = self._node_costs[node]
+        if node in self._entries:
+            yield node_cost, node, -1
+        dist, goals = self._dist, self._goals
+        for source, edge_cost in self._in[node].items():
+            if source not in excluded and dist[source] < _INF and source not in goals:
+                yield dist[source] + edge_cost + node_cost, node, source
+
+    def _relax_into(self, node: int) -> None:
+        best = min(self._candidates(node), default=None)
+        if best is not None and best[0] < self._dist[node]:
+            self._repair([best])
+
+    def _detach(self, root: int) -> None:
+        """Drop the subtree below ``root`` and re-root it from the rest of the tree."""
+
+        subtree = [root]
+        for node in subtree:
+            subtree.extend(self._children[node])
+        members = set(subtree)
+        for node in subtree:
+            self._set_parent(node, -1)
+            self._dist[node] = _INF
+            self._changed.add(node)
+        seeds = [best for best in (min(self._candidates(node, members), default=None) for node in subtree) if best]
+        self._repair(seeds)
+
+    def _set_parent(self, node: int, parent: int) -> None:
+        previous = self._parent[node]
+        if previous != -1:
+            self._children[previous].discard(node)
+        self._parent[node] = parent
+        if parent != -1:
+            self._children[parent].add(node)
+
+    def _repair(self, seeds: List[Tuple[float, int, int]]) -> None:
+        heap = list(seeds)
+        heapq.heapify(heap)
+        dist, node_costs, out, goals = self._dist, self._node_costs, self._out, self._goals
+        while heap:
+            distance, node, parent = heapq.heappop(heap)
+            if distance >= dist[node]:
+                continue
+            dist[node] = distance
+            self._set_parent(node, parent)
+            self._changed.add(node)
+            if node in goals:
+                continue
+            for target, edge_cost in out[node].items():
+                candidate = distance + edge_cost + node_costs[target]
+                if candidate < dist[target]:
+                    heapq.heappush(heap, (candidate, target, node))
+
+    # -- paths ---------------------------------------------------------------------
+
+    def _path(self, goal: int) -> RankedAttackPath:
+        nodes = [goal]
+        while self._parent[nodes[-1]] != -1:
+            nodes.append(self._parent[nodes[-1]])
+        return RankedAttackPath(
+            nodes=[self._ids[node] for node in reversed(nodes)], likelihood=math.exp(-self._dist[goal])
+        )
+
+    def top_paths(self) -> List[RankedAttackPath]:
+        """Most likely path to each reachable goal, best first (``top`` of them)."""
+
+        return list(self._top_paths)
+
+    def commit(self) -> Optional[AttackPathUpdate]:
+        """Close a batch of changes; return an update if the top paths moved."""
+
+        changed, self._changed = self._changed, set()
+        _REPAIRED.observe(len(changed))
+        if not changed:
+            return None
+        reached = heapq.nsmallest(
+            self._top, (goal for goal in self._goals if self._dist[goal] < _INF), key=self._dist.__getitem__
+        )
+        paths = [self._path(goal) for goal in reached]
+        if paths == self._top_paths:
+            return None
+        previous = {tuple(path.nodes): path.likelihood for path in self._top_paths}
+        self._top_paths = paths
+        self.version += 1
+        return AttackPathUpdate(
+            targetId=self.target_id,
+            version=self.version,
+            paths=paths,
+            changed=[path for path in paths if previous.get(tuple(path.nodes)) != path.likelihood],
+        )
+
+
+class LiveGraphRegistry:
+    """Per-target live graphs (LRU-bounded) and the listeners notified of path changes."""
+
+    def __init__(
+        self,
+        sacd: SmartAttackChainDiscovery,
+        registry: ToolRegistry,
+        max_targets: int = 256,
+        top: int = 5,
+    ) -> None:
+        self._sacd = sacd
+        self._registry = registry
+        self._max_targets = max_targets
+        self._top = top
+        self._graphs: "OrderedDict[str, LiveAttackGraph]" = OrderedDict()
+        self._listeners: List[Listener] = []
+        self._lock = Lock()
+
+    def __contains__(self, target_id: object) -> bool:
+        return target_id in self._graphs
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call ``listener`` with every published update; it must not block."""
+
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def graph_for(self, profile: TargetProfile) -> LiveAttackGraph:
+        with self._lock:
+            graph = self._graphs.get(profile.targetId)
+            if graph is None:
+                graph = LiveAttackGraph(profile.targetId, top=self._top)
+                self._sacd.template(profile, graph, transition_likelihood=UNCONFIRMED_LIKELIHOOD)
+                graph.commit()
+                self._graphs[profile.targetId] = graph
+                while len(self._graphs) > self._max_targets:
+                    self._graphs.popitem(last=False)
+            self._graphs.move_to_end(profile.targetId)
+            return graph
+
+    def get(self, target_id: str) -> Optional[LiveAttackGraph]:
+        return self._graphs.get(target_id)
+
+    def _stages(self, tool_id: str) -> Tuple[str, str, str]:
+        try:
+            category = self._registry.get_definition(tool_id).spec.category
+        except KeyError:
+            category = "network"
+        return _CATEGORY_STAGES.get(category, _CATEGORY_STAGES["network"])
+
+    def apply(
+        self, target_id: str, deltas: Iterable[Tuple[str, Iterable[Finding]]]
+    ) -> Optional[AttackPathUpdate]:
+        """Add ``(tool_id, findings)`` deltas to the target's graph; publish if the top paths moved."""
+
+        graph = self._graphs.get(target_id)
+        if graph is None:
+            raise KeyError(f"No live attack graph for target {target_id}")
+        with self._lock:
+            for tool_id, findings in deltas:
+                origin, destination, phase = self._stages(tool_id)
+                for finding, likelihood in findings:
+                    node_id = f"{tool_id}:{finding}"
+                    if node_id not in graph:
+                        graph.add_node(node_id, label=finding, phase=phase)
+                    graph.add_edge(origin, node_id, description=f"{tool_id} reported {finding}.")
+                    graph.add_edge(
+                        node_id, destination, likelihood, description=f"Exploit {finding} to reach {destination}."
+                    )
+                _DELTAS.inc()
+            update = graph.commit()
+        if update is not None:
+            for listener in list(self._listeners):
+                listener(update)
+        return update
+
+    def apply_results(self, target_id: str, results: Iterable[PriorToolResult]) -> Optional[AttackPathUpdate]:
+        return self.apply(target_id, ((result.toolId, findings_from_result(result)) for result in results))
+
+    def apply_execution(self, target_id: str, result: ToolExecutionResult) -> Optional[AttackPathUpdate]:
+        return self.apply(target_id, [(result.toolId, findings_from_execution(result))])
+
+    def current(self, target_id: str) -> AttackPathUpdate:
+        """Current top paths of ``target_id`` (``changed`` is empty)."""
+
+        graph = self._graphs.get(target_id)
+        if graph is None:
+            raise KeyError(f"No live attack graph for target {target_id}")
+        return AttackPathUpdate(targetId=target_id, version=graph.version, paths=graph.top_paths(), changed=[])
+
+    def analysis(self, target_id: str, paths: int = 3, choke_points: int = 5) -> AttackPathAnalysis:
+        graph = self._graphs.get(target_id)
+        if graph is None:
+            raise KeyError(f"No live attack graph for target {target_id}")
+        with self._lock:
+            snapshot = graph.build()
+        return self._sacd.analyze_graph(target_id, snapshot, paths=paths, choke_points=choke_points)
+
+    async def updates(self, target_id: Optional[str] = None, max_queue: int = 100) -> AsyncIterator[AttackPathUpdate]:
+        """Yield published updates (optionally for one target); the oldest are dropped when slow."""
+
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[AttackPathUpdate]" = asyncio.Queue(max_queue)
+
+        def _offer(update: AttackPathUpdate) -> None:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(update)
+
+        def _listener(update: AttackPathUpdate) -> None:
+            if target_id is None or update.targetId == target_id:
+                loop.call_soon_threadsafe(_offer, update)
+
+        self.add_listener(_listener)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.remove_listener(_listener)
+
+
+def build_live_graphs(sacd: SmartAttackChainDiscovery, registry: ToolRegistry) -> LiveGraphRegistry:
+    return LiveGraphRegistry(sacd, registry, max_targets=config.decision.live_graphs)
+
+
+__all__ = [
+    "LiveAttackGraph",
+    "LiveGraphRegistry",
+    "SEVERITY_LIKELIHOOD",
+    "UNCONFIRMED_LIKELIHOOD",
+    "build_live_graphs",
+    "findings_from_execution",
+    "findings_from_result",
+]
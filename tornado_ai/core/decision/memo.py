@@ -0,0 +1,106 @@
+"""Memoization of AIDE decisions.
+
+An analysis depends only on a handful of ``TargetProfile`` fields, the set of
+tools that already succeeded and the tool catalog, so results are cached under
+a canonical fingerprint of exactly those inputs. The decision inputs version
+(the registry version for now) is part of the fingerprint and the cache is
+cleared as soon as it changes, so edits to tool definitions or weights never
+serve stale plans.
+"""
+from __future__ import annotations
+
+import json
+from hashlib import sha256
+from typing import Dict, Hashable, Iterable, Optional
+
+from ...config import config
+from ...shared.types import PriorToolResult, TargetProfile
+from ..cache import ContentAddressedCache
+from ..observability.telemetry import TelemetryCenter, telemetry_center
+
+
+def successful_tools(history: Iterable[PriorToolResult]) -> list[str]:
+    """Tools TSA skips: the latest result per tool succeeded (sorted)."""
+
+    latest: Dict[str, bool] = {}
+    for result in history:
+        latest[result.toolId] = result.success
+    return sorted(tool_id for tool_id, success in latest.items() if success)
+
+
+def decision_fingerprint(profile: TargetProfile, history: Iterable[PriorToolResult], version: Hashable) -> str:
+    canonical = json.dumps(
+        [
+            repr(version),
+            profile.targetId,
+            profile.assetKind,
+            profile.environment,
+            profile.criticality,
+            profile.cvss,
+            successful_tools(history),
+        ],
+        separators=(",", ":"),
+    )
+    return sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class DecisionCache:
+    """LRU cache of decisions that empties itself when the inputs version changes.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: int = 3600,
+        center: TelemetryCenter = telemetry_center,
+    ) -> None:
+        self._cache: ContentAddressedCache[object] = ContentAddressedCache(
+            default_ttl_seconds=ttl_seconds, max_entries=max_entries
+        )
+        self._version: Hashable = None
+        self._invalidations = 0
+        lookups = center.counter("aide.cache.lookups", labelnames=("result",), help="AIDE decision cache lookups")
+        self._hit = lookups.labels("hit")
+        self._miss = lookups.labels("miss")
+        self._invalidated = center.counter(
+            "aide.cache.invalidations", help="AIDE decision cache flushes after catalog changes"
+        ).labels()
+
+    def key_for(self, profile: TargetProfile, history: Iterable[PriorToolResult], version: Hashable) -> str:
+        """Fingerprint the inputs, flushing the cache first if ``version`` moved on."""
+
+        if version != self._version:
+            if self._version is not None:
+                self._cache.clear()
+                self._invalidations += 1
+                self._invalidated.inc()
+            self._version = version
+        return decision_fingerprint(profile, history, version)
+
+    def get(self, key: str) -> Optional[object]:
+        value = self._cache.get(key)
+        (self._miss if value is None else self._hit).inc()
+        return value
+
+    def set(self, key: str, value: object) -> None:
+        self._cache.set(key, value)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, object]:
+        stats: Dict[str, object] = dict(self._cache.stats())
+        lookups = stats["hits"] + stats["misses"]  # type: ignore[operator]
+        stats["hitRatio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0  # type: ignore[operator]
+        stats["invalidations"] = self._invalidations
+        stats["version"] = self._version
+        return stats
+
+
+def build_decision_cache() -> DecisionCache:
+    return DecisionCache(max_entries=config.decision.cache_size, ttl_seconds=config.decision.cache_ttl)
+
+
+__all__ = ["DecisionCache", "build_decision_cache", "decision_fingerprint", "successful_tools"]
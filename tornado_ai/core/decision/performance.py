@@ -0,0 +1,311 @@
+"""Empirical tool performance: durations, success rates and finding yields.
+
+Every execution updates running aggregates for three series: the tool on that
+asset kind, the tool on any asset kind (``"*"``) and the asset kind across all
+tools. Each series keeps Welford mean/variance of the duration, a fixed log2
+histogram (one bucket per power-of-two milliseconds) for quantiles, and
+success/finding counters, so an update is O(1) regardless of history length.
+
+Persistence is a :class:`~.journal.SnapshotJournal`: a compact snapshot of
+those aggregates plus an append-only log of observations since, replayed on
+open and folded into the snapshot every ``compact_every`` records. Recording
+only buffers the observation; a writer thread does the disk I/O. Planning reads a published
+:class:`PerformanceSnapshot` whose version only moves when republished scoring
+inputs actually changed (at most every ``refresh_seconds``), so memoized
+decisions are invalidated at a bounded rate rather than on every execution.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import monotonic
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+from ...config import config
+from ..observability.telemetry import TelemetryCenter, telemetry_center
+from .journal import SnapshotJournal
+from .scheduler import DurationEstimator
+
+ANY = "*"
+_BUCKETS = 32
+_NEUTRAL_SUCCESS = 0.5
+_MAX_YIELD_BONUS = 5.0
+
+SeriesKey = Tuple[str, str]
+
+
+@dataclass
+class ToolStats:
+    """Running aggregates for one (tool, asset kind) series."""
+
+    count: int = 0
+    successes: int = 0
+    findings: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    maximum: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * _BUCKETS)
+
+    def observe(self, duration: float, success: bool, findings: int) -> None:
+        duration = max(0.0, duration)
+        self.count += 1
+        self.successes += int(success)
+        self.findings += max(0, findings)
+        delta = duration - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (duration - self.mean)
+        self.maximum = max(self.maximum, duration)
+        self.buckets[min(_BUCKETS - 1, max(0, math.frexp(duration * 1000)[1]))] += 1
+
+    @property
+    def success_rate(self) -> float:
+        """Laplace-smoothed success rate, 0.5 before any observation."""
+
+        return (self.successes + 1) / (self.count + 2)
+
+    @property
+    def finding_yield(self) -> float:
+        return self.findings / self.count if self.count else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the histogram bucket holding quantile ``q`` (capped at the maximum)."""
+
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(self.maximum, math.ldexp(1.0, index) / 1000)
+        return self.maximum
+
+    def to_list(self) -> list:
+        return [self.count, self.successes, self.findings, self.mean, self.m2, self.maximum, self.buckets]
+
+    @classmethod
+    def from_list(cls, values: list) -> "ToolStats":
+        count, successes, findings, mean, m2, maximum, buckets = values
+        return cls(count, successes, findings, mean, m2, maximum, list(buckets))
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "successRate": round(self.success_rate, 4),
+            "findingYield": round(self.finding_yield, 4),
+            "meanDuration": round(self.mean, 6),
+            "stddevDuration": round(self.stddev, 6),
+            "p50Duration": round(self.quantile(0.5), 6),
+            "p90Duration": round(self.quantile(0.9), 6),
+            "maxDuration": round(self.maximum, 6),
+        }
+
+
+@dataclass(frozen=True)
+class PerformanceSnapshot:
+    """Scoring inputs published by :class:`ToolPerformanceStore`."""
+
+    version: int = 0
+    factors: Mapping[SeriesKey, float] = field(default_factory=dict)
+    success_rates: Mapping[str, float] = field(default_factory=dict)
+
+    def factor(self, tool_id: str, asset_kind: str) -> float:
+        factors = self.factors
+        factor = factors.get((tool_id, asset_kind))
+        return factor if factor is not None else factors.get((tool_id, ANY), 1.0)
+
+
+def score_factor(stats: ToolStats) -> float:
+    """TSA score multiplier: 1.0 at a 50% success rate without findings.
+
+    Ranges from 0.5 (never succeeds) to 1.5 (always succeeds), with up to 50%
+    more for tools that keep producing findings.
+    """
+
+    bonus = 1.0 + min(stats.finding_yield, _MAX_YIELD_BONUS) / 10
+    return (_NEUTRAL_SUCCESS + stats.success_rate) * bonus
+
+
+class ToolPerformanceStore:
+    def __init__(
+        self,
+        min_samples: int = 5,
+        refresh_seconds: float = 30.0,
+        compact_every: int = 1000,
+        flush_interval: float = 1.0,
+        center: TelemetryCenter = telemetry_center,
+    ) -> None:
+        self.min_samples = min_samples
+        self.refresh_seconds = refresh_seconds
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+        self._series: Dict[SeriesKey, ToolStats] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._snapshot = PerformanceSnapshot()
+        self._published_generation = 0
+        self._published_at = monotonic()
+        self._journal: Optional[SnapshotJournal] = None
+        self._records = center.counter(
+            "tools.performance.records", help="Tool executions recorded in the performance store"
+        ).labels()
+
+    @property
+    def path(self) -> Optional[Path]:
+        journal = self._journal
+        return journal.path if journal is not None else None
+
+    def open(self, path: Union[str, Path]) -> None:
+        """Load the snapshot at ``path``, replay its log and keep appending to it."""
+
+        self.close()
+        journal = SnapshotJournal(Path(path), self._lock, self._rows, self.compact_every, self.flush_interval)
+        rows, entries = journal.load()
+        with self._lock:
+            self._series.clear()
+            for key, values in rows:
+                self._series[tuple(key)] = ToolStats.from_list(values)  # type: ignore[index]
+            for tool_id, asset_kind, duration, success, findings in entries:
+                self._observe(tool_id, asset_kind, duration, success, findings)
+            self._generation += 1
+            self._journal = journal
+        journal.start()
+
+    def close(self) -> None:
+        """Write everything recorded so far into the snapshot and stop persisting."""
+
+        with self._lock:
+            journal, self._journal = self._journal, None
+        if journal is not None:
+            journal.close()
+
+    def flush(self) -> None:
+        """Write buffered observations to disk now instead of on the writer's next pass."""
+
+        journal = self._journal
+        if journal is not None:
+            journal.flush()
+
+    def record(
+        self, tool_id: str, asset_kind: Optional[str], duration: float, success: bool, findings: int = 0
+    ) -> None:
+        with self._lock:
+            self._observe(tool_id, asset_kind, duration, success, findings)
+            self._generation += 1
+            if self._journal is not None:
+                self._journal.append([tool_id, asset_kind, duration, success, findings])
+        self._records.inc()
+
+    def stats(self, tool_id: str, asset_kind: Optional[str] = None) -> Optional[ToolStats]:
+        """Stats for ``tool_id`` on ``asset_kind``, or across asset kinds while those are too few."""
+
+        series = self._series
+        if asset_kind is not None:
+            stats = series.get((tool_id, asset_kind))
+            if stats is not None and stats.count >= self.min_samples:
+                return stats
+        stats = series.get((tool_id, ANY))
+        return stats if stats is not None and stats.count >= self.min_samples else None
+
+    def estimate_duration(self, tool_id: str, asset_kind: Optional[str] = None) -> Optional[float]:
+        stats = self.stats(tool_id, asset_kind)
+        return stats.mean if stats is not None else None
+
+    def durations(self, asset_kind: Optional[str], fallback: DurationEstimator) -> DurationEstimator:
+        """Mean observed duration per tool, ``fallback`` for tools with too few samples."""
+
+        def _estimate(tool_id: str) -> float:
+            estimate = self.estimate_duration(tool_id, asset_kind)
+            return estimate if estimate is not None else fallback(tool_id)
+
+        return _estimate
+
+    def snapshot(self) -> PerformanceSnapshot:
+        """Published scoring inputs; republished at most every ``refresh_seconds``."""
+
+        snapshot = self._snapshot
+        if self._generation == self._published_generation:
+            return snapshot
+        if monotonic() - self._published_at < self.refresh_seconds:
+            return snapshot
+        with self._lock:
+            generation = self._generation
+            factors: Dict[SeriesKey, float] = {}
+            success_rates: Dict[str, float] = {}
+            for (tool_id, asset_kind), stats in self._series.items():
+                if stats.count < self.min_samples:
+                    continue
+                if tool_id == ANY:
+                    success_rates[asset_kind] = stats.success_rate
+                else:
+                    factors[(tool_id, asset_kind)] = score_factor(stats)
+            if factors != snapshot.factors or success_rates != snapshot.success_rates:
+                snapshot = self._snapshot = PerformanceSnapshot(
+                    version=snapshot.version + 1, factors=factors, success_rates=success_rates
+                )
+            self._published_generation = generation
+            self._published_at = monotonic()
+        return snapshot
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def summary(self) -> Dict[str, object]:
+        with self._lock:
+            series = [
+                {"toolId": tool_id, "assetKind": asset_kind, **stats.to_dict()}
+                for (tool_id, asset_kind), stats in sorted(self._series.items())
+            ]
+        path = self.path
+        return {"path": str(path) if path else None, "series": series}
+
+    def clear(self) -> None:
+        """Forget every observation, in memory and on disk."""
+
+        with self._lock:
+            self._series.clear()
+            self._generation += 1
+            journal = self._journal
+        if journal is not None:
+            journal.compact()
+
+    def _observe(self, tool_id: str, asset_kind: Optional[str], duration: float, success: bool, findings: int) -> None:
+        keys = [(tool_id, ANY)]
+        if asset_kind is not None:
+            keys += [(tool_id, asset_kind), (ANY, asset_kind)]
+        for key in keys:
+            stats = self._series.get(key)
+            if stats is None:
+                stats = self._series[key] = ToolStats()
+            stats.observe(duration, success, findings)
+
+    def _rows(self) -> list:
+        return [[list(key), stats.to_list()] for key, stats in self._series.items()]
+
+
+def build_performance_store() -> ToolPerformanceStore:
+    return ToolPerformanceStore(
+        min_samples=config.decision.performance_min_samples,
+        refresh_seconds=config.decision.performance_refresh,
+    )
+
+
+tool_performance = build_performance_store()
+
+
+__all__ = [
+    "ANY",
+    "PerformanceSnapshot",
+    "ToolPerformanceStore",
+    "ToolStats",
+    "build_performance_store",
+    "score_factor",
+    "tool_performance",
+]
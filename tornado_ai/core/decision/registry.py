@@ -2,16 +2,46 @@
 from __future__ import annotations
 
 from .aide import AdvancedIntelligentDecisionEngine
-from .ipo import IntelligentParameterOptimizer
+from .batch import BatchAnalyzer
+from .ipo import build_ipo
+from .live_graph import build_live_graphs
+from .memo import build_decision_cache
+from .performance import tool_performance
+from .roe import roe
 from .sacd import SmartAttackChainDiscovery
+from .scheduler import PlanExecutor, spec_durations
 from .tsa import ToolSelectionAssistant
+from .tuning import parameter_tuner
+from ...config import config
 from ...tools.registry import tool_registry
 
 
-tsa = ToolSelectionAssistant(tool_registry)
-ipo = IntelligentParameterOptimizer()
+tsa = ToolSelectionAssistant(tool_registry, performance=tool_performance)
+ipo = build_ipo()
 sacd = SmartAttackChainDiscovery()
-aide = AdvancedIntelligentDecisionEngine(tsa=tsa, ipo=ipo, sacd=sacd)
+aide = AdvancedIntelligentDecisionEngine(
+    tsa=tsa,
+    ipo=ipo,
+    sacd=sacd,
+    cache=build_decision_cache(),
+    stage_timeout=config.decision.stage_timeout if config.decision.stage_timeout > 0 else None,
+)
+batch_analyzer = BatchAnalyzer(tool_registry, tsa)
+live_graphs = build_live_graphs(sacd, tool_registry)
+plan_executor = PlanExecutor(
+    durations=spec_durations(tool_registry), estimators=tool_performance.durations, limiter=roe.controller
+)
 
 
-__all__ = ["aide", "tsa", "ipo", "sacd"]
+__all__ = [
+    "aide",
+    "batch_analyzer",
+    "live_graphs",
+    "parameter_tuner",
+    "plan_executor",
+    "roe",
+    "tool_performance",
+    "tsa",
+    "ipo",
+    "sacd",
+]
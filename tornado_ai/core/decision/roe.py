@@ -1,11 +1,32 @@
 """Resource Optimization Engine (ROE)."""
 from __future__ import annotations
 
+from typing import Optional
+
 from ...shared.types import TargetProfile
+from .concurrency import AdaptiveConcurrencyController, build_concurrency_controller
+from .performance import ToolPerformanceStore, tool_performance
+
+# Below this observed success rate for an asset kind, run one fewer task at a time.
+_UNHEALTHY_SUCCESS_RATE = 0.6
 
 
 class ResourceOptimizationEngine:
+    def __init__(
+        self,
+        performance: Optional[ToolPerformanceStore] = None,
+        controller: Optional[AdaptiveConcurrencyController] = None,
+    ) -> None:
+        self._performance = performance
+        self._controller = controller
+
+    @property
+    def controller(self) -> Optional[AdaptiveConcurrencyController]:
+        return self._controller
+
     def recommend_concurrency(self, profile: TargetProfile) -> int:
+        """Starting concurrency for ``profile`` from its fields and observed success rates."""
+
         base = 2
         if profile.criticality == "high":
             base += 2
@@ -13,10 +34,22 @@ class ResourceOptimizationEngine:
             base -= 1
         if profile.assetKind in {"cloud", "infrastructure"}:
             base += 1
+        if self._performance is not None:
+            success_rate = self._performance.snapshot().success_rates.get(profile.assetKind)
+            if success_rate is not None and success_rate < _UNHEALTHY_SUCCESS_RATE:
+                base -= 1
         return max(1, base)
 
+    def current_concurrency(self, profile: TargetProfile) -> int:
+        """Live AIMD limit for the target, seeded with :meth:`recommend_concurrency`."""
+
+        recommended = self.recommend_concurrency(profile)
+        if self._controller is None:
+            return recommended
+        return self._controller.limit(profile.targetId, initial=recommended)
+
 
-roe = ResourceOptimizationEngine()
+roe = ResourceOptimizationEngine(performance=tool_performance, controller=build_concurrency_controller())
 
 
 __all__ = ["ResourceOptimizationEngine", "roe"]
@@ -1,47 +1,82 @@
 """Smart Attack Chain Discovery (SACD)."""
 from __future__ import annotations
 
-from typing import List
+from typing import Optional
 
-from ...shared.types import AttackGraph, AttackPathEdge, AttackPathNode, TargetProfile
+from ...shared.types import (
+    AttackGraph,
+    AttackPathAnalysis,
+    ChokePointRanking,
+    RankedAttackPath,
+    TargetProfile,
+)
+from .attack_graph import AttackGraphBuilder, CompactAttackGraph
 
 
 class SmartAttackChainDiscovery:
-    def build_graph(self, profile: TargetProfile) -> AttackGraph:
-        nodes: List[AttackPathNode] = [
-            AttackPathNode(id="recon", label="Initial Recon", phase="recon", likelihood=0.9),
-            AttackPathNode(id="access", label="Initial Access", phase="exploit", likelihood=0.7),
-            AttackPathNode(id="priv", label="Privilege Escalation", phase="exploit", likelihood=0.6),
-            AttackPathNode(id="impact", label="Impact", phase="maintain", likelihood=0.5),
-        ]
-        edges = [
-            AttackPathEdge(
-                source="recon",
-                target="access",
-                description="Use reconnaissance findings to launch focused exploitation.",
-            ),
-            AttackPathEdge(
-                source="access",
-                target="priv",
-                description="Leverage foothold for privilege escalation and lateral movement.",
-            ),
-            AttackPathEdge(
-                source="priv",
-                target="impact",
-                description="Deploy payloads or extract data once elevated access is obtained.",
-            ),
-        ]
+    def template(
+        self,
+        profile: TargetProfile,
+        builder: Optional[AttackGraphBuilder] = None,
+        transition_likelihood: float = 1.0,
+    ) -> AttackGraphBuilder:
+        """Kill-chain stages for ``profile`` added to ``builder`` (a new one by default).
+
+        ``transition_likelihood`` is the prior for moving between stages; live
+        graphs lower it so that confirmed findings can open better paths.
+        """
+
+        builder = builder if builder is not None else AttackGraphBuilder()
+        builder.add_node("recon", label="Initial Recon", phase="recon", likelihood=0.9, entry=True)
+        builder.add_node("access", label="Initial Access", phase="exploit", likelihood=0.7)
+        builder.add_node("priv", label="Privilege Escalation", phase="exploit", likelihood=0.6)
+        builder.add_node("impact", label="Impact", phase="maintain", likelihood=0.5, goal=True)
+        builder.add_edge(
+            "recon",
+            "access",
+            transition_likelihood,
+            description="Use reconnaissance findings to launch focused exploitation.",
+        )
+        builder.add_edge(
+            "access",
+            "priv",
+            transition_likelihood,
+            description="Leverage foothold for privilege escalation and lateral movement.",
+        )
+        builder.add_edge(
+            "priv",
+            "impact",
+            transition_likelihood,
+            description="Deploy payloads or extract data once elevated access is obtained.",
+        )
 
         if profile.assetKind in {"cloud", "infrastructure"}:
-            nodes.append(AttackPathNode(id="persistence", label="Persistence", phase="maintain", likelihood=0.55))
-            edges.append(
-                AttackPathEdge(
-                    source="priv",
-                    target="persistence",
-                    description="Establish long-term access via IAM or backdoors.",
-                )
+            builder.add_node("persistence", label="Persistence", phase="maintain", likelihood=0.55, goal=True)
+            builder.add_edge(
+                "priv",
+                "persistence",
+                transition_likelihood,
+                description="Establish long-term access via IAM or backdoors.",
             )
-        return AttackGraph(targetId=profile.targetId, nodes=nodes, edges=edges)
+        return builder
+
+    def build_graph(self, profile: TargetProfile) -> AttackGraph:
+        return self.template(profile).build().to_model(profile.targetId)
+
+    def analyze_graph(
+        self, target_id: str, graph: CompactAttackGraph, paths: int = 3, choke_points: int = 5
+    ) -> AttackPathAnalysis:
+        """Top ``paths`` attack paths and choke points; only their subgraph is materialized."""
+
+        ranked = graph.k_best_paths(paths)
+        return AttackPathAnalysis(
+            targetId=target_id,
+            paths=[RankedAttackPath(nodes=list(path.nodes), likelihood=path.likelihood) for path in ranked],
+            chokePoints=[
+                ChokePointRanking(nodeId=point.node, score=point.score) for point in graph.choke_points(choke_points)
+            ],
+            graph=graph.paths_subgraph(target_id, ranked),
+        )
 
 
 __all__ = ["SmartAttackChainDiscovery"]
@@ -0,0 +1,247 @@
+"""Critical-path scheduling of ``ToolPlan`` steps.
+
+A plan becomes a DAG through ``ToolPlanStep.prerequisites`` (prerequisites
+outside the plan, e.g. tools that already succeeded, count as satisfied).
+Every step is prioritized by its *level*: the longest chain of estimated
+durations from the step to the end of the plan. Ready steps start in level
+order up to the concurrency limit and dependents are released the moment
+their last prerequisite finishes (HLFET list scheduling), which keeps the
+critical path busy and minimizes makespan. The same policy, simulated with
+estimated durations, gives the projected makespan reported next to the
+measured one.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ...shared.types import PlanExecutionReport, PlanStepExecution, ToolExecutionResult, ToolPlan, ToolPlanStep
+from ...tools.registry import ToolRegistry
+from ..observability.telemetry import telemetry_center
+from .concurrency import AdaptiveConcurrencyController, Outcome
+
+StepRunner = Callable[[ToolPlanStep], Awaitable[ToolExecutionResult]]
+DurationEstimator = Callable[[str], float]
+
+_SUCCESS = {"completed", "cached"}
+
+_MAKESPAN = telemetry_center.histogram("plan.makespan", help="Measured plan execution makespan").labels()
+
+
+@dataclass
+class _Node:
+    step: ToolPlanStep
+    duration: float
+    dependents: List[int] = field(default_factory=list)
+    prerequisites: int = 0
+    level: float = 0.0
+
+
+class PlanDAG:
+    def __init__(self, plan: ToolPlan, durations: DurationEstimator) -> None:
+        positions = {step.toolId: index for index, step in enumerate(plan.steps)}
+        self.target_id = plan.targetId
+        self.nodes = [_Node(step=step, duration=float(durations(step.toolId))) for step in plan.steps]
+        for index, node in enumerate(self.nodes):
+            for prerequisite in dict.fromkeys(node.step.prerequisites):
+                source = positions.get(prerequisite)
+                if source is not None and source != index:
+                    self.nodes[source].dependents.append(index)
+                    node.prerequisites += 1
+        for index in reversed(self._topological_order()):
+            node = self.nodes[index]
+            node.level = node.duration + max((self.nodes[child].level for child in node.dependents), default=0.0)
+
+    def _topological_order(self) -> List[int]:
+        remaining = [node.prerequisites for node in self.nodes]
+        order = [index for index, count in enumerate(remaining) if count == 0]
+        for index in order:
+            for child in self.nodes[index].dependents:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    order.append(child)
+        if len(order) != len(self.nodes):
+            cyclic = sorted(self.nodes[index].step.toolId for index, count in enumerate(remaining) if count)
+            raise ValueError(f"Plan prerequisites form a cycle: {', '.join(cyclic)}")
+        return order
+
+    def critical_path(self) -> List[str]:
+        """Steps on the longest chain of estimated durations."""
+
+        if not self.nodes:
+            return []
+        current = max(
+            (index for index, node in enumerate(self.nodes) if node.prerequisites == 0),
+            key=lambda index: self.nodes[index].level,
+        )
+        path = [current]
+        while self.nodes[current].dependents:
+            current = max(self.nodes[current].dependents, key=lambda index: self.nodes[index].level)
+            path.append(current)
+        return [self.nodes[index].step.toolId for index in path]
+
+    def priority(self, index: int) -> Tuple[float, int]:
+        """Heap key: longest remaining path first, plan (score) order on ties."""
+
+        return (-self.nodes[index].level, index)
+
+    def project(self, concurrency: int) -> Tuple[float, Dict[int, Tuple[float, float]]]:
+        """Simulate the schedule with estimated durations; return makespan and step windows."""
+
+        remaining = [node.prerequisites for node in self.nodes]
+        ready = [self.priority(index) for index, count in enumerate(remaining) if count == 0]
+        heapq.heapify(ready)
+        running: List[Tuple[float, int]] = []
+        windows: Dict[int, Tuple[float, float]] = {}
+        now = 0.0
+        while ready or running:
+            while ready and len(running) < concurrency:
+                _, index = heapq.heappop(ready)
+                end = now + self.nodes[index].duration
+                windows[index] = (now, end)
+                heapq.heappush(running, (end, index))
+            now, index = heapq.heappop(running)
+            for child in self.nodes[index].dependents:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    heapq.heappush(ready, self.priority(child))
+        return now, windows
+
+
+def spec_durations(registry: ToolRegistry, default: float = 60.0) -> DurationEstimator:
+    """Estimate step durations from ``ToolSpec.estimatedDuration``."""
+
+    def _estimate(tool_id: str) -> float:
+        try:
+            return float(registry.get_definition(tool_id).spec.estimatedDuration)
+        except KeyError:
+            return default
+
+    return _estimate
+
+
+class PlanExecutor:
+    """Run plan steps through ``runner`` in critical-path order with bounded parallelism.
+
+    ``estimators`` maps an asset kind to a duration estimator (observed tool
+    performance); plans for other or unknown asset kinds use ``durations``.
+    With a ``limiter``, steps also need a slot in the target's and the global
+    AIMD window: ``concurrency`` then only seeds a target seen for the first
+    time, and every finished step feeds its outcome back into the windows.
+    """
+
+    def __init__(
+        self,
+        durations: DurationEstimator,
+        estimators: Optional[Callable[[str, DurationEstimator], DurationEstimator]] = None,
+        limiter: Optional[AdaptiveConcurrencyController] = None,
+    ) -> None:
+        self._durations = durations
+        self._estimators = estimators
+        self._limiter = limiter
+
+    def dag(self, plan: ToolPlan, asset_kind: Optional[str] = None) -> PlanDAG:
+        durations = self._durations
+        if self._estimators is not None and asset_kind is not None:
+            durations = self._estimators(asset_kind, durations)
+        return PlanDAG(plan, durations)
+
+    async def execute(
+        self, plan: ToolPlan, runner: StepRunner, concurrency: int, asset_kind: Optional[str] = None
+    ) -> PlanExecutionReport:
+        limiter = self._limiter
+        concurrency = max(1, concurrency)
+        cap = concurrency
+        if limiter is not None:
+            concurrency = limiter.limit(plan.targetId, initial=concurrency)
+            cap = limiter.window(plan.targetId).ceiling
+        dag = self.dag(plan, asset_kind)
+        projected, windows = dag.project(concurrency)
+        nodes = dag.nodes
+        remaining = [node.prerequisites for node in nodes]
+        ready = [dag.priority(index) for index, count in enumerate(remaining) if count == 0]
+        heapq.heapify(ready)
+        running: Dict["asyncio.Future[ToolExecutionResult]", int] = {}
+        started: Dict[int, float] = {}
+        finished: Dict[int, Tuple[float, str, Optional[str]]] = {}
+        origin = perf_counter()
+
+        with telemetry_center.span("plan.execute", targetId=plan.targetId, steps=len(nodes), concurrency=concurrency):
+            try:
+                while ready or running:
+                    while (
+                        ready
+                        and len(running) < cap
+                        and (limiter is None or limiter.try_acquire(plan.targetId))
+                    ):
+                        _, index = heapq.heappop(ready)
+                        started[index] = perf_counter() - origin
+                        running[asyncio.ensure_future(runner(nodes[index].step))] = index
+                    waits = set(running)
+                    slot = None
+                    if ready and limiter is not None and len(running) < cap:
+                        # Blocked by the AIMD windows: also wake up when any plan frees a slot.
+                        slot = limiter.released()
+                        waits.add(slot)
+                    done, _ = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+                    if slot is not None and not slot.done():
+                        slot.cancel()
+                    for task in done:
+                        if task is slot:
+                            continue
+                        index = running.pop(task)
+                        try:
+                            status, error = task.result().status, None
+                            outcome: Outcome = "success" if status in _SUCCESS else "error"
+                        except Exception as exc:  # noqa: BLE001 - a failed step must not stop the plan
+                            status, error = "errored", str(exc) or type(exc).__name__
+                            outcome = "timeout" if isinstance(exc, asyncio.TimeoutError) else "error"
+                        if limiter is not None:
+                            limiter.release(plan.targetId, nodes[index].step.toolId, outcome)
+                        if status not in _SUCCESS:
+                            # Dependents of a failed step stay blocked and are reported as skipped.
+                            finished[index] = (perf_counter() - origin, "errored", error or f"Step ended {status}")
+                            continue
+                        finished[index] = (perf_counter() - origin, status, None)
+                        for child in nodes[index].dependents:
+                            remaining[child] -= 1
+                            if remaining[child] == 0:
+                                heapq.heappush(ready, dag.priority(child))
+            finally:
+                for task in running:  # only when cancelled: free the slots without feedback
+                    task.cancel()
+                    if limiter is not None:
+                        limiter.forfeit(plan.targetId)
+        actual = max((end for end, _, _ in finished.values()), default=0.0)
+        _MAKESPAN.observe(actual)
+
+        steps = []
+        for index, node in enumerate(nodes):
+            projected_start, projected_end = windows[index]
+            end, status, error = finished.get(index, (None, "skipped", None))
+            steps.append(
+                PlanStepExecution(
+                    toolId=node.step.toolId,
+                    status=status,
+                    priority=node.level,
+                    projectedStart=projected_start,
+                    projectedEnd=projected_end,
+                    start=started.get(index),
+                    end=end,
+                    error=error,
+                )
+            )
+        return PlanExecutionReport(
+            targetId=plan.targetId,
+            concurrency=concurrency,
+            criticalPath=dag.critical_path(),
+            projectedMakespan=projected,
+            actualMakespan=actual,
+            steps=steps,
+        )
+
+
+__all__ = ["DurationEstimator", "PlanDAG", "PlanExecutor", "StepRunner", "spec_durations"]
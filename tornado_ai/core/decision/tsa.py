@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import Hashable, List, Optional
 
 from ...shared.types import PriorToolResult, TargetProfile, ToolPlan, ToolPlanStep
 from ...tools.registry import ToolRegistry
+from .performance import PerformanceSnapshot, ToolPerformanceStore
 
 
 @dataclass
@@ -27,29 +28,53 @@ class ToolSelectionAssistant:
         "iot": ["network", "binary", "webapp"],
     }
 
-    def __init__(self, registry: ToolRegistry) -> None:
+    _CATEGORY_RATIONALES = {
+        "webapp": "Prioritize web application testing to validate OWASP Top 10 exposures.",
+        "network": "Map exposed network services to support deeper exploitation.",
+        "cloud": "Validate misconfigurations in cloud control plane across accounts.",
+        "binary": "Reverse engineer binaries for potential memory corruption vectors.",
+        "ctf": "Use exploitation helpers to accelerate challenge solving.",
+        "osint": "Expand external footprint visibility using open-source intelligence feeds.",
+    }
+
+    def __init__(self, registry: ToolRegistry, performance: Optional[ToolPerformanceStore] = None) -> None:
         self._registry = registry
+        self._performance = performance
+
+    @property
+    def version(self) -> Hashable:
+        """Changes whenever plans for the same inputs could change.
+
+        That is the registry version, paired with the published performance
+        snapshot version when scores are weighted by observed tool performance.
+        """
+
+        if self._performance is None:
+            return self._registry.version
+        return (self._registry.version, self._performance.version)
+
+    def performance_snapshot(self) -> PerformanceSnapshot:
+        """Observed-performance score factors (all neutral without a store)."""
+
+        return self._performance.snapshot() if self._performance is not None else PerformanceSnapshot()
 
     def build_plan(self, context: ToolSelectionContext) -> ToolPlan:
-        available = self._registry.list_definitions()
         history_ids = {result.toolId: result for result in context.history}
         ordered_steps: List[ToolPlanStep] = []
 
-        priorities = self._ASSET_CATEGORY_PRIORITIES.get(context.profile.assetKind, ["network"])
+        priorities = self.priorities_for(context.profile.assetKind)
         cvss_multiplier = 1.0 + (context.profile.cvss / 10)
+        performance = self.performance_snapshot()
 
-        for definition in available:
+        for definition in self._registry.for_categories(priorities):
             spec = definition.spec
-            if spec.category not in priorities:
-                continue
             prior = history_ids.get(spec.id)
             if prior and prior.success:
                 continue
             score = self._score_tool(spec.category, cvss_multiplier, definition.decision_weight, definition.cvss_bias)
+            score *= performance.factor(spec.id, context.profile.assetKind)
             rationale = self._rationale_for(spec.category, context.profile)
-            prerequisites = []
-            if spec.category == "webapp":
-                prerequisites = ["nmap_scan.sim"] if spec.id != "nmap_scan.sim" else []
+            prerequisites = self._prerequisites_for(spec.id, spec.category)
             ordered_steps.append(
                 ToolPlanStep(
                     toolId=spec.id,
@@ -61,29 +86,32 @@ class ToolSelectionAssistant:
             )
 
         ordered_steps.sort(key=lambda step: step.score, reverse=True)
-        summary = (
-            f"Selected {len(ordered_steps)} candidate tools for target {context.profile.targetId} "
-            f"based on CVSS {context.profile.cvss:.1f} and asset kind {context.profile.assetKind}."
-        )
+        summary = self.summarize(context.profile, len(ordered_steps))
         return ToolPlan(targetId=context.profile.targetId, steps=ordered_steps, summary=summary)
 
+    def priorities_for(self, asset_kind: str) -> List[str]:
+        return self._ASSET_CATEGORY_PRIORITIES.get(asset_kind, ["network"])
+
+    @staticmethod
+    def summarize(profile: TargetProfile, step_count: int) -> str:
+        return (
+            f"Selected {step_count} candidate tools for target {profile.targetId} "
+            f"based on CVSS {profile.cvss:.1f} and asset kind {profile.assetKind}."
+        )
+
+    def _prerequisites_for(self, tool_id: str, category: str) -> List[str]:
+        if category == "webapp" and tool_id != "nmap_scan.sim":
+            return ["nmap_scan.sim"]
+        return []
+
     def _score_tool(self, category: str, cvss_multiplier: float, weight: float, bias: float) -> float:
         base = weight * cvss_multiplier + bias
         return base
 
     def _rationale_for(self, category: str, profile: TargetProfile) -> str:
-        if category == "webapp":
-            return "Prioritize web application testing to validate OWASP Top 10 exposures."
-        if category == "network":
-            return "Map exposed network services to support deeper exploitation."
-        if category == "cloud":
-            return "Validate misconfigurations in cloud control plane across accounts."
-        if category == "binary":
-            return "Reverse engineer binaries for potential memory corruption vectors."
-        if category == "ctf":
-            return "Use exploitation helpers to accelerate challenge solving."
-        if category == "osint":
-            return "Expand external footprint visibility using open-source intelligence feeds."
+        rationale = self._CATEGORY_RATIONALES.get(category)
+        if rationale is not None:
+            return rationale
         return f"Run category {category} tooling for target {profile.targetId}."
 
 
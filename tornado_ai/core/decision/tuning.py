@@ -0,0 +1,285 @@
+"""Empirical parameter tuning: a findings-per-second bandit over tool settings.
+
+The tuning space (``data/ipo/tuning.json``) lists candidate values per tool
+parameter, ordered from least to most aggressive. An *arm* is one combination
+of those values. Environment guardrails bound the arms: when the IPO rule
+table sets a tuned parameter, only candidates up to that value are tried (and
+a rule value that is not a candidate leaves the tool untuned).
+
+Every execution whose parameters form an arm updates running reward
+aggregates for that arm on the asset kind and on any asset kind (``"*"``);
+the reward is findings per second, and 0 for errors and timeouts. Choosing an
+arm first tries every allowed arm once, least aggressive first, then uses
+Thompson sampling on a normal approximation of each arm's mean reward, so
+arms that keep paying off are picked more often while the others are still
+revisited occasionally.
+
+State is persisted by a :class:`~.journal.SnapshotJournal`, as for the tool
+performance store: observations are buffered and written by a background
+thread, and folded into the snapshot every ``compact_every`` records.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import random
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from ...config import config
+from ...shared.types import ParameterTuningSpace
+from ..observability.telemetry import TelemetryCenter, telemetry_center
+from .journal import SnapshotJournal
+
+ANY = "*"
+DEFAULT_SPACE_PATH = Path(__file__).resolve().parents[3] / "data" / "ipo" / "tuning.json"
+# Floor for durations so instant (e.g. dry-run) executions do not yield infinite rewards.
+_MIN_DURATION = 1e-3
+
+ArmKey = Tuple[str, str, str]
+
+
+@dataclass
+class ArmStats:
+    """Running reward aggregates for one arm."""
+
+    pulls: int = 0
+    failures: int = 0
+    findings: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def observe(self, reward: float, success: bool, findings: int) -> None:
+        self.pulls += 1
+        self.failures += int(not success)
+        self.findings += max(0, findings)
+        delta = reward - self.mean
+        self.mean += delta / self.pulls
+        self.m2 += delta * (reward - self.mean)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a plausible mean reward (normal approximation of the posterior)."""
+
+        spread = math.sqrt(self.m2 / (self.pulls - 1)) if self.pulls > 1 else max(abs(self.mean), 1.0)
+        return self.mean + spread / math.sqrt(self.pulls) * rng.gauss(0.0, 1.0)
+
+    def to_list(self) -> list:
+        return [self.pulls, self.failures, self.findings, self.mean, self.m2]
+
+    @classmethod
+    def from_list(cls, values: list) -> "ArmStats":
+        return cls(*values)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "pulls": self.pulls,
+            "failureRate": round(self.failures / self.pulls, 4) if self.pulls else 0.0,
+            "findingsPerSecond": round(self.mean, 4),
+        }
+
+
+@dataclass(frozen=True)
+class TuningChoice:
+    params: Dict[str, Any]
+    # Runs behind the estimate (0 while the arm is being explored).
+    samples: int
+    findings_per_second: float
+
+
+class ParameterTuner:
+    def __init__(
+        self,
+        space: ParameterTuningSpace,
+        min_samples: int = 5,
+        compact_every: int = 1000,
+        flush_interval: float = 1.0,
+        rng: Optional[random.Random] = None,
+        center: TelemetryCenter = telemetry_center,
+    ) -> None:
+        self.space = space
+        self.min_samples = min_samples
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+        self._rng = rng or random.Random()
+        self._arms: Dict[ArmKey, ArmStats] = {}
+        self._lock = threading.Lock()
+        self._journal: Optional[SnapshotJournal] = None
+        self._observations = center.counter(
+            "ipo.tuning.observations", help="Executions recorded by the parameter tuner"
+        ).labels()
+
+    @property
+    def path(self) -> Optional[Path]:
+        journal = self._journal
+        return journal.path if journal is not None else None
+
+    def open(self, path: Union[str, Path]) -> None:
+        """Load the snapshot at ``path``, replay its log and keep appending to it."""
+
+        self.close()
+        journal = SnapshotJournal(Path(path), self._lock, self._rows, self.compact_every, self.flush_interval)
+        rows, entries = journal.load()
+        with self._lock:
+            self._arms.clear()
+            for key, values in rows:
+                self._arms[tuple(key)] = ArmStats.from_list(values)  # type: ignore[index]
+            for tool_id, asset_kind, arm, reward, success, findings in entries:
+                self._observe(tool_id, asset_kind, arm, reward, success, findings)
+            self._journal = journal
+        journal.start()
+
+    def close(self) -> None:
+        """Write everything observed so far into the snapshot and stop persisting."""
+
+        with self._lock:
+            journal, self._journal = self._journal, None
+        if journal is not None:
+            journal.close()
+
+    def flush(self) -> None:
+        """Write buffered observations to disk now instead of on the writer's next pass."""
+
+        journal = self._journal
+        if journal is not None:
+            journal.flush()
+
+    def arms(self, tool_id: str, ceilings: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        """Allowed parameter combinations for ``tool_id``, least aggressive first.
+
+        ``ceilings`` holds guardrail values: a parameter found there is limited to
+        the candidates up to that value. Empty when the tool is not tunable here.
+        """
+
+        candidates = self.space.tools.get(tool_id)
+        if not candidates:
+            return []
+        names = sorted(candidates)
+        allowed: List[List[Any]] = []
+        for name in names:
+            values = candidates[name]
+            if name in ceilings:
+                if ceilings[name] not in values:
+                    return []
+                values = values[: values.index(ceilings[name]) + 1]
+            allowed.append(values)
+        return [dict(zip(names, combination)) for combination in itertools.product(*allowed)]
+
+    def choose(self, tool_id: str, asset_kind: Optional[str], ceilings: Mapping[str, Any]) -> Optional[TuningChoice]:
+        """The arm to run next, or ``None`` when ``tool_id`` is not tunable under ``ceilings``."""
+
+        best: Optional[Tuple[float, Dict[str, Any], ArmStats]] = None
+        for params in self.arms(tool_id, ceilings):
+            stats = self.stats(tool_id, asset_kind, params)
+            if stats is None:
+                return TuningChoice(params=params, samples=0, findings_per_second=0.0)
+            draw = stats.sample(self._rng)
+            if best is None or draw > best[0]:
+                best = (draw, params, stats)
+        if best is None:
+            return None
+        _, params, stats = best
+        return TuningChoice(params=params, samples=stats.pulls, findings_per_second=stats.mean)
+
+    def observe(
+        self,
+        tool_id: str,
+        asset_kind: Optional[str],
+        params: Mapping[str, Any],
+        duration: float,
+        success: bool,
+        findings: int = 0,
+    ) -> bool:
+        """Record an execution; ``False`` (nothing recorded) when ``params`` are not an arm."""
+
+        arm = self._arm_key(tool_id, params)
+        if arm is None:
+            return False
+        reward = findings / max(_MIN_DURATION, duration) if success else 0.0
+        with self._lock:
+            self._observe(tool_id, asset_kind, arm, reward, success, findings)
+            if self._journal is not None:
+                self._journal.append([tool_id, asset_kind, arm, reward, success, findings])
+        self._observations.inc()
+        return True
+
+    def stats(self, tool_id: str, asset_kind: Optional[str], params: Mapping[str, Any]) -> Optional[ArmStats]:
+        """The arm's stats on ``asset_kind``, or across asset kinds while those are too few."""
+
+        arm = self._arm_key(tool_id, params)
+        if arm is None:
+            return None
+        if asset_kind is not None:
+            stats = self._arms.get((tool_id, asset_kind, arm))
+            if stats is not None and stats.pulls >= self.min_samples:
+                return stats
+        stats = self._arms.get((tool_id, ANY, arm))
+        return stats if stats is not None and stats.pulls else None
+
+    def summary(self) -> Dict[str, object]:
+        with self._lock:
+            arms = [
+                {"toolId": tool_id, "assetKind": asset_kind, "params": json.loads(arm), **stats.to_dict()}
+                for (tool_id, asset_kind, arm), stats in sorted(self._arms.items())
+            ]
+        path = self.path
+        return {"path": str(path) if path else None, "space": self.space.tools, "arms": arms}
+
+    def clear(self) -> None:
+        """Forget every observation, in memory and on disk."""
+
+        with self._lock:
+            self._arms.clear()
+            journal = self._journal
+        if journal is not None:
+            journal.compact()
+
+    def _arm_key(self, tool_id: str, params: Mapping[str, Any]) -> Optional[str]:
+        candidates = self.space.tools.get(tool_id)
+        if not candidates:
+            return None
+        arm: Dict[str, Any] = {}
+        for name in sorted(candidates):
+            values = candidates[name]
+            if name not in params or params[name] not in values:
+                return None
+            arm[name] = values[values.index(params[name])]  # the canonical spelling, e.g. 1000 for 1000.0
+        return json.dumps(arm, separators=(",", ":"))
+
+    def _observe(
+        self, tool_id: str, asset_kind: Optional[str], arm: str, reward: float, success: bool, findings: int
+    ) -> None:
+        kinds = [ANY] if asset_kind is None else [ANY, asset_kind]
+        for kind in kinds:
+            stats = self._arms.get((tool_id, kind, arm))
+            if stats is None:
+                stats = self._arms[(tool_id, kind, arm)] = ArmStats()
+            stats.observe(reward, success, findings)
+
+    def _rows(self) -> list:
+        return [[list(key), stats.to_list()] for key, stats in self._arms.items()]
+
+
+def load_space(path: Path) -> ParameterTuningSpace:
+    with path.open("r", encoding="utf-8") as handle:
+        return ParameterTuningSpace.model_validate(json.load(handle))
+
+
+def build_parameter_tuner() -> ParameterTuner:
+    return ParameterTuner(load_space(DEFAULT_SPACE_PATH), min_samples=config.decision.performance_min_samples)
+
+
+parameter_tuner = build_parameter_tuner()
+
+
+__all__ = [
+    "ArmStats",
+    "DEFAULT_SPACE_PATH",
+    "ParameterTuner",
+    "TuningChoice",
+    "build_parameter_tuner",
+    "load_space",
+    "parameter_tuner",
+]
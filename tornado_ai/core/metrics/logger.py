@@ -1,27 +1,177 @@
-"""Application logging helpers."""
+"""Application logging helpers.
+
+``configure_logging`` applies the dictConfig and then moves the root handlers
+behind a bounded queue: request threads only evaluate the message and enqueue
+the record, while a ``QueueListener`` thread serializes JSON and talks to
+stdout or disk. When the queue is full records are dropped and counted rather
+than blocking the caller. Noisy loggers can be sampled or rate limited before
+anything is enqueued.
+"""
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import queue
+import random
+import time
 from logging import LogRecord
 from logging.config import dictConfig
-from typing import Any, Dict, Optional
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from ..observability.telemetry import telemetry_center
+
+# Attributes every LogRecord carries; anything else was supplied via ``extra=``.
+_RESERVED = frozenset(vars(LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+
+_DROPPED = telemetry_center.counter("logging.dropped", help="Log records dropped on a full queue").labels()
 
 
 class JsonFormatter(logging.Formatter):
     """Structured JSON log formatter for observability pipelines."""
 
-    def format(self, record: LogRecord) -> str:  # pragma: no cover - logging string formatting
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._second: Tuple[int, str] = (-1, "")
+
+    def _timestamp(self, record: LogRecord) -> str:
+        """Same text as ``formatTime(record, self.datefmt)``.
+
+        strftime dominates formatting cost, so its result is reused for records
+        in the same second.
+        """
+
+        second, text = self._second
+        if int(record.created) != second:
+            second = int(record.created)
+            text = time.strftime(self.datefmt or self.default_time_format, self.converter(second))
+            self._second = (second, text)
+        if self.datefmt:
+            return text
+        return self.default_msec_format % (text, record.msecs)
+
+    def format(self, record: LogRecord) -> str:
         payload = {
-            "timestamp": self.formatTime(record, self.datefmt),
+            "timestamp": self._timestamp(record),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = record.stack_info
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and key not in payload and not key.startswith("_"):
+                payload[key] = value
+        return _ENCODER.encode(payload)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Enqueue records without blocking; a full queue drops and counts the record."""
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        super().__init__(queue.Queue(maxsize))
+
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DROPPED.inc()
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        # Resolve the message and traceback now (arguments may be mutated later)
+        # but leave JSON serialization to the listener thread.
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
         if record.exc_info:
-            payload["exc_info"] = self.formatException(record.exc_info)
-        payload.update(getattr(record, "extra", {}))
-        return json.dumps(payload, default=str)
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _PrefixPolicy:
+    """Longest-prefix lookup of a per-logger setting, memoised per logger name."""
+
+    def __init__(self, rules: Mapping[str, float]) -> None:
+        self._rules = dict(rules)
+        self._resolved: Dict[str, Optional[str]] = {}
+
+    def match(self, name: str) -> Optional[str]:
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        candidate: Optional[str] = name
+        while candidate not in self._rules:
+            if not candidate:
+                candidate = None
+                break
+            candidate = candidate.rpartition(".")[0]
+        self._resolved[name] = candidate
+        return candidate
+
+    def __getitem__(self, key: str) -> float:
+        return self._rules[key]
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of records per logger prefix; warnings and above always pass."""
+
+    def __init__(self, rates: Mapping[str, float], always_level: int = logging.WARNING) -> None:
+        super().__init__()
+        self._policy = _PrefixPolicy(rates)
+        self._always_level = always_level
+
+    def filter(self, record: LogRecord) -> bool:
+        if record.levelno >= self._always_level:
+            return True
+        rule = self._policy.match(record.name)
+        return rule is None or random.random() < self._policy[rule]
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per logger prefix (records per second, burst of ``max(1, rate)``).
+
+    Fractional rates work: a limit of 0.2 lets one record through every five
+    seconds.
+
+    The first record let through after suppression carries a ``suppressed``
+    field with the number of records dropped in between.
+    """
+
+    def __init__(self, limits: Mapping[str, float], clock=time.monotonic) -> None:
+        super().__init__()
+        self._policy = _PrefixPolicy(limits)
+        self._clock = clock
+        self._buckets: Dict[str, Tuple[float, float, int]] = {}
+        self._lock = Lock()
+
+    def filter(self, record: LogRecord) -> bool:
+        rule = self._policy.match(record.name)
+        if rule is None:
+            return True
+        rate = self._policy[rule]
+        now = self._clock()
+        with self._lock:
+            burst = max(1.0, rate)
+            tokens, updated, suppressed = self._buckets.get(rule, (burst, now, 0))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens < 1.0:
+                self._buckets[rule] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[rule] = (tokens - 1.0, now, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
 
 _DEFAULT_LOG_CONFIG: Dict[str, Any] = {
     "version": 1,
@@ -44,8 +194,29 @@ _DEFAULT_LOG_CONFIG: Dict[str, Any] = {
     },
 }
 
+_listener: Optional[QueueListener] = None
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
-def configure_logging(config: Optional[Dict[str, Any]] = None) -> logging.Logger:
+
+atexit.register(stop_logging)
+
+
+def configure_logging(
+    config: Optional[Dict[str, Any]] = None,
+    sampling: Optional[Mapping[str, float]] = None,
+    rate_limits: Optional[Mapping[str, float]] = None,
+    queue_size: int = 10_000,
+) -> logging.Logger:
+    global _listener
+    stop_logging()
     merged = dict(_DEFAULT_LOG_CONFIG)
     if config:
         merged = {
@@ -53,4 +224,17 @@ def configure_logging(config: Optional[Dict[str, Any]] = None) -> logging.Logger
             **config,
         }
     dictConfig(merged)
+
+    root = logging.getLogger()
+    handlers = [handler for handler in root.handlers if not isinstance(handler, QueueHandler)]
+    queue_handler = NonBlockingQueueHandler(queue_size)
+    if sampling:
+        queue_handler.addFilter(SamplingFilter(sampling))
+    if rate_limits:
+        queue_handler.addFilter(RateLimitFilter(rate_limits))
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    _listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
     return logging.getLogger("tornado_ai")
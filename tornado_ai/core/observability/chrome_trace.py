@@ -0,0 +1,89 @@
+"""Chrome Trace Event / Perfetto JSON export of recorded spans.
+
+Spans become complete (``"ph": "X"``) events grouped by the OS thread that ran
+them. Trace viewers require events on one track to nest strictly, but
+coroutines interleave on the event-loop thread, so every thread is split into
+as many lanes as needed: a span goes onto the first lane where it either
+starts after everything open has ended or fits entirely inside the innermost
+open span. Concurrent AIDE analyses or tool batches therefore show up as
+parallel lanes of the same thread.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .telemetry import SpanRecord
+
+
+def _assign_lanes(spans: Sequence[SpanRecord]) -> Dict[str, Tuple[int, int]]:
+    """Map span id to ``(thread id, lane)`` so events on each lane nest properly."""
+
+    lanes: Dict[int, List[List[float]]] = {}
+    assigned: Dict[str, Tuple[int, int]] = {}
+    for span in sorted(spans, key=lambda item: (item.start, -item.duration)):
+        end = span.start + span.duration
+        thread_lanes = lanes.setdefault(span.thread_id, [])
+        for index, open_ends in enumerate(thread_lanes):
+            while open_ends and open_ends[-1] <= span.start:
+                open_ends.pop()
+            if not open_ends or end <= open_ends[-1]:
+                break
+        else:
+            index = len(thread_lanes)
+            open_ends = []
+            thread_lanes.append(open_ends)
+        open_ends.append(end)
+        assigned[span.span_id] = (span.thread_id, index)
+    return assigned
+
+
+def chrome_trace_events(
+    spans: Sequence[SpanRecord], thread_names: Optional[Dict[int, str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield metadata and complete events for ``spans`` (timestamps in microseconds)."""
+
+    if thread_names is None:
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate() if thread.ident is not None}
+    pid = os.getpid()
+    lanes = _assign_lanes(spans)
+    tids: Dict[Tuple[int, int], int] = {}
+    yield {"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": "tornado-ai"}}
+    for thread_id, lane in sorted(set(lanes.values())):
+        tid = tids[(thread_id, lane)] = len(tids) + 1
+        name = thread_names.get(thread_id, f"thread-{thread_id}")
+        label = name if lane == 0 else f"{name} #{lane}"
+        yield {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": label}}
+        yield {"ph": "M", "name": "thread_sort_index", "pid": pid, "tid": tid, "args": {"sort_index": tid}}
+    for span in sorted(spans, key=lambda item: item.start):
+        args: Dict[str, Any] = {**span.attributes, "traceId": span.trace_id, "spanId": span.span_id}
+        if span.parent_id:
+            args["parentId"] = span.parent_id
+        if span.error:
+            args["error"] = span.error
+        yield {
+            "ph": "X",
+            "name": span.name,
+            "cat": span.name.split(".", 1)[0],
+            "ts": round(span.start * 1e6, 3),
+            "dur": round(span.duration * 1e6, 3),
+            "pid": pid,
+            "tid": tids[lanes[span.span_id]],
+            "args": args,
+        }
+
+
+def stream_chrome_trace(spans: Iterable[SpanRecord], thread_names: Optional[Dict[int, str]] = None) -> Iterator[str]:
+    """Serialize the trace as a JSON object chunk by chunk (one event per chunk)."""
+
+    yield '{"displayTimeUnit":"ms","traceEvents":['
+    separator = ""
+    for event in chrome_trace_events(list(spans), thread_names):
+        yield separator + json.dumps(event, default=str, separators=(",", ":"))
+        separator = ",\n"
+    yield "]}\n"
+
+
+__all__ = ["chrome_trace_events", "stream_chrome_trace"]
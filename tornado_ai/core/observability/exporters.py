@@ -0,0 +1,497 @@
+"""Background export of spans and metric deltas.
+
+The request path only appends kept spans to a bounded in-memory queue (spans
+are dropped and counted when it is full). A daemon thread drains the queue in
+batches, collects counter and histogram deltas (and changed gauge values)
+every ``flush_interval`` and
+hands both to the configured exporters: rotating JSONL or OTLP-JSON files, or
+a newline-delimited JSON socket such as :class:`LocalCollector`.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import socket
+import socketserver
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import time
+from typing import Any, Deque, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from .histogram import Histogram
+from .metrics import LabelSet
+from .openmetrics import DEFAULT_BUCKETS, metric_name
+from .telemetry import SpanRecord, TelemetryCenter
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "tornado-ai"
+
+
+@dataclass
+class MetricPoint:
+    """Change of one series since the previous export (a gauge's new value)."""
+
+    name: str
+    kind: str
+    unit: str
+    labels: LabelSet
+    start: float
+    end: float
+    value: float = 0.0
+    count: int = 0
+    total: float = 0.0
+    bounds: Tuple[float, ...] = ()
+    bucket_counts: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "kind": "metric",
+            "name": self.name,
+            "type": self.kind,
+            "unit": self.unit,
+            "labels": dict(self.labels),
+            "start": self.start,
+            "end": self.end,
+        }
+        if self.kind == "counter":
+            payload["delta"] = self.value
+        elif self.kind == "gauge":
+            payload["value"] = self.value
+        else:
+            payload.update(
+                {"count": self.count, "sum": self.total, "bounds": list(self.bounds), "bucketCounts": self.bucket_counts}
+            )
+        return payload
+
+
+class TelemetryExporter(Protocol):
+    def export(self, spans: Sequence[SpanRecord], metrics: Sequence[MetricPoint]) -> None:
+        ...
+
+    def shutdown(self) -> None:
+        ...
+
+
+class _RotatingWriter:
+    """Append lines to ``path``, rolling over to ``path.1`` … ``path.N`` by size."""
+
+    def __init__(self, path: Path, max_bytes: int, backup_count: int) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self._path.open("a", encoding="utf-8")
+
+    def write_lines(self, lines: Sequence[str]) -> None:
+        for line in lines:
+            if self._max_bytes and self._handle.tell() + len(line) + 1 > self._max_bytes and self._handle.tell():
+                self._rotate()
+            self._handle.write(line + "\n")
+        self._handle.flush()
+
+    def _rotate(self) -> None:
+        self._handle.close()
+        for index in range(self._backup_count - 1, 0, -1):
+            source = self._path.with_name(f"{self._path.name}.{index}")
+            if source.exists():
+                source.replace(self._path.with_name(f"{self._path.name}.{index + 1}"))
+        if self._backup_count:
+            self._path.replace(self._path.with_name(f"{self._path.name}.1"))
+        else:
+            self._path.unlink(missing_ok=True)
+        self._handle = self._path.open("a", encoding="utf-8")
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class JsonlFileExporter:
+    """One JSON object per span or metric point."""
+
+    def __init__(self, path: Path, max_bytes: int = 16 * 1024 * 1024, backup_count: int = 5) -> None:
+        self._writer = _RotatingWriter(Path(path), max_bytes, backup_count)
+
+    def export(self, spans: Sequence[SpanRecord], metrics: Sequence[MetricPoint]) -> None:
+        lines = [json.dumps({"kind": "span", **span.to_dict()}, default=str) for span in spans]
+        lines.extend(json.dumps(point.to_dict()) for point in metrics)
+        self._writer.write_lines(lines)
+
+    def shutdown(self) -> None:
+        self._writer.close()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(items) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in items]
+
+
+def _nanos(seconds: float) -> str:
+    return str(int(seconds * 1e9))
+
+
+_RESOURCE = {"attributes": _otlp_attributes([("service.name", SERVICE_NAME)])}
+_SCOPE = {"name": "tornado_ai.core.observability"}
+
+
+def otlp_traces(spans: Sequence[SpanRecord]) -> Dict[str, Any]:
+    """Encode spans as an OTLP/JSON ``ExportTraceServiceRequest``."""
+
+    encoded = []
+    for span in spans:
+        item: Dict[str, Any] = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": _nanos(span.start),
+            "endTimeUnixNano": _nanos(span.start + span.duration),
+            "attributes": _otlp_attributes(span.attributes.items()),
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+        }
+        if span.parent_id:
+            item["parentSpanId"] = span.parent_id
+        encoded.append(item)
+    return {"resourceSpans": [{"resource": _RESOURCE, "scopeSpans": [{"scope": _SCOPE, "spans": encoded}]}]}
+
+
+def otlp_metrics(points: Sequence[MetricPoint]) -> Dict[str, Any]:
+    """Encode metric deltas as an OTLP/JSON ``ExportMetricsServiceRequest``."""
+
+    grouped: Dict[Tuple[str, str, str], List[MetricPoint]] = {}
+    for point in points:
+        grouped.setdefault((point.name, point.kind, point.unit), []).append(point)
+    metrics = []
+    for (name, kind, unit), series in grouped.items():
+        if kind == "counter":
+            data = {
+                "sum": {
+                    "aggregationTemporality": 1,
+                    "isMonotonic": True,
+                    "dataPoints": [
+                        {
+                            "attributes": _otlp_attributes(point.labels),
+                            "startTimeUnixNano": _nanos(point.start),
+                            "timeUnixNano": _nanos(point.end),
+                            "asDouble": point.value,
+                        }
+                        for point in series
+                    ],
+                }
+            }
+        elif kind == "gauge":
+            data = {
+                "gauge": {
+                    "dataPoints": [
+                        {
+                            "attributes": _otlp_attributes(point.labels),
+                            "timeUnixNano": _nanos(point.end),
+                            "asDouble": point.value,
+                        }
+                        for point in series
+                    ],
+                }
+            }
+        else:
+            data = {
+                "histogram": {
+                    "aggregationTemporality": 1,
+                    "dataPoints": [
+                        {
+                            "attributes": _otlp_attributes(point.labels),
+                            "startTimeUnixNano": _nanos(point.start),
+                            "timeUnixNano": _nanos(point.end),
+                            "count": str(point.count),
+                            "sum": point.total,
+                            "explicitBounds": list(point.bounds),
+                            "bucketCounts": [str(count) for count in point.bucket_counts],
+                        }
+                        for point in series
+                    ],
+                }
+            }
+        metrics.append({"name": name, "unit": unit, **data})
+    return {"resourceMetrics": [{"resource": _RESOURCE, "scopeMetrics": [{"scope": _SCOPE, "metrics": metrics}]}]}
+
+
+class OtlpJsonFileExporter:
+    """OTLP file-exporter layout: one export request per line."""
+
+    def __init__(self, path: Path, max_bytes: int = 16 * 1024 * 1024, backup_count: int = 5) -> None:
+        self._writer = _RotatingWriter(Path(path), max_bytes, backup_count)
+
+    def export(self, spans: Sequence[SpanRecord], metrics: Sequence[MetricPoint]) -> None:
+        lines = []
+        if spans:
+            lines.append(json.dumps(otlp_traces(spans), default=str))
+        if metrics:
+            lines.append(json.dumps(otlp_metrics(metrics)))
+        self._writer.write_lines(lines)
+
+    def shutdown(self) -> None:
+        self._writer.close()
+
+
+class SocketExporter:
+    """Stream newline-delimited JSON records to a TCP collector, reconnecting on failure."""
+
+    def __init__(self, host: str, port: int, timeout: float = 2.0) -> None:
+        self._address = (host, port)
+        self._timeout = timeout
+        self._socket: Optional[socket.socket] = None
+
+    def export(self, spans: Sequence[SpanRecord], metrics: Sequence[MetricPoint]) -> None:
+        lines = [json.dumps({"kind": "span", **span.to_dict()}, default=str) for span in spans]
+        lines.extend(json.dumps(point.to_dict()) for point in metrics)
+        if not lines:
+            return
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+        try:
+            self._connect().sendall(payload)
+        except OSError:
+            self.shutdown()
+            raise
+
+    def _connect(self) -> socket.socket:
+        if self._socket is None:
+            self._socket = socket.create_connection(self._address, timeout=self._timeout)
+        return self._socket
+
+    def shutdown(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+class LocalCollector:
+    """Tiny TCP collector stand-in that stores received JSON records in memory."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        records: List[Dict[str, Any]] = []
+        lock = threading.Lock()
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    if line.strip():
+                        with lock:
+                            records.append(json.loads(line))
+
+        self.records = records
+        self._server = socketserver.ThreadingTCPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self.address: Tuple[str, int] = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="tornado-local-collector", daemon=True)
+
+    def start(self) -> "LocalCollector":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TelemetryExportPipeline:
+    """Bounded, non-blocking hand-off from the telemetry center to exporters."""
+
+    def __init__(
+        self,
+        center: TelemetryCenter,
+        exporters: Sequence[TelemetryExporter],
+        max_queue: int = 10_000,
+        batch_size: int = 512,
+        flush_interval: float = 5.0,
+    ) -> None:
+        self._center = center
+        self._exporters = list(exporters)
+        self._queue: Deque[SpanRecord] = deque()
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_values: Dict[Tuple[str, LabelSet], Any] = {}
+        self._last_export = time()
+        self._generation = center.generation
+        self._exported = center.counter("telemetry.export.spans", help="Spans handed to exporters").labels()
+        self._dropped = center.counter("telemetry.export.dropped", help="Spans dropped on a full export queue").labels()
+        self._errors = center.counter("telemetry.export.errors", help="Exporter failures").labels()
+
+    # Request path -----------------------------------------------------------------
+    def enqueue(self, spans: List[SpanRecord]) -> None:
+        room = self._max_queue - len(self._queue)
+        if room < len(spans):
+            self._dropped.inc(len(spans) - max(room, 0))
+            spans = spans[: max(room, 0)]
+        self._queue.extend(spans)
+        if len(self._queue) >= self._batch_size:
+            self._wake.set()
+
+    # Lifecycle --------------------------------------------------------------------
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._center.add_span_listener(self.enqueue)
+        self._thread = threading.Thread(target=self._run, name="tornado-telemetry-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Detach from the center, flush everything still queued and close exporters."""
+
+        if self._thread is None:
+            return
+        self._center.remove_span_listener(self.enqueue)
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+        for exporter in self._exporters:
+            exporter.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "capacity": self._max_queue,
+            "exported": self._exported.value,
+            "dropped": self._dropped.value,
+            "errors": self._errors.value,
+        }
+
+    # Worker -----------------------------------------------------------------------
+    def _run(self) -> None:
+        next_metrics = time() + self._flush_interval
+        while not self._stopping.is_set():
+            self._wake.wait(max(0.0, next_metrics - time()))
+            self._wake.clear()
+            self._drain_spans()
+            if time() >= next_metrics:
+                self._ship([], self.collect_metrics())
+                next_metrics = time() + self._flush_interval
+        self.flush()
+
+    def flush(self) -> None:
+        self._drain_spans()
+        self._ship([], self.collect_metrics())
+
+    def _drain_spans(self) -> None:
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self._batch_size, len(self._queue)))]
+            self._ship(batch, [])
+            self._exported.inc(len(batch))
+
+    def _ship(self, spans: Sequence[SpanRecord], metrics: Sequence[MetricPoint]) -> None:
+        if not spans and not metrics:
+            return
+        for exporter in self._exporters:
+            try:
+                exporter.export(spans, metrics)
+            except Exception:  # pragma: no cover - depends on exporter I/O failures
+                self._errors.inc()
+                logger.warning("Telemetry exporter %s failed", type(exporter).__name__, exc_info=True)
+
+    def collect_metrics(self) -> List[MetricPoint]:
+        """Deltas for every series that changed since the previous call (gauges: their value).
+
+        A series that went backwards was reset: as in OTLP cumulative-to-delta
+        conversion its whole current value is the delta. After a
+        :meth:`TelemetryCenter.reset` every series starts over and the deltas
+        start at the reset rather than at the previous export.
+        """
+
+        now = time()
+        start, self._last_export = self._last_export, now
+        if self._center.generation != self._generation:
+            self._generation = self._center.generation
+            self._last_values.clear()
+            start = max(start, self._center.reset_at)
+        points: List[MetricPoint] = []
+        for family in self._center.families():
+            name = metric_name(family)
+            for labels, handle in list(family.series.items()):
+                key = (family.name, labels)
+                if family.kind == "counter":
+                    previous = self._last_values.get(key, 0.0)
+                    if handle.value < previous:
+                        previous = 0.0
+                    delta = handle.value - previous
+                    self._last_values[key] = handle.value
+                    if delta > 0:
+                        points.append(MetricPoint(name, "counter", family.unit, labels, start, now, value=delta))
+                    continue
+                if family.kind == "gauge":
+                    # Gauges are exported as their last value whenever it changed.
+                    if self._last_values.get(key) != handle.value:
+                        self._last_values[key] = handle.value
+                        points.append(MetricPoint(name, "gauge", family.unit, labels, start, now, value=handle.value))
+                    continue
+                histogram: Histogram = handle.histogram
+                bounds = DEFAULT_BUCKETS.get(family.unit, DEFAULT_BUCKETS[""])
+                empty = (0, 0.0, [0] * (len(bounds) + 1))
+                previous_state = self._last_values.get(key, empty)
+                if histogram.count == previous_state[0]:
+                    continue
+                if histogram.count < previous_state[0]:
+                    previous_state = empty
+                cumulative = histogram.cumulative_counts(bounds) + [histogram.count]
+                buckets = [high - low for high, low in zip(cumulative, [0] + cumulative[:-1])]
+                deltas = [current - before for current, before in zip(buckets, previous_state[2])]
+                self._last_values[key] = (histogram.count, histogram.total, buckets)
+                points.append(
+                    MetricPoint(
+                        name,
+                        "histogram",
+                        family.unit,
+                        labels,
+                        start,
+                        now,
+                        count=histogram.count - previous_state[0],
+                        total=histogram.total - previous_state[1],
+                        bounds=tuple(bounds),
+                        bucket_counts=deltas,
+                    )
+                )
+        return points
+
+
+def build_exporter(target: str, path: str, socket_address: str) -> Optional[TelemetryExporter]:
+    """Exporter for ``TORNADO_TELEMETRY_EXPORT`` (``none``, ``jsonl``, ``otlp`` or ``socket``)."""
+
+    target = target.strip().lower()
+    if target in {"", "none", "off"}:
+        return None
+    if target == "jsonl":
+        return JsonlFileExporter(Path(path))
+    if target == "otlp":
+        return OtlpJsonFileExporter(Path(path))
+    if target == "socket":
+        host, _, port = socket_address.rpartition(":")
+        return SocketExporter(host or "127.0.0.1", int(port))
+    raise ValueError(f"Unknown telemetry export target {target!r}")
+
+
+__all__ = [
+    "JsonlFileExporter",
+    "LocalCollector",
+    "MetricPoint",
+    "OtlpJsonFileExporter",
+    "SocketExporter",
+    "TelemetryExportPipeline",
+    "TelemetryExporter",
+    "build_exporter",
+    "otlp_metrics",
+    "otlp_traces",
+]
@@ -0,0 +1,216 @@
+"""Constant-memory log-bucketed latency histogram."""
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+DEFAULT_QUANTILES: Tuple[Tuple[str, float], ...] = (
+    ("p50", 0.50),
+    ("p90", 0.90),
+    ("p95", 0.95),
+    ("p99", 0.99),
+    ("p999", 0.999),
+)
+
+# Observations at or below this value share the dedicated zero bucket; it keeps
+# ``math.log`` away from zero and negative durations caused by clock skew.
+_MIN_TRACKABLE = 1e-9
+
+
+@dataclass
+class Histogram:
+    """Log-bucketed histogram with bounded relative error.
+
+    Values land in geometric buckets of ratio ``gamma = (1 + a) / (1 - a)``
+    where ``a`` is ``relative_accuracy``, so every reported quantile is within
+    ``a`` of the exact answer. Observing is O(1) and memory is bounded by
+    ``max_buckets`` regardless of how many values are recorded. Histograms
+    with the same accuracy can be merged bucket by bucket.
+    """
+
+    name: str
+    relative_accuracy: float = 0.01
+    max_buckets: int = 2048
+    count: int = field(default=0, init=False)
+    total: float = field(default=0.0, init=False)
+    minimum: float = field(default=math.inf, init=False)
+    maximum: float = field(default=-math.inf, init=False)
+    _zero_count: int = field(default=0, init=False, repr=False)
+    _floor: float = field(default=-math.inf, init=False, repr=False)
+    _buckets: Dict[int, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self._gamma = (1.0 + self.relative_accuracy) / (1.0 - self.relative_accuracy)
+        self._inv_log_gamma = 1.0 / math.log(self._gamma)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        if value <= _MIN_TRACKABLE:
+            self._zero_count += 1
+            return
+        index = math.ceil(math.log(value) * self._inv_log_gamma)
+        if index < self._floor:
+            index = self._floor
+        buckets = self._buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse_lowest()
+
+    def observe_many(self, values: Sequence[float]) -> None:
+        """:meth:`observe` every value in ``values``.
+
+        The values are sorted and counted a bucket at a time; the logarithm is
+        only taken to skip over empty buckets, never once per value.
+        """
+
+        if not values:
+            return
+        ordered = sorted(values)
+        self.count += len(ordered)
+        self.total += sum(ordered)
+        self.minimum = min(self.minimum, ordered[0])
+        self.maximum = max(self.maximum, ordered[-1])
+        position = bisect_right(ordered, _MIN_TRACKABLE)
+        self._zero_count += position
+        buckets = self._buckets
+        gamma = self._gamma
+        end = len(ordered)
+        index = 0
+        upper = -math.inf
+        while position < end:
+            if ordered[position] <= upper * gamma:
+                index += 1
+                upper *= gamma
+            else:
+                index = math.ceil(math.log(ordered[position]) * self._inv_log_gamma)
+                upper = gamma**index
+            # Always advance past ``position`` in case rounding puts ``upper`` just below it.
+            stop = bisect_right(ordered, upper, position)
+            if stop == position:
+                stop += 1
+            slot = index if index >= self._floor else self._floor
+            buckets[slot] = buckets.get(slot, 0) + stop - position
+            position = stop
+        if len(buckets) > self.max_buckets:
+            self._collapse_lowest()
+
+    def merge(self, other: "Histogram") -> None:
+        """Fold ``other`` into this histogram; both must share the same accuracy."""
+
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge histograms with different relative accuracy")
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._zero_count += other._zero_count
+        self._floor = max(self._floor, other._floor)
+        buckets = self._buckets
+        floor = self._floor
+        for index, hits in other._buckets.items():
+            if index < floor:
+                index = floor
+            buckets[index] = buckets.get(index, 0) + hits
+        if len(buckets) > self.max_buckets:
+            self._collapse_lowest()
+
+    def copy(self) -> "Histogram":
+        clone = Histogram(self.name, self.relative_accuracy, self.max_buckets)
+        clone.merge(self)
+        return clone
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Iterable[float]) -> list[float]:
+        """Return the estimated value for each quantile in ``qs`` (a single bucket walk)."""
+
+        targets = list(qs)
+        if self.count == 0:
+            return [0.0 for _ in targets]
+        order = sorted(range(len(targets)), key=lambda position: targets[position])
+        results = [0.0] * len(targets)
+        pending = iter(order)
+        position = next(pending, None)
+        cumulative = self._zero_count
+        while position is not None and cumulative > targets[position] * (self.count - 1):
+            results[position] = max(self.minimum, 0.0)
+            position = next(pending, None)
+        for index in sorted(self._buckets):
+            if position is None:
+                break
+            cumulative += self._buckets[index]
+            value = self._bucket_value(index)
+            while position is not None and cumulative > targets[position] * (self.count - 1):
+                results[position] = value
+                position = next(pending, None)
+        while position is not None:
+            results[position] = self.maximum
+            position = next(pending, None)
+        return [min(max(value, self.minimum), self.maximum) for value in results]
+
+    def cumulative_counts(self, bounds: Sequence[float]) -> list[int]:
+        """Estimated number of observations ``<=`` each of the ascending ``bounds``."""
+
+        counts = [0] * len(bounds)
+        if self.count == 0:
+            return counts
+        position = 0
+        cumulative = self._zero_count
+        for index in sorted(self._buckets):
+            value = self._bucket_value(index)
+            while position < len(bounds) and value > bounds[position]:
+                counts[position] = cumulative
+                position += 1
+            if position == len(bounds):
+                return counts
+            cumulative += self._buckets[index]
+        while position < len(bounds):
+            counts[position] = cumulative
+            position += 1
+        return counts
+
+    def snapshot(self) -> Dict[str, Any]:
+        if self.count == 0:
+            empty: Dict[str, Any] = {"count": 0, "sum": 0.0, "avg": 0.0, "min": 0.0, "max": 0.0}
+            empty.update({label: 0.0 for label, _ in DEFAULT_QUANTILES})
+            return empty
+        estimates = self.quantiles(q for _, q in DEFAULT_QUANTILES)
+        payload: Dict[str, Any] = {
+            "count": self.count,
+            "sum": self.total,
+            "avg": self.total / self.count,
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+        payload.update({label: value for (label, _), value in zip(DEFAULT_QUANTILES, estimates)})
+        return payload
+
+    def _bucket_value(self, index: int) -> float:
+        # Midpoint (in relative terms) of (gamma^(i-1), gamma^i].
+        return 2.0 * self._gamma**index / (self._gamma + 1.0)
+
+    def _collapse_lowest(self) -> None:
+        # Fold the lowest eighth of the buckets into one floor bucket so the
+        # sort is amortised over many observations; accuracy degrades only for
+        # the smallest values, which matter least for tail latency.
+        ordered = sorted(self._buckets)
+        keep = self.max_buckets - max(1, self.max_buckets // 8)
+        floor = ordered[len(ordered) - keep]
+        folded = sum(self._buckets.pop(index) for index in ordered[: len(ordered) - keep])
+        self._buckets[floor] += folded
+        self._floor = floor
+
+
+__all__ = ["Histogram", "DEFAULT_QUANTILES"]
@@ -0,0 +1,171 @@
+"""Event-loop lag and executor saturation monitor.
+
+A probe coroutine sleeps for ``interval`` seconds and records how late it woke
+up (``loop.lag``) together with the number of live tasks (``loop.tasks``) and
+the default executor's queue depth and utilization. A watchdog thread checks
+the probe's heartbeat; when the loop has not come back for ``stall_threshold``
+seconds it captures the loop thread's stack and logs it with the name of the
+task that is currently running, which points straight at the blocking code.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic, perf_counter
+from typing import Any, Callable, Optional
+
+from .telemetry import TelemetryCenter, telemetry_center
+
+logger = logging.getLogger("tornado_ai.loop_monitor")
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """``ThreadPoolExecutor`` that reports queue wait, busy workers and queue depth."""
+
+    def __init__(self, max_workers: Optional[int] = None, center: TelemetryCenter = telemetry_center, **kwargs: Any):
+        super().__init__(max_workers=max_workers, **kwargs)
+        self._busy = 0
+        self._busy_lock = threading.Lock()
+        self._wait = center.histogram("executor.wait", help="Time work items wait for a free worker").labels()
+
+    @property
+    def busy(self) -> int:
+        return self._busy
+
+    @property
+    def queue_depth(self) -> int:
+        return self._work_queue.qsize()
+
+    @property
+    def utilization(self) -> float:
+        return self._busy / self._max_workers
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        queued = perf_counter()
+
+        def _run() -> Any:
+            self._wait.observe(perf_counter() - queued)
+            with self._busy_lock:
+                self._busy += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._busy_lock:
+                    self._busy -= 1
+
+        return super().submit(_run)
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        center: TelemetryCenter = telemetry_center,
+        interval: float = 0.5,
+        stall_threshold: float = 0.1,
+    ) -> None:
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self._center = center
+        self._lag = center.histogram("loop.lag", help="Event-loop scheduling delay").labels()
+        self._tasks = center.histogram("loop.tasks", unit="", help="Live asyncio tasks per probe").labels()
+        self._depth = center.histogram("executor.queue_depth", unit="", help="Queued executor work items").labels()
+        self._utilization = center.histogram(
+            "executor.utilization", unit="", help="Fraction of executor workers busy"
+        ).labels()
+        self._stalls = center.counter("loop.stalls", help="Event-loop stalls above the threshold").labels()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._executor: Optional[InstrumentedThreadPoolExecutor] = None
+        self._probe: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._heartbeat = monotonic()
+        self._reported_beat = -1.0
+
+    @property
+    def executor(self) -> Optional[InstrumentedThreadPoolExecutor]:
+        return self._executor
+
+    def start(self, max_workers: Optional[int] = None) -> None:
+        """Install the instrumented default executor and start probing (call from the loop)."""
+
+        if self._probe is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._executor = InstrumentedThreadPoolExecutor(
+            max_workers, center=self._center, thread_name_prefix="tornado-executor"
+        )
+        self._loop.set_default_executor(self._executor)
+        self._stopping.clear()
+        self._heartbeat = monotonic()
+        self._probe = self._loop.create_task(self._run(), name="tornado-loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="tornado-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._probe is None:
+            return
+        self._stopping.set()
+        self._probe.cancel()
+        try:
+            await self._probe
+        except asyncio.CancelledError:
+            pass
+        self._probe = None
+        if self._watchdog is not None:
+            self._watchdog.join(self.stall_threshold * 2)
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self._heartbeat = monotonic()
+            self._lag.observe(max(0.0, loop.time() - started - self.interval))
+            self._tasks.observe(len(asyncio.all_tasks(loop)))
+            executor = self._executor
+            if executor is not None:
+                self._depth.observe(executor.queue_depth)
+                self._utilization.observe(executor.utilization)
+
+    def _watch(self) -> None:
+        poll = max(self.stall_threshold / 2, 0.01)
+        while not self._stopping.wait(poll):
+            beat = self._heartbeat
+            overdue = monotonic() - beat - self.interval
+            if overdue >= self.stall_threshold and beat != self._reported_beat:
+                self._reported_beat = beat
+                self._report(overdue)
+
+    def _report(self, overdue: float) -> None:
+        self._stalls.inc()
+        frame = sys._current_frames().get(self._loop_thread) if self._loop_thread is not None else None
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        task = _running_task(self._loop)
+        logger.warning(
+            "Event loop blocked for %.0f ms",
+            overdue * 1000,
+            extra={"lagSeconds": round(overdue, 4), "task": task, "stack": stack},
+        )
+
+
+def _running_task(loop: Optional[asyncio.AbstractEventLoop]) -> Optional[str]:
+    # asyncio keeps the running task per loop in a module-level mapping; reading
+    # it from another thread is racy but good enough for a diagnostic label.
+    current = getattr(asyncio.tasks, "_current_tasks", {}).get(loop)
+    if current is None:
+        return None
+    coro = current.get_coro()
+    return f"{current.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+
+loop_monitor = LoopMonitor()
+
+
+__all__ = ["InstrumentedThreadPoolExecutor", "LoopMonitor", "loop_monitor"]
@@ -0,0 +1,275 @@
+"""Heap snapshots via ``tracemalloc`` and a periodic process memory feed.
+
+``HeapProfiler`` wraps ``tracemalloc`` for the debug endpoints: it keeps the
+last few snapshots so allocation sites can be listed or diffed, with sizes
+grouped by ``tornado_ai`` module (third-party code is grouped by top-level
+package). ``ProcessMetricsSampler`` records RSS, per-generation GC counts
+and collections into telemetry so growth shows up as a trend long before
+the process is OOM-killed.
+"""
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from time import time
+from typing import Any, Dict, Optional
+
+try:  # pragma: no cover - not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+from .telemetry import TelemetryCenter, telemetry_center
+
+_PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+_STDLIB = Path(os.__file__).resolve().parent
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+)
+
+
+class HeapProfilerError(RuntimeError):
+    """Raised when a heap operation needs tracing or a snapshot that is not available."""
+
+
+class UnknownSnapshotError(HeapProfilerError):
+    """Raised for a snapshot id that was never taken or has been evicted."""
+
+
+@lru_cache(maxsize=4096)
+def module_for(filename: str) -> str:
+    """Group key for an allocation site: a dotted ``tornado_ai`` module, a package or a script name."""
+
+    path = Path(filename)
+    try:
+        relative = path.resolve().relative_to(_PACKAGE_ROOT)
+    except (OSError, ValueError):
+        relative = None
+    if relative is not None:
+        return ".".join(("tornado_ai",) + relative.with_suffix("").parts).removesuffix(".__init__")
+    parts = path.parts
+    if "site-packages" in parts:
+        index = parts.index("site-packages")
+        if index + 1 < len(parts):
+            return parts[index + 1].removesuffix(".py")
+    if filename.startswith(str(_STDLIB)):
+        return "(stdlib)"
+    if path.suffix == ".py":
+        return path.stem
+    return "(other)"
+
+
+@dataclass
+class HeapSnapshot:
+    id: int
+    taken_at: float
+    traced_bytes: int
+    peak_bytes: int
+    snapshot: tracemalloc.Snapshot
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "takenAt": self.taken_at,
+            "tracedBytes": self.traced_bytes,
+            "peakBytes": self.peak_bytes,
+        }
+
+
+class HeapProfiler:
+    def __init__(self, max_snapshots: int = 5) -> None:
+        self._max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[int, HeapSnapshot]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def status(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory() if self.tracing else (0, 0)
+        return {
+            "tracing": self.tracing,
+            "frames": tracemalloc.get_traceback_limit(),
+            "tracedBytes": current,
+            "peakBytes": peak,
+            "overheadBytes": tracemalloc.get_tracemalloc_memory() if self.tracing else 0,
+            "snapshots": [snapshot.summary() for snapshot in self._snapshots.values()],
+        }
+
+    def start(self, frames: int = 1) -> Dict[str, Any]:
+        if not self.tracing:
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing; stored snapshots stay available for top/diff queries."""
+
+        if self.tracing:
+            tracemalloc.stop()
+        return self.status()
+
+    def take_snapshot(self) -> HeapSnapshot:
+        if not self.tracing:
+            raise HeapProfilerError("tracemalloc is not tracing; start it first")
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        with self._lock:
+            entry = HeapSnapshot(self._next_id, time(), current, peak, snapshot)
+            self._next_id += 1
+            self._snapshots[entry.id] = entry
+            while len(self._snapshots) > self._max_snapshots:
+                self._snapshots.popitem(last=False)
+        return entry
+
+    def get(self, snapshot_id: Optional[int] = None) -> HeapSnapshot:
+        with self._lock:
+            if not self._snapshots:
+                raise HeapProfilerError("No heap snapshots have been taken")
+            if snapshot_id is None:
+                return next(reversed(self._snapshots.values()))
+            try:
+                return self._snapshots[snapshot_id]
+            except KeyError:
+                raise UnknownSnapshotError(f"Unknown heap snapshot {snapshot_id}") from None
+
+    def top(self, snapshot_id: Optional[int] = None, limit: int = 20) -> Dict[str, Any]:
+        entry = self.get(snapshot_id)
+        sites = [
+            {
+                "file": stat.traceback[0].filename,
+                "line": stat.traceback[0].lineno,
+                "module": module_for(stat.traceback[0].filename),
+                "sizeBytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in entry.snapshot.statistics("lineno")[:limit]
+        ]
+        modules: Dict[str, Dict[str, int]] = {}
+        for stat in entry.snapshot.statistics("filename"):
+            bucket = modules.setdefault(module_for(stat.traceback[0].filename), {"sizeBytes": 0, "count": 0})
+            bucket["sizeBytes"] += stat.size
+            bucket["count"] += stat.count
+        ranked = sorted(modules.items(), key=lambda item: -item[1]["sizeBytes"])[:limit]
+        return {
+            **entry.summary(),
+            "sites": sites,
+            "modules": [{"module": name, **values} for name, values in ranked],
+        }
+
+    def diff(self, base_id: int, snapshot_id: Optional[int] = None, limit: int = 20) -> Dict[str, Any]:
+        base = self.get(base_id)
+        current = self.get(snapshot_id)
+        modules: Dict[str, Dict[str, int]] = {}
+        for stat in current.snapshot.compare_to(base.snapshot, "filename"):
+            bucket = modules.setdefault(
+                module_for(stat.traceback[0].filename), {"sizeDiffBytes": 0, "countDiff": 0, "sizeBytes": 0}
+            )
+            bucket["sizeDiffBytes"] += stat.size_diff
+            bucket["countDiff"] += stat.count_diff
+            bucket["sizeBytes"] += stat.size
+        ranked = sorted(modules.items(), key=lambda item: -abs(item[1]["sizeDiffBytes"]))[:limit]
+        sites = [
+            {
+                "file": stat.traceback[0].filename,
+                "line": stat.traceback[0].lineno,
+                "module": module_for(stat.traceback[0].filename),
+                "sizeDiffBytes": stat.size_diff,
+                "countDiff": stat.count_diff,
+            }
+            for stat in current.snapshot.compare_to(base.snapshot, "lineno")[:limit]
+        ]
+        return {
+            "base": base.summary(),
+            "snapshot": current.summary(),
+            "modules": [{"module": name, **values} for name, values in ranked],
+            "sites": sites,
+        }
+
+
+def resident_set_bytes() -> int:
+    """Current RSS from ``/proc``; falls back to peak RSS where procfs is unavailable."""
+
+    if resource is None:  # pragma: no cover - Windows
+        return 0
+    try:
+        with open("/proc/self/statm", "rb") as handle:
+            return int(handle.read().split()[1]) * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ProcessMetricsSampler:
+    """Record RSS and GC statistics every ``interval`` seconds from a daemon thread."""
+
+    def __init__(self, center: TelemetryCenter = telemetry_center, interval: float = 15.0) -> None:
+        self.interval = interval
+        self._rss = center.gauge("process.rss", unit="bytes", help="Resident set size").labels()
+        self._traced = center.gauge("process.traced", unit="bytes", help="Bytes traced by tracemalloc").labels()
+        generations = center.gauge(
+            "gc.count", labelnames=("generation",), help="gc.get_count() per generation at the last sample"
+        )
+        collections = center.counter("gc.collections", labelnames=("generation",), help="GC runs per generation")
+        self._objects = [generations.labels(str(index)) for index in range(3)]
+        self._collections = [collections.labels(str(index)) for index in range(3)]
+        self._last_collections = [stats["collections"] for stats in gc.get_stats()]
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        self._rss.set(resident_set_bytes())
+        if tracemalloc.is_tracing():
+            self._traced.set(tracemalloc.get_traced_memory()[0])
+        for index, count in enumerate(gc.get_count()):
+            self._objects[index].set(count)
+        for index, stats in enumerate(gc.get_stats()):
+            delta = stats["collections"] - self._last_collections[index]
+            if delta:
+                self._collections[index].inc(delta)
+            self._last_collections[index] = stats["collections"]
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="tornado-process-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(1.0)
+        self._thread = None
+
+    def _run(self) -> None:
+        self.sample()
+        while not self._stopping.wait(self.interval):
+            self.sample()
+
+
+heap_profiler = HeapProfiler()
+process_metrics = ProcessMetricsSampler()
+
+
+__all__ = [
+    "HeapProfiler",
+    "HeapProfilerError",
+    "HeapSnapshot",
+    "UnknownSnapshotError",
+    "ProcessMetricsSampler",
+    "heap_profiler",
+    "module_for",
+    "process_metrics",
+    "resident_set_bytes",
+]
@@ -0,0 +1,304 @@
+"""Labeled metric families and pre-bound series handles.
+
+Hot paths bind a handle once (``family.labels("nmap_scan.sim")``) and then
+call ``inc``/``observe`` on it, which avoids building metric names, label
+mappings and dictionary keys on every request. Each family caps the number of
+distinct label sets; once ``max_series`` is reached further label values share
+a single ``__overflow__`` series so user-controlled values cannot explode the
+series count.
+
+Updates on a handle only touch the handle itself: the current window bucket is
+found from a coarse clock (refreshed by a background thread) instead of a
+system call, and rolling windows and histogram sketches are brought up to date
+once per window bucket or batch of observations, and on read.
+"""
+from __future__ import annotations
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from time import time
+from typing import Any, Dict, List, Literal, Mapping, Optional, Sequence, Tuple, Union
+
+from .histogram import Histogram
+from .windows import RollingCounter, RollingHistogram, coarse_clock
+
+LabelSet = Tuple[Tuple[str, str], ...]
+MetricKind = Literal["counter", "gauge", "histogram"]
+
+OVERFLOW_LABEL = "__overflow__"
+DEFAULT_MAX_SERIES = 1000
+
+# Holds the running ``ActiveSpan``; defined here so bound handles can attach
+# exemplars without importing the telemetry center.
+current_span_var: ContextVar[Optional[Any]] = ContextVar("tornado_current_span", default=None)
+
+
+def label_set(labels: Optional[Mapping[str, Any]]) -> LabelSet:
+    """Canonical, hashable form of a label mapping (sorted by label name)."""
+
+    if not labels:
+        return ()
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def series_name(name: str, labels: LabelSet) -> str:
+    """Human readable series identifier used in JSON snapshots."""
+
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels)
+    return f"{name}{{{rendered}}}"
+
+
+@dataclass(frozen=True)
+class Exemplar:
+    trace_id: str
+    span_id: str
+    value: float
+    timestamp: float
+
+
+class Counter:
+    """A single counter series.
+
+    ``inc`` only adds to the running total. Everything counted during a window
+    bucket is moved into the rolling window in one step, when the first
+    increment of the next bucket arrives or when the window is read.
+    """
+
+    __slots__ = ("labels", "value", "_window", "_mark", "_bucket_start", "_bucket_end")
+
+    def __init__(self, labels: LabelSet) -> None:
+        self.labels = labels
+        self.reset()
+        coarse_clock.start()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if coarse_clock.now >= self._bucket_end:
+            self._rotate()
+        self.value += amount
+
+    @property
+    def window(self) -> RollingCounter:
+        self._flush()
+        return self._window
+
+    def reset(self) -> None:
+        self.value = 0.0
+        self._window = RollingCounter()
+        self._mark = 0.0
+        self._bucket_start = self._bucket_end = 0.0
+
+    def _flush(self) -> None:
+        value = self.value
+        if value != self._mark:
+            self._window.add(value - self._mark, self._bucket_start)
+            self._mark = value
+
+    def _rotate(self) -> None:
+        self._flush()
+        resolution = self._window.resolution
+        self._bucket_start = coarse_clock.now // resolution * resolution
+        self._bucket_end = self._bucket_start + resolution
+
+
+class Gauge:
+    """A single gauge series: the last value set (e.g. a sampled memory size)."""
+
+    __slots__ = ("labels", "value")
+
+    def __init__(self, labels: LabelSet) -> None:
+        self.labels = labels
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def reset(self) -> None:
+        self.value = 0.0
+
+
+class HistogramSeries:
+    """A single histogram series with its rolling window and an exemplar.
+
+    ``observe`` appends to a buffer that is folded into the sketches in one
+    pass every ``FOLD_EVERY`` values, at the end of each window bucket and
+    whenever the histogram or window is read. The running span is consulted
+    for an exemplar only until a sampled one has been captured in the bucket.
+
+    Worker threads observe concurrently: appends go to the one buffer list
+    (atomic under the GIL) and folding takes a lock, removing only the values
+    it folded from the front of the buffer.
+    """
+
+    __slots__ = (
+        "labels",
+        "exemplar",
+        "_histogram",
+        "_window",
+        "_pending",
+        "_bucket_start",
+        "_bucket_end",
+        "_want_exemplar",
+        "_name",
+        "_relative_accuracy",
+        "_lock",
+    )
+
+    FOLD_EVERY = 1024
+
+    def __init__(self, name: str, labels: LabelSet, relative_accuracy: float) -> None:
+        self.labels = labels
+        self._name = series_name(name, labels)
+        self._relative_accuracy = relative_accuracy
+        self._lock = Lock()
+        self.reset()
+        coarse_clock.start()
+
+    def observe(self, value: float, exemplar: Optional[Any] = None) -> None:
+        if coarse_clock.now >= self._bucket_end:
+            self._rotate()
+        pending = self._pending
+        pending.append(value)
+        if len(pending) >= self.FOLD_EVERY:
+            self._flush()
+        if exemplar is None:
+            if not self._want_exemplar:
+                return
+            exemplar = current_span_var.get()
+            if exemplar is None:
+                return
+        if exemplar.sampled:
+            self.exemplar = Exemplar(exemplar.trace_id, exemplar.span_id, value, time())
+            self._want_exemplar = False
+
+    @property
+    def histogram(self) -> Histogram:
+        self._flush()
+        return self._histogram
+
+    @property
+    def window(self) -> RollingHistogram:
+        self._flush()
+        return self._window
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histogram = Histogram(self._name, relative_accuracy=self._relative_accuracy)
+            self._window = RollingHistogram(self._name, relative_accuracy=self._relative_accuracy)
+            self._pending: List[float] = []
+            self._bucket_start = self._bucket_end = 0.0
+            self._want_exemplar = True
+            self.exemplar: Optional[Exemplar] = None
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        with self._lock:
+            pending = self._pending
+            count = len(pending)
+            if not count:
+                return
+            values = pending[:count]
+            # Values appended meanwhile sit after ``count`` and stay buffered.
+            del pending[:count]
+            batch = Histogram(self._name, relative_accuracy=self._relative_accuracy)
+            batch.observe_many(values)
+            self._window.add(batch, self._bucket_start)
+            self._histogram.merge(batch)
+
+    def _rotate(self) -> None:
+        self._flush()
+        resolution = self._window.resolution
+        self._bucket_start = coarse_clock.now // resolution * resolution
+        self._bucket_end = self._bucket_start + resolution
+        self._want_exemplar = True
+
+
+Series = Union[Counter, Gauge, HistogramSeries]
+
+
+class MetricFamily:
+    """All series sharing one metric name, keyed by their label set."""
+
+    def __init__(
+        self,
+        name: str,
+        kind: MetricKind,
+        unit: str = "",
+        help: str = "",
+        labelnames: Sequence[str] = (),
+        max_series: int = DEFAULT_MAX_SERIES,
+        relative_accuracy: float = 0.01,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.unit = unit
+        self.help = help
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self.max_series = max_series
+        self.overflowed = 0
+        self.series: Dict[LabelSet, Series] = {}
+        self._relative_accuracy = relative_accuracy
+        self._bound: Dict[Tuple[Any, ...], Series] = {}
+
+    def labels(self, *values: Any, **named: Any) -> Series:
+        """Return the handle for one label combination, creating it on first use."""
+
+        if named:
+            try:
+                values = tuple(named[label] for label in self.labelnames)
+            except KeyError as exc:
+                raise ValueError(f"Metric {self.name} requires labels {self.labelnames}") from exc
+        handle = self._bound.get(values)
+        if handle is None:
+            handle = self._bind(values)
+        return handle
+
+    def _bind(self, values: Tuple[Any, ...]) -> Series:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects {len(self.labelnames)} label values, got {len(values)}")
+        key: LabelSet = tuple(zip(self.labelnames, (str(value) for value in values)))
+        handle = self.series.get(key)
+        if handle is not None:
+            self._bound[values] = handle
+            return handle
+        if len(self.series) >= self.max_series:
+            # Overflowed values are not memoised so ``_bound`` stays bounded too.
+            self.overflowed += 1
+            key = tuple((label, OVERFLOW_LABEL) for label in self.labelnames)
+            handle = self.series.get(key)
+            if handle is None:
+                handle = self.series[key] = self._new_series(key)
+            return handle
+        handle = self.series[key] = self._new_series(key)
+        self._bound[values] = handle
+        return handle
+
+    def _new_series(self, key: LabelSet) -> Series:
+        if self.kind == "counter":
+            return Counter(key)
+        if self.kind == "gauge":
+            return Gauge(key)
+        return HistogramSeries(self.name, key, self._relative_accuracy)
+
+    def reset(self) -> None:
+        for handle in self.series.values():
+            handle.reset()
+        self.overflowed = 0
+
+
+__all__ = [
+    "Counter",
+    "Exemplar",
+    "Gauge",
+    "HistogramSeries",
+    "LabelSet",
+    "MetricFamily",
+    "MetricKind",
+    "OVERFLOW_LABEL",
+    "current_span_var",
+    "label_set",
+    "series_name",
+]
@@ -0,0 +1,160 @@
+"""OpenMetrics text exposition for the telemetry center."""
+from __future__ import annotations
+
+import math
+import re
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .metrics import HistogramSeries, LabelSet, MetricFamily
+from .telemetry import TelemetryCenter, telemetry_center
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+DEFAULT_BUCKETS: Mapping[str, Tuple[float, ...]] = {
+    "seconds": (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+    "bytes": tuple(float(4**power) for power in range(3, 13)),
+    "": (1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0),
+}
+
+_INVALID_NAME = re.compile(r"[^a-zA-Z0-9_:]")
+_INVALID_LABEL = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def metric_name(family: MetricFamily) -> str:
+    """Exposition name: dots become underscores and the unit is appended."""
+
+    name = _INVALID_NAME.sub("_", family.name)
+    if family.kind == "counter" and name.endswith("_total"):
+        name = name[: -len("_total")]
+    if family.unit and not name.endswith(f"_{family.unit}"):
+        name = f"{name}_{family.unit}"
+    return name
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(labels: LabelSet, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [(_INVALID_LABEL.sub("_", key), _escape(value)) for key, value in labels]
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+class OpenMetricsRenderer:
+    """Render counters, gauges and histograms, re-rendering only series that changed.
+
+    Every series caches its text together with a change token (the counter or
+    gauge value, or the histogram count), so a scrape only formats series
+    touched since the previous one. The full document is additionally reused
+    for ``ttl`` seconds to absorb bursts of concurrent scrapes. Both caches are
+    dropped when the telemetry center is reset, since a reset series can reach
+    its old token again with different contents.
+    """
+
+    def __init__(
+        self,
+        center: TelemetryCenter,
+        ttl: float = 1.0,
+        buckets: Optional[Mapping[str, Sequence[float]]] = None,
+    ) -> None:
+        self._center = center
+        self._ttl = ttl
+        self._buckets = {unit: tuple(bounds) for unit, bounds in (buckets or DEFAULT_BUCKETS).items()}
+        self._series_cache: Dict[Tuple[str, LabelSet], Tuple[object, str]] = {}
+        self._document = ""
+        self._rendered_at = -math.inf
+        self._generation = center.generation
+        self._lock = Lock()
+
+    def render(self) -> str:
+        with self._lock:
+            now = monotonic()
+            if self._center.generation != self._generation:
+                self._generation = self._center.generation
+                self._series_cache = {}
+            elif now - self._rendered_at < self._ttl:
+                return self._document
+            self._document = self._render()
+            self._rendered_at = now
+            return self._document
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rendered_at = -math.inf
+
+    def _render(self) -> str:
+        previous = self._series_cache
+        current: Dict[Tuple[str, LabelSet], Tuple[object, str]] = {}
+        chunks: List[str] = []
+        for family in sorted(self._center.families(), key=lambda item: item.name):
+            name = metric_name(family)
+            chunks.append(f"# TYPE {name} {family.kind}\n")
+            if family.unit:
+                chunks.append(f"# UNIT {name} {family.unit}\n")
+            if family.help:
+                chunks.append(f"# HELP {name} {_escape(family.help)}\n")
+            for labels, handle in list(family.series.items()):
+                cache_key = (family.name, labels)
+                token: object = handle.histogram.count if family.kind == "histogram" else handle.value
+                cached = previous.get(cache_key)
+                if cached is not None and cached[0] == token:
+                    text = cached[1]
+                elif family.kind == "counter":
+                    text = f"{name}_total{_labels(labels)} {_format_value(handle.value)}\n"
+                elif family.kind == "gauge":
+                    text = f"{name}{_labels(labels)} {_format_value(handle.value)}\n"
+                else:
+                    text = self._render_histogram(name, family, labels, handle)
+                current[cache_key] = (token, text)
+                chunks.append(text)
+        chunks.append("# EOF\n")
+        self._series_cache = current
+        return "".join(chunks)
+
+    def _render_histogram(self, name: str, family: MetricFamily, labels: LabelSet, handle: HistogramSeries) -> str:
+        bounds = self._buckets.get(family.unit, self._buckets[""])
+        histogram = handle.histogram
+        counts = histogram.cumulative_counts(bounds)
+        exemplar = handle.exemplar
+        lines: List[str] = []
+        exemplar_pending = exemplar is not None
+        for bound, count in zip(bounds, counts):
+            line = f"{name}_bucket{_labels(labels, ('le', _format_value(bound)))} {count}"
+            if exemplar_pending and exemplar.value <= bound:
+                line += self._exemplar(exemplar)
+                exemplar_pending = False
+            lines.append(line)
+        line = f"{name}_bucket{_labels(labels, ('le', '+Inf'))} {histogram.count}"
+        if exemplar_pending:
+            line += self._exemplar(exemplar)
+        lines.append(line)
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        lines.append(f"{name}_sum{_labels(labels)} {_format_value(histogram.total)}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _exemplar(exemplar) -> str:
+        return (
+            f' # {{trace_id="{exemplar.trace_id}",span_id="{exemplar.span_id}"}} '
+            f"{_format_value(exemplar.value)} {exemplar.timestamp:.3f}"
+        )
+
+
+openmetrics_renderer = OpenMetricsRenderer(telemetry_center)
+
+
+__all__ = ["CONTENT_TYPE", "DEFAULT_BUCKETS", "OpenMetricsRenderer", "metric_name", "openmetrics_renderer"]
@@ -0,0 +1,168 @@
+"""Wall-clock stack sampler for profiling a live worker.
+
+A dedicated thread wakes every ``interval`` seconds, walks
+``sys._current_frames()`` and counts identical stacks per thread, so the
+running process is never traced or restarted. Results render as collapsed
+stacks (``thread;outer;inner count``, the input of flamegraph.pl) or as a
+speedscope file with one sampled profile per thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from time import perf_counter, sleep, time
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+Frame = Tuple[str, str, int]
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+@dataclass
+class Profile:
+    interval: float
+    started: float
+    duration: float = 0.0
+    samples: int = 0
+    frames: List[Frame] = field(default_factory=list)
+    # (thread name, stack of frame indexes from outermost to innermost) -> hits
+    stacks: Counter = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        lines = []
+        for (thread, stack), hits in sorted(self.stacks.items(), key=lambda item: -item[1]):
+            names = [thread]
+            names.extend(f"{name} ({file}:{line})" for file, name, line in (self.frames[index] for index in stack))
+            lines.append(f"{';'.join(names)} {hits}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self) -> Dict[str, Any]:
+        per_thread: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+        for (thread, stack), hits in self.stacks.items():
+            samples, weights = per_thread.setdefault(thread, ([], []))
+            samples.append(list(stack))
+            weights.append(hits * self.interval)
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": f"tornado-ai profile {self.duration:.1f}s",
+            "exporter": "tornado_ai.core.observability.profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": [{"name": name, "file": file, "line": line} for file, name, line in self.frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for thread, (samples, weights) in sorted(per_thread.items())
+            ],
+        }
+
+
+class SamplingProfiler:
+    """Run at most one sampling session at a time."""
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def run(self, seconds: float, thread_labels: Optional[Dict[int, str]] = None) -> Profile:
+        """Sample every thread except the sampler itself for ``seconds`` (blocking)."""
+
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            return self._sample(seconds, thread_labels or {})
+        finally:
+            self._lock.release()
+
+    async def profile(self, seconds: float) -> Profile:
+        """Sample from a dedicated thread without occupying the loop or an executor worker.
+
+        The calling thread is labelled ``event-loop`` in the output.
+        """
+
+        if self.running:
+            raise ProfilerBusyError("A profile is already running")
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        labels = {threading.get_ident(): "event-loop"}
+
+        def _target() -> None:
+            try:
+                result = self.run(seconds, labels)
+            except BaseException as exc:  # pragma: no cover - surfaced to the awaiting coroutine
+                loop.call_soon_threadsafe(future.set_exception, exc)
+            else:
+                loop.call_soon_threadsafe(future.set_result, result)
+
+        threading.Thread(target=_target, name="tornado-profiler", daemon=True).start()
+        return await future
+
+    def _sample(self, seconds: float, thread_labels: Dict[int, str]) -> Profile:
+        own = threading.get_ident()
+        profile = Profile(interval=self.interval, started=time())
+        frame_index: Dict[CodeType, int] = {}
+        names: Dict[int, str] = {}
+        start = perf_counter()
+        deadline = start + seconds
+        next_tick = start
+        while True:
+            now = perf_counter()
+            if now >= deadline:
+                break
+            if len(names) != threading.active_count():
+                names = {thread.ident: thread.name for thread in threading.enumerate() if thread.ident is not None}
+                names.update(thread_labels)
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = self._stack(frame, frame_index, profile.frames)
+                profile.stacks[(names.get(ident, f"thread-{ident}"), stack)] += 1
+            profile.samples += 1
+            next_tick += self.interval
+            delay = next_tick - perf_counter()
+            if delay > 0:
+                sleep(delay)
+            else:
+                next_tick = perf_counter()
+        profile.duration = perf_counter() - start
+        return profile
+
+    def _stack(
+        self, frame: Optional[FrameType], frame_index: Dict[CodeType, int], frames: List[Frame]
+    ) -> Tuple[int, ...]:
+        stack: List[int] = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            index = frame_index.get(code)
+            if index is None:
+                index = frame_index[code] = len(frames)
+                frames.append((code.co_filename, code.co_name, code.co_firstlineno))
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+
+sampling_profiler = SamplingProfiler()
+
+
+__all__ = ["Profile", "ProfilerBusyError", "SamplingProfiler", "sampling_profiler"]
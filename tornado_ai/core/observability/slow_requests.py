@@ -0,0 +1,64 @@
+"""Bounded log of slow HTTP requests together with their span trees."""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List
+
+from ...config import config
+
+
+@dataclass
+class SlowRequest:
+    method: str
+    route: str
+    path: str
+    status: int
+    duration: float
+    start: float
+    trace_id: str
+    spans: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "route": self.route,
+            "path": self.path,
+            "status": self.status,
+            "duration": self.duration,
+            "start": self.start,
+            "traceId": self.trace_id,
+            "spans": self.spans,
+        }
+
+
+class SlowRequestLog:
+    """Keep the most recent ``capacity`` requests slower than ``threshold`` seconds."""
+
+    def __init__(self, threshold: float = 0.5, capacity: int = 100) -> None:
+        self.threshold = threshold
+        self._entries: Deque[SlowRequest] = deque(maxlen=capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self._entries.maxlen or 0
+
+    def record(self, entry: SlowRequest) -> None:
+        self._entries.append(entry)
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Newest first."""
+
+        return [entry.to_dict() for entry in list(self._entries)[::-1][:limit]]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+slow_request_log = SlowRequestLog(
+    threshold=config.telemetry.slow_request_ms / 1000,
+    capacity=config.telemetry.slow_request_capacity,
+)
+
+
+__all__ = ["SlowRequest", "SlowRequestLog", "slow_request_log"]
@@ -1,89 +1,409 @@
 """Observability utilities for structured telemetry."""
 from __future__ import annotations
 
-from collections import defaultdict
+import random
+import threading
+from collections import deque
 from contextlib import contextmanager
-from dataclasses import dataclass, field
-from statistics import mean
-from time import perf_counter
-from typing import Any, Dict, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter, time
+from typing import Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Sequence
+
+from ...config import config
+from .histogram import Histogram
+from .metrics import DEFAULT_MAX_SERIES, MetricFamily, MetricKind, current_span_var, series_name
+from .windows import window_seconds
 
 
 @dataclass
-class Histogram:
+class SpanRecord:
     name: str
-    values: list[float] = field(default_factory=list)
-
-    def observe(self, value: float) -> None:
-        self.values.append(value)
+    duration: float
+    attributes: Dict[str, Any]
+    trace_id: str = ""
+    span_id: str = ""
+    parent_id: Optional[str] = None
+    start: float = 0.0
+    error: Optional[str] = None
+    thread_id: int = 0
 
-    def snapshot(self) -> Dict[str, Any]:
-        if not self.values:
-            return {"count": 0, "avg": 0.0, "p95": 0.0, "min": 0.0, "max": 0.0}
-        ordered = sorted(self.values)
-        idx = int(0.95 * (len(ordered) - 1)) if ordered else 0
+    def to_dict(self) -> Dict[str, Any]:
         return {
-            "count": len(self.values),
-            "avg": mean(self.values),
-            "p95": ordered[idx],
-            "min": ordered[0],
-            "max": ordered[-1],
+            "name": self.name,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentId": self.parent_id,
+            "start": self.start,
+            "error": self.error,
+            "threadId": self.thread_id,
         }
 
 
-@dataclass
-class SpanRecord:
-    name: str
-    duration: float
-    attributes: Dict[str, Any]
+class ActiveSpan:
+    """A span that is still running; children find it through ``contextvars``."""
+
+    __slots__ = ("name", "attributes", "trace_id", "span_id", "parent", "root", "sampled", "pending", "kept", "closed")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["ActiveSpan"], sampled: bool) -> None:
+        self.name = name
+        self.attributes = attributes
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent = parent
+        if parent is None:
+            self.trace_id = f"{random.getrandbits(128):032x}"
+            self.root: ActiveSpan = self
+        else:
+            self.trace_id = parent.trace_id
+            self.root = parent.root
+        self.sampled = sampled
+        # Only the root buffers finished spans until the keep/drop decision.
+        self.pending: List[SpanRecord] = []
+        self.kept = False
+        self.closed = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def force_keep(self) -> None:
+        """Keep this span's whole trace regardless of sampling (call before the root closes)."""
+
+        self.root.kept = True
+
+
+_current_span: ContextVar[Optional[ActiveSpan]] = current_span_var
+
+
+def current_span() -> Optional[ActiveSpan]:
+    return _current_span.get()
 
 
 class TelemetryCenter:
-    """Central telemetry sink with counters, histograms, and spans."""
+    """Central telemetry sink with counters, histograms, and spans.
+
+    Finished spans are kept in a fixed-capacity ring buffer. Sampling is
+    decided per trace: the root span draws a head-sampling coin, children are
+    buffered on the root, and when the root closes the whole trace is kept if
+    it was head-sampled, errored, or ran longer than ``tail_latency_threshold``.
+    Span latency histograms are recorded for every span regardless of sampling.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        span_capacity: int = 4096,
+        head_sample_rate: float = 1.0,
+        tail_latency_threshold: float = 0.25,
+        max_spans_per_trace: int = 256,
+    ) -> None:
+        self._relative_accuracy = relative_accuracy
+        self._families: Dict[str, MetricFamily] = {}
+        # Bumped by ``reset`` (at ``reset_at``) so caches keyed on series values
+        # and exporters computing deltas know to start over.
+        self.generation = 0
+        self.reset_at = 0.0
+        self._span_duration = self.histogram("span.duration", labelnames=("span",), help="Span duration")
+        self._spans: Deque[SpanRecord] = deque(maxlen=span_capacity)
+        self._max_spans_per_trace = max_spans_per_trace
+        self._traces_kept = 0
+        self._traces_sampled_out = 0
+        self._spans_truncated = 0
+        self._span_listeners: List[Callable[[List[SpanRecord]], None]] = []
+        self.configure_sampling(head_sample_rate=head_sample_rate, tail_latency_threshold=tail_latency_threshold)
+
+    def configure_sampling(
+        self, head_sample_rate: Optional[float] = None, tail_latency_threshold: Optional[float] = None
+    ) -> None:
+        if head_sample_rate is not None:
+            if not 0.0 <= head_sample_rate <= 1.0:
+                raise ValueError("head_sample_rate must be between 0 and 1")
+            self._head_sample_rate = head_sample_rate
+        if tail_latency_threshold is not None:
+            self._tail_latency_threshold = tail_latency_threshold
+
+    def _family(
+        self,
+        name: str,
+        kind: MetricKind,
+        unit: str = "",
+        help: str = "",
+        labelnames: Sequence[str] = (),
+        max_series: Optional[int] = None,
+    ) -> MetricFamily:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = MetricFamily(
+                name,
+                kind,
+                unit=unit,
+                help=help,
+                labelnames=labelnames,
+                max_series=max_series or DEFAULT_MAX_SERIES,
+                relative_accuracy=self._relative_accuracy,
+            )
+        elif family.kind != kind:
+            raise ValueError(f"Metric {name} is already registered as a {family.kind}")
+        elif tuple(labelnames) != family.labelnames:
+            raise ValueError(f"Metric {name} is already registered with labels {family.labelnames}")
+        return family
 
-    def __init__(self) -> None:
-        self._counters: Dict[str, float] = defaultdict(float)
-        self._histograms: Dict[str, Histogram] = {}
-        self._spans: list[SpanRecord] = []
+    def counter(
+        self, name: str, help: str = "", labelnames: Sequence[str] = (), max_series: Optional[int] = None
+    ) -> MetricFamily:
+        """Register (or fetch) a counter family; bind series with ``.labels(...)``."""
 
-    def increment_counter(self, name: str, value: float = 1.0) -> None:
-        self._counters[name] += value
+        return self._family(name, "counter", help=help, labelnames=labelnames, max_series=max_series)
 
-    def observe_latency(self, name: str, latency: float) -> None:
-        histogram = self._histograms.setdefault(name, Histogram(name))
-        histogram.observe(latency)
+    def gauge(
+        self,
+        name: str,
+        unit: str = "",
+        help: str = "",
+        labelnames: Sequence[str] = (),
+        max_series: Optional[int] = None,
+    ) -> MetricFamily:
+        """Register (or fetch) a gauge family; bind series with ``.labels(...)`` and ``.set(...)`` them."""
+
+        return self._family(name, "gauge", unit=unit, help=help, labelnames=labelnames, max_series=max_series)
+
+    def histogram(
+        self,
+        name: str,
+        unit: str = "seconds",
+        help: str = "",
+        labelnames: Sequence[str] = (),
+        max_series: Optional[int] = None,
+    ) -> MetricFamily:
+        """Register (or fetch) a histogram family; bind series with ``.labels(...)``."""
+
+        return self._family(name, "histogram", unit=unit, help=help, labelnames=labelnames, max_series=max_series)
+
+    def families(self) -> List[MetricFamily]:
+        return list(self._families.values())
+
+    def increment_counter(self, name: str, value: float = 1.0, labels: Optional[Mapping[str, Any]] = None) -> None:
+        """Ad-hoc counter update; prefer a pre-bound handle from :meth:`counter` on hot paths."""
+
+        labelnames = tuple(sorted(labels)) if labels else ()
+        family = self._family(name, "counter", labelnames=labelnames)
+        handle = family.labels(**labels) if labels else family.labels()
+        handle.inc(value)
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Mapping[str, Any]] = None,
+        unit: str = "",
+        exemplar: Optional[ActiveSpan] = None,
+    ) -> None:
+        """Ad-hoc histogram update; prefer a pre-bound handle from :meth:`histogram` on hot paths."""
+
+        labelnames = tuple(sorted(labels)) if labels else ()
+        family = self._family(name, "histogram", unit=unit, labelnames=labelnames)
+        handle = family.labels(**labels) if labels else family.labels()
+        handle.observe(value, exemplar)
+
+    def observe_latency(self, name: str, latency: float, labels: Optional[Mapping[str, Any]] = None) -> None:
+        self.observe(name, latency, labels, unit="seconds")
 
     @contextmanager
-    def span(self, name: str, **attributes: Any) -> Iterator[None]:
+    def span(self, name: str, **attributes: Any) -> Iterator[ActiveSpan]:
+        parent = _current_span.get()
+        if parent is None:
+            active = ActiveSpan(name, attributes, None, random.random() < self._head_sample_rate)
+        else:
+            active = ActiveSpan(name, attributes, parent, parent.sampled)
+        token = _current_span.set(active)
+        started_at = time()
         start = perf_counter()
+        error: Optional[str] = None
         try:
-            yield
+            yield active
+        except BaseException as exc:
+            error = type(exc).__name__
+            raise
         finally:
             duration = perf_counter() - start
-            self._spans.append(SpanRecord(name=name, duration=duration, attributes=attributes))
-            self.observe_latency(f"span.{name}", duration)
+            _current_span.reset(token)
+            record = SpanRecord(
+                name=name,
+                duration=duration,
+                attributes=active.attributes,
+                trace_id=active.trace_id,
+                span_id=active.span_id,
+                parent_id=parent.span_id if parent is not None else None,
+                start=started_at,
+                error=error,
+                thread_id=threading.get_ident(),
+            )
+            self._span_duration.labels(name).observe(duration, active)
+            self._finish(active, record)
+
+    def _finish(self, active: ActiveSpan, record: SpanRecord) -> None:
+        root = active.root
+        if active is not root:
+            if root.closed:
+                # Detached child outliving its root: follow the root's verdict.
+                if root.kept or record.error or record.duration >= self._tail_latency_threshold:
+                    self._keep([record])
+            elif len(root.pending) < self._max_spans_per_trace:
+                root.pending.append(record)
+            else:
+                self._spans_truncated += 1
+            return
+
+        root.closed = True
+        keep = (
+            root.sampled
+            or root.kept
+            or record.error is not None
+            or record.duration >= self._tail_latency_threshold
+            or any(span.error for span in root.pending)
+        )
+        if keep:
+            root.kept = True
+            self._traces_kept += 1
+            root.pending.append(record)
+            self._keep(root.pending)
+        else:
+            self._traces_sampled_out += 1
+        root.pending = []
+
+    def _keep(self, records: List[SpanRecord]) -> None:
+        self._spans.extend(records)
+        for listener in self._span_listeners:
+            listener(records)
+
+    def add_span_listener(self, listener: Callable[[List[SpanRecord]], None]) -> None:
+        """Call ``listener`` with every batch of kept spans; it must not block."""
+
+        self._span_listeners.append(listener)
+
+    def remove_span_listener(self, listener: Callable[[List[SpanRecord]], None]) -> None:
+        if listener in self._span_listeners:
+            self._span_listeners.remove(listener)
+
+    def recent_spans(self, limit: int = 50) -> List[SpanRecord]:
+        spans = list(self._spans)
+        return spans[-limit:] if limit else spans
+
+    def trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Return the spans of ``trace_id`` as a nested tree (roots first)."""
+
+        return self._build_trees([span for span in self._spans if span.trace_id == trace_id])
+
+    def recent_traces(self, limit: int = 10) -> List[Dict[str, Any]]:
+        grouped: Dict[str, List[SpanRecord]] = {}
+        for span in reversed(self._spans):
+            if span.trace_id not in grouped:
+                if len(grouped) >= limit:
+                    continue
+                grouped[span.trace_id] = []
+            grouped[span.trace_id].append(span)
+        trees: List[Dict[str, Any]] = []
+        for spans in grouped.values():
+            trees.extend(self._build_trees(spans))
+        return trees
+
+    @staticmethod
+    def _build_trees(spans: List[SpanRecord]) -> List[Dict[str, Any]]:
+        nodes = {span.span_id: {**span.to_dict(), "children": []} for span in spans}
+        roots: List[Dict[str, Any]] = []
+        for span in sorted(spans, key=lambda item: item.start):
+            node = nodes[span.span_id]
+            parent = nodes.get(span.parent_id) if span.parent_id else None
+            if parent is None:
+                roots.append(node)
+            else:
+                parent["children"].append(node)
+        return roots
 
     def reset(self) -> None:
-        self._counters.clear()
-        self._histograms.clear()
+        # Families are reset in place so pre-bound handles held by callers stay live.
+        for family in self.families():
+            family.reset()
+        self.generation += 1
+        self.reset_at = time()
         self._spans.clear()
+        self._traces_kept = 0
+        self._traces_sampled_out = 0
+        self._spans_truncated = 0
 
-    def snapshot(self) -> Dict[str, Any]:
-        return {
-            "counters": dict(self._counters),
-            "histograms": {name: histogram.snapshot() for name, histogram in self._histograms.items()},
-            "spans": [
-                {
-                    "name": span.name,
-                    "duration": span.duration,
-                    "attributes": span.attributes,
-                }
-                for span in self._spans[-50:]
-            ],
+    def windowed(self, window: str) -> Dict[str, Any]:
+        """Counter totals, per-second rates and histograms over a rolling window, plus current gauges."""
+
+        seconds = window_seconds(window)
+        now = time()
+        counters: Dict[str, float] = {}
+        rates: Dict[str, float] = {}
+        gauges: Dict[str, float] = {}
+        histograms: Dict[str, Dict[str, Any]] = {}
+        for family in self.families():
+            for key, handle in list(family.series.items()):
+                name = series_name(family.name, key)
+                if family.kind == "counter":
+                    counters[name] = handle.window.total(seconds, now)
+                    rates[name] = handle.window.rate(seconds, now)
+                elif family.kind == "gauge":
+                    gauges[name] = handle.value  # gauges have no history: always the last value
+                else:
+                    histograms[name] = handle.window.merged(seconds, now).snapshot()
+        return {"window": window, "counters": counters, "rates": rates, "gauges": gauges, "histograms": histograms}
+
+    def snapshot(self, window: Optional[str] = None) -> Dict[str, Any]:
+        if window is not None:
+            windowed = self.windowed(window)
+            counters, gauges, histograms = windowed["counters"], windowed["gauges"], windowed["histograms"]
+        else:
+            counters = {}
+            gauges = {}
+            histograms = {}
+            for family in self.families():
+                for key, handle in list(family.series.items()):
+                    if family.kind == "counter":
+                        counters[series_name(family.name, key)] = handle.value
+                    elif family.kind == "gauge":
+                        gauges[series_name(family.name, key)] = handle.value
+                    else:
+                        histograms[series_name(family.name, key)] = handle.histogram.snapshot()
+        payload: Dict[str, Any] = {
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": histograms,
+            "spans": [span.to_dict() for span in self.recent_spans(50)],
+            "spanBuffer": {
+                "capacity": self._spans.maxlen,
+                "size": len(self._spans),
+                "headSampleRate": self._head_sample_rate,
+                "tailLatencyThreshold": self._tail_latency_threshold,
+                "tracesKept": self._traces_kept,
+                "tracesSampledOut": self._traces_sampled_out,
+                "spansTruncated": self._spans_truncated,
+            },
+            "seriesOverflow": {family.name: family.overflowed for family in self.families() if family.overflowed},
         }
+        if window is not None:
+            payload["window"] = window
+            payload["rates"] = windowed["rates"]
+        return payload
 
 
-telemetry_center = TelemetryCenter()
+telemetry_center = TelemetryCenter(
+    span_capacity=config.telemetry.span_capacity,
+    head_sample_rate=config.telemetry.head_sample_rate,
+    tail_latency_threshold=config.telemetry.tail_latency_ms / 1000.0,
+)
 
 
-__all__ = ["telemetry_center", "TelemetryCenter", "Histogram", "SpanRecord"]
+__all__ = [
+    "telemetry_center",
+    "TelemetryCenter",
+    "Histogram",
+    "MetricFamily",
+    "SpanRecord",
+    "ActiveSpan",
+    "current_span",
+]
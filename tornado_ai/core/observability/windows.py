@@ -0,0 +1,177 @@
+"""Constant-memory rolling windows for counters and histograms."""
+from __future__ import annotations
+
+import os
+import threading
+from time import sleep, time
+from typing import Dict, List, Optional
+
+from .histogram import Histogram
+
+WINDOWS: Dict[str, int] = {"1m": 60, "5m": 300, "1h": 3600}
+
+DEFAULT_RESOLUTION = 10
+DEFAULT_HORIZON = 3600
+
+
+class CoarseClock:
+    """Wall-clock seconds refreshed by a daemon thread every ``interval``.
+
+    Reading ``now`` is an attribute load rather than a system call, for hot
+    paths that only need to know which window bucket they fall in. The thread
+    starts on first use and is restarted in forked children.
+    """
+
+    __slots__ = ("interval", "now", "_thread", "_lock")
+
+    def __init__(self, interval: float = 0.1) -> None:
+        self.interval = interval
+        self.now = time()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self.now = time()
+                self._thread = threading.Thread(target=self._run, name="tornado-coarse-clock", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            sleep(self.interval)
+            self.now = time()
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+
+coarse_clock = CoarseClock()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=coarse_clock._after_fork)
+
+
+class _RingClock:
+    """Maps wall-clock time to a slot in a ring of fixed-width time buckets."""
+
+    __slots__ = ("resolution", "size", "epochs")
+
+    def __init__(self, horizon: int, resolution: int) -> None:
+        if horizon % resolution:
+            raise ValueError("horizon must be a multiple of resolution")
+        self.resolution = resolution
+        self.size = horizon // resolution
+        self.epochs: List[int] = [-1] * self.size
+
+    def covered(self, window: int, now: float) -> tuple[range, float]:
+        """Epoch range inside ``window`` plus the seconds it actually spans."""
+
+        current = int(now // self.resolution)
+        slots = max(1, min(self.size, window // self.resolution))
+        elapsed = (slots - 1) * self.resolution + (now - current * self.resolution)
+        return range(current - slots + 1, current + 1), max(elapsed, 1e-9)
+
+
+class RollingCounter:
+    """Sum of increments per time bucket; the ring is reused as time advances."""
+
+    __slots__ = ("_clock", "_values")
+
+    def __init__(self, horizon: int = DEFAULT_HORIZON, resolution: int = DEFAULT_RESOLUTION) -> None:
+        self._clock = _RingClock(horizon, resolution)
+        self._values: List[float] = [0.0] * self._clock.size
+
+    @property
+    def resolution(self) -> int:
+        return self._clock.resolution
+
+    def add(self, amount: float, now: float) -> None:
+        clock = self._clock
+        epoch = int(now // clock.resolution)
+        slot = epoch % clock.size
+        if clock.epochs[slot] != epoch:
+            clock.epochs[slot] = epoch
+            self._values[slot] = 0.0
+        self._values[slot] += amount
+
+    def total(self, window: int, now: float) -> float:
+        clock = self._clock
+        epochs, _ = clock.covered(window, now)
+        total = 0.0
+        for epoch in epochs:
+            slot = epoch % clock.size
+            if clock.epochs[slot] == epoch:
+                total += self._values[slot]
+        return total
+
+    def rate(self, window: int, now: float) -> float:
+        """Per-second rate over the window (only the elapsed part of the current bucket counts)."""
+
+        _, elapsed = self._clock.covered(window, now)
+        return self.total(window, now) / elapsed
+
+
+class RollingHistogram:
+    """One small histogram per time bucket, merged on demand for a window."""
+
+    __slots__ = ("_clock", "_slots", "_name", "_relative_accuracy")
+
+    def __init__(
+        self,
+        name: str,
+        relative_accuracy: float = 0.01,
+        horizon: int = DEFAULT_HORIZON,
+        resolution: int = DEFAULT_RESOLUTION,
+    ) -> None:
+        self._clock = _RingClock(horizon, resolution)
+        self._slots: List[Optional[Histogram]] = [None] * self._clock.size
+        self._name = name
+        self._relative_accuracy = relative_accuracy
+
+    @property
+    def resolution(self) -> int:
+        return self._clock.resolution
+
+    def observe(self, value: float, now: float) -> None:
+        self._slot(now).observe(value)
+
+    def add(self, histogram: Histogram, now: float) -> None:
+        """Fold a batch of observations made during the bucket containing ``now``."""
+
+        self._slot(now).merge(histogram)
+
+    def _slot(self, now: float) -> Histogram:
+        clock = self._clock
+        epoch = int(now // clock.resolution)
+        slot = epoch % clock.size
+        histogram = self._slots[slot]
+        if histogram is None or clock.epochs[slot] != epoch:
+            clock.epochs[slot] = epoch
+            histogram = self._slots[slot] = Histogram(self._name, relative_accuracy=self._relative_accuracy)
+        return histogram
+
+    def merged(self, window: int, now: float) -> Histogram:
+        clock = self._clock
+        epochs, _ = clock.covered(window, now)
+        merged = Histogram(self._name, relative_accuracy=self._relative_accuracy)
+        for epoch in epochs:
+            slot = epoch % clock.size
+            histogram = self._slots[slot]
+            if histogram is not None and clock.epochs[slot] == epoch:
+                merged.merge(histogram)
+        return merged
+
+
+def window_seconds(window: str) -> int:
+    try:
+        return WINDOWS[window]
+    except KeyError:
+        raise ValueError(f"Unsupported window {window!r}; expected one of {', '.join(WINDOWS)}") from None
+
+
+__all__ = ["CoarseClock", "RollingCounter", "RollingHistogram", "WINDOWS", "coarse_clock", "window_seconds"]
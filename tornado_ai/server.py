@@ -3,15 +3,27 @@ from __future__ import annotations
 
 from fastapi import FastAPI
 
+from .api.middleware import TelemetryMiddleware
 from .api.routes import register_routes
 from .config import config
+from .core.decision import parameter_tuner, tool_performance
 from .core.metrics.logger import configure_logging
+from .core.observability.exporters import TelemetryExportPipeline, build_exporter
+from .core.observability.loop_monitor import loop_monitor
+from .core.observability.memory import process_metrics
+from .core.observability.telemetry import telemetry_center
 
 
 def create_app() -> FastAPI:
-    logger = configure_logging(config.logging.to_logging_dict())
+    logger = configure_logging(
+        config.logging.to_logging_dict(),
+        sampling=config.logging.sampling,
+        rate_limits=config.logging.rate_limits,
+        queue_size=config.logging.queue_size,
+    )
     app = FastAPI(title="Tornado AI", version="0.1.0")
     register_routes(app)
+    app.add_middleware(TelemetryMiddleware)
 
     @app.on_event("startup")
     async def _announce_startup() -> None:  # pragma: no cover - log side effect
@@ -19,6 +31,68 @@ def create_app() -> FastAPI:
             "Tornado AI server starting", extra={"host": config.server.host, "port": config.server.port}
         )
 
+    if config.telemetry.loop_monitor:
+        loop_monitor.stall_threshold = config.telemetry.loop_stall_ms / 1000
+
+        @app.on_event("startup")
+        async def _start_loop_monitor() -> None:
+            loop_monitor.start()
+
+        @app.on_event("shutdown")
+        async def _stop_loop_monitor() -> None:
+            await loop_monitor.stop()
+
+    if config.telemetry.process_interval > 0:
+        process_metrics.interval = config.telemetry.process_interval
+
+        @app.on_event("startup")
+        async def _start_process_metrics() -> None:
+            process_metrics.start()
+
+        @app.on_event("shutdown")
+        async def _stop_process_metrics() -> None:
+            process_metrics.stop()
+
+    if config.decision.performance_path:
+
+        @app.on_event("startup")
+        async def _open_tool_performance() -> None:
+            tool_performance.open(config.decision.performance_path)
+
+        @app.on_event("shutdown")
+        async def _close_tool_performance() -> None:
+            tool_performance.close()
+
+    if config.decision.tuning_path:
+
+        @app.on_event("startup")
+        async def _open_parameter_tuner() -> None:
+            parameter_tuner.open(config.decision.tuning_path)
+
+        @app.on_event("shutdown")
+        async def _close_parameter_tuner() -> None:
+            parameter_tuner.close()
+
+    exporter = build_exporter(
+        config.telemetry.export, config.telemetry.export_path, config.telemetry.export_socket
+    )
+    if exporter is not None:
+        pipeline = TelemetryExportPipeline(
+            telemetry_center,
+            [exporter],
+            max_queue=config.telemetry.export_queue,
+            flush_interval=config.telemetry.export_interval,
+        )
+        app.state.telemetry_exporter = pipeline
+
+        @app.on_event("startup")
+        async def _start_telemetry_export() -> None:
+            pipeline.start()
+
+        @app.on_event("shutdown")
+        async def _flush_telemetry_export() -> None:
+            pipeline.stop()
+
     return app
 
 
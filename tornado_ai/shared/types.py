@@ -30,24 +30,21 @@ class ToolSpec(BaseModel):
     estimatedDuration: int
 
 
+AssetKindLiteral = Literal["webapp", "api", "mobile", "cloud", "infrastructure", "binary", "iot"]
+EnvironmentLiteral = Literal["production", "staging", "development", "lab"]
+CriticalityLiteral = Literal["low", "medium", "high"]
+
+
 class TargetProfile(BaseModel):
     """Description of the asset the assistant is evaluating."""
 
     model_config = ConfigDict(extra="forbid")
 
     targetId: str
-    assetKind: Literal[
-        "webapp",
-        "api",
-        "mobile",
-        "cloud",
-        "infrastructure",
-        "binary",
-        "iot",
-    ]
-    environment: Literal["production", "staging", "development", "lab"]
+    assetKind: AssetKindLiteral
+    environment: EnvironmentLiteral
     cvss: float = Field(ge=0.0, le=10.0)
-    criticality: Literal["low", "medium", "high"]
+    criticality: CriticalityLiteral
     tags: List[str] = Field(default_factory=list)
     description: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
@@ -82,6 +79,32 @@ class ToolPlan(BaseModel):
     summary: str
 
 
+class PlanStepExecution(BaseModel):
+    """Projected and measured window of one plan step (seconds from plan start)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    toolId: str
+    status: Literal["completed", "cached", "errored", "skipped"]
+    priority: float
+    projectedStart: float
+    projectedEnd: float
+    start: Optional[float] = None
+    end: Optional[float] = None
+    error: Optional[str] = None
+
+
+class PlanExecutionReport(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    targetId: str
+    concurrency: int
+    criticalPath: List[str]
+    projectedMakespan: float
+    actualMakespan: float
+    steps: List[PlanStepExecution]
+
+
 class ParameterSuggestion(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -90,6 +113,35 @@ class ParameterSuggestion(BaseModel):
     rationale: str
 
 
+class ParameterRule(BaseModel):
+    """One IPO guardrail rule; omitted matchers match everything."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    id: str
+    tool: str = "*"
+    environments: Optional[List[EnvironmentLiteral]] = None
+    criticalities: Optional[List[CriticalityLiteral]] = None
+    params: Dict[str, Any] = Field(default_factory=dict)
+    rationale: Optional[str] = None
+    priority: int = 0
+
+
+class ParameterRuleSet(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    rules: List[ParameterRule] = Field(default_factory=list)
+    defaultRationale: str = "Standard parameter optimization for {assetKind}."
+
+
+class ParameterTuningSpace(BaseModel):
+    """Candidate values per tool parameter, ordered from least to most aggressive."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    tools: Dict[str, Dict[str, List[Any]]] = Field(default_factory=dict)
+
+
 class AttackPathNode(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -115,6 +167,42 @@ class AttackGraph(BaseModel):
     edges: List[AttackPathEdge]
 
 
+class RankedAttackPath(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    nodes: List[str]
+    likelihood: float = Field(ge=0.0, le=1.0)
+
+
+class ChokePointRanking(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    nodeId: str
+    score: float = Field(ge=0.0)
+
+
+class AttackPathAnalysis(BaseModel):
+    """Most likely paths and choke points with the subgraph they span."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    targetId: str
+    paths: List[RankedAttackPath]
+    chokePoints: List[ChokePointRanking]
+    graph: AttackGraph
+
+
+class AttackPathUpdate(BaseModel):
+    """Top attack paths of a live graph after a change; ``changed`` lists new or re-scored ones."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    targetId: str
+    version: int
+    paths: List[RankedAttackPath]
+    changed: List[RankedAttackPath]
+
+
 class ToolExecutionResult(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -19,11 +19,10 @@ def _generate_ports() -> list[Dict[str, Any]]:
     ]
 
 
-def _with_latency(metric: str, func: AdapterFunction, params: Dict[str, Any]) -> Dict[str, Any]:
-    start = time.perf_counter()
-    result = func(params)
-    telemetry_center.observe_latency(metric, time.perf_counter() - start)
-    return result
+_ADAPTER_LATENCY = telemetry_center.histogram(
+    "adapter.latency", labelnames=("tool",), help="Dry-run adapter execution latency"
+)
+_ADAPTER_RUNS = telemetry_center.counter("adapter.runs", labelnames=("tool",), help="Dry-run adapter executions")
 
 
 def _network_enumerator(params: Dict[str, Any]) -> Dict[str, Any]:
@@ -131,8 +130,11 @@ def _osint_mapper(params: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _wrap(tool_id: str, adapter: AdapterFunction, params: Dict[str, Any]) -> ToolExecutionResult:
-    output = _with_latency(f"adapter.{tool_id}", adapter, params)
-    telemetry_center.increment_counter(f"adapter.{tool_id}.runs")
+    latency, runs = _METRICS[tool_id]
+    start = time.perf_counter()
+    output = adapter(params)
+    latency.observe(time.perf_counter() - start)
+    runs.inc()
     return ToolExecutionResult(
         toolId=tool_id,
         status="completed",
@@ -157,6 +159,12 @@ _ADAPTERS: Dict[str, AdapterFunction] = {
 }
 
 
+# Adapters are static, so their metric handles are bound once at import.
+_METRICS = {
+    tool_id: (_ADAPTER_LATENCY.labels(tool_id), _ADAPTER_RUNS.labels(tool_id)) for tool_id in _ADAPTERS
+}
+
+
 def available_adapters() -> Dict[str, AdapterFunction]:
     return dict(_ADAPTERS)
 
@@ -1,14 +1,23 @@
-"""Tool registry utilities for ASME and MCP integration."""
+"""Tool registry utilities for ASME and MCP integration.
+
+Lookups are served from an immutable index (by category, permission and
+adapter, plus the summary, category-count and JSON-schema views) that is built
+once per registry version. ``register``/``unregister`` bump the version and
+the index is rebuilt lazily on the next read, so plan building only touches
+the tools in the categories it asks for.
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Iterable, List
+from dataclasses import dataclass, field
+from threading import Lock
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from ..shared.types import ToolSpec
 from .definitions import ToolDefinition, tool_definitions
 
 
-@dataclass
+@dataclass(frozen=True)
 class ToolSummary:
     id: str
     category: str
@@ -16,38 +25,155 @@ class ToolSummary:
     adapter: str
 
 
+def _freeze(buckets: Dict[str, List[ToolDefinition]]) -> Mapping[str, Tuple[ToolDefinition, ...]]:
+    return MappingProxyType({key: tuple(values) for key, values in buckets.items()})
+
+
+@dataclass(frozen=True)
+class _RegistryIndex:
+    version: int
+    definitions: Tuple[ToolDefinition, ...]
+    specs: Tuple[ToolSpec, ...]
+    positions: Mapping[str, int]
+    by_category: Mapping[str, Tuple[ToolDefinition, ...]]
+    by_permission: Mapping[str, Tuple[ToolDefinition, ...]]
+    by_adapter: Mapping[str, Tuple[ToolDefinition, ...]]
+    summary: Tuple[ToolSummary, ...]
+    categories: Mapping[str, int]
+    json_schemas: Tuple[Mapping[str, object], ...]
+    category_views: Dict[FrozenSet[str], Tuple[ToolDefinition, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, version: int, definitions: Iterable[ToolDefinition]) -> "_RegistryIndex":
+        ordered = tuple(definitions)
+        by_category: Dict[str, List[ToolDefinition]] = {}
+        by_permission: Dict[str, List[ToolDefinition]] = {}
+        by_adapter: Dict[str, List[ToolDefinition]] = {}
+        for definition in ordered:
+            spec = definition.spec
+            by_category.setdefault(spec.category, []).append(definition)
+            by_adapter.setdefault(definition.adapter, []).append(definition)
+            for permission in spec.requiredPermissions:
+                by_permission.setdefault(permission, []).append(definition)
+        return cls(
+            version=version,
+            definitions=ordered,
+            specs=tuple(definition.spec for definition in ordered),
+            positions=MappingProxyType({definition.spec.id: index for index, definition in enumerate(ordered)}),
+            by_category=_freeze(by_category),
+            by_permission=_freeze(by_permission),
+            by_adapter=_freeze(by_adapter),
+            summary=tuple(
+                ToolSummary(
+                    id=definition.spec.id,
+                    category=definition.spec.category,
+                    summary=definition.spec.summary,
+                    adapter=definition.adapter,
+                )
+                for definition in ordered
+            ),
+            categories=MappingProxyType({category: len(bucket) for category, bucket in by_category.items()}),
+            json_schemas=tuple(
+                MappingProxyType(
+                    {
+                        "name": definition.spec.id,
+                        "description": definition.spec.summary,
+                        "input_schema": definition.spec.inputSchema,
+                        "output_schema": definition.spec.outputSchema or {},
+                        "category": definition.spec.category,
+                        "permissions": definition.spec.requiredPermissions,
+                    }
+                )
+                for definition in ordered
+            ),
+        )
+
+
 class ToolRegistry:
     def __init__(self, definitions: Iterable[ToolDefinition]):
         self._definitions = {definition.spec.id: definition for definition in definitions}
+        self._version = 0
+        self._index: Optional[_RegistryIndex] = None
+        self._lock = Lock()
+
+    @property
+    def version(self) -> int:
+        """Incremented on every change; caches derived from the registry key on it."""
+
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._definitions)
+
+    def __contains__(self, tool_id: object) -> bool:
+        return tool_id in self._definitions
+
+    def register(self, definition: ToolDefinition) -> None:
+        with self._lock:
+            self._definitions[definition.spec.id] = definition
+            self._invalidate()
 
-    def list_definitions(self) -> List[ToolDefinition]:
-        return list(self._definitions.values())
+    def unregister(self, tool_id: str) -> ToolDefinition:
+        with self._lock:
+            if tool_id not in self._definitions:
+                raise KeyError(f"Unknown tool: {tool_id}")
+            definition = self._definitions.pop(tool_id)
+            self._invalidate()
+            return definition
 
-    def list_specs(self) -> List[ToolSpec]:
-        return [definition.spec for definition in self._definitions.values()]
+    def _invalidate(self) -> None:
+        self._version += 1
+        self._index = None
+
+    def _current(self) -> _RegistryIndex:
+        index = self._index
+        if index is None:
+            with self._lock:
+                index = self._index
+                if index is None:
+                    index = self._index = _RegistryIndex.build(self._version, self._definitions.values())
+        return index
+
+    def list_definitions(self) -> Sequence[ToolDefinition]:
+        return self._current().definitions
+
+    def list_specs(self) -> Sequence[ToolSpec]:
+        return self._current().specs
 
     def get_definition(self, tool_id: str) -> ToolDefinition:
         if tool_id not in self._definitions:
             raise KeyError(f"Unknown tool: {tool_id}")
         return self._definitions[tool_id]
 
-    def summary(self) -> List[ToolSummary]:
-        return [
-            ToolSummary(
-                id=definition.spec.id,
-                category=definition.spec.category,
-                summary=definition.spec.summary,
-                adapter=definition.adapter,
-            )
-            for definition in self._definitions.values()
-        ]
-
-    def categories(self) -> Dict[str, int]:
-        counts: Dict[str, int] = {}
-        for definition in self._definitions.values():
-            counts.setdefault(definition.spec.category, 0)
-            counts[definition.spec.category] += 1
-        return counts
+    def by_category(self, category: str) -> Tuple[ToolDefinition, ...]:
+        return self._current().by_category.get(category, ())
+
+    def by_permission(self, permission: str) -> Tuple[ToolDefinition, ...]:
+        return self._current().by_permission.get(permission, ())
+
+    def by_adapter(self, adapter: str) -> Tuple[ToolDefinition, ...]:
+        return self._current().by_adapter.get(adapter, ())
+
+    def for_categories(self, categories: Iterable[str]) -> Tuple[ToolDefinition, ...]:
+        """Definitions in any of ``categories``, in registration order (memoised per category set)."""
+
+        key = frozenset(categories)
+        index = self._current()
+        view = index.category_views.get(key)
+        if view is None:
+            selected = [definition for category in key for definition in index.by_category.get(category, ())]
+            selected.sort(key=lambda definition: index.positions[definition.spec.id])
+            view = index.category_views[key] = tuple(selected)
+        return view
+
+    def summary(self) -> Sequence[ToolSummary]:
+        return self._current().summary
+
+    def categories(self) -> Mapping[str, int]:
+        return self._current().categories
+
+    def json_schemas(self) -> Sequence[Mapping[str, object]]:
+        return self._current().json_schemas
 
 
 tool_registry = ToolRegistry(tool_definitions)
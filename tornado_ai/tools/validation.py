@@ -0,0 +1,153 @@
+"""Precompiled parameter validators for ``ToolSpec.inputSchema``.
+
+Input schemas use a compact notation: ``"string"``, ``"number"``,
+``"boolean"``, a ``"T[]"`` array of any of those, an ``"a|b|c"`` string enum,
+and a trailing ``?`` for optional parameters. Other type names (e.g.
+``"Port[]"``) are not checked beyond being arrays where ``[]`` says so.
+
+Each schema is compiled once into a tuple of per-parameter checks, so
+validating a call is a handful of ``isinstance``/set lookups. Parameters the
+schema does not declare are rejected. Missing non-optional parameters are
+only reported in strict mode, because the dry-run adapters supply defaults
+for every parameter.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from ..config import config
+from .registry import ToolRegistry, tool_registry
+
+Check = Callable[[Any], Optional[str]]
+
+
+@dataclass(frozen=True)
+class ParameterError:
+    field: str
+    message: str
+    kind: str
+
+    def to_dict(self) -> Dict[str, object]:
+        """FastAPI-style validation error entry."""
+
+        return {"loc": ["params", self.field], "msg": self.message, "type": self.kind}
+
+
+def _scalar(name: str) -> Optional[Check]:
+    if name == "string":
+        return lambda value: None if isinstance(value, str) else "must be a string"
+    if name == "number":
+        return lambda value: (
+            None if isinstance(value, (int, float)) and not isinstance(value, bool) else "must be a number"
+        )
+    if name == "boolean":
+        return lambda value: None if isinstance(value, bool) else "must be a boolean"
+    if "|" in name:
+        choices = frozenset(name.split("|"))
+        expected = ", ".join(repr(choice) for choice in name.split("|"))
+
+        def _enum(value: Any) -> Optional[str]:
+            return None if isinstance(value, str) and value in choices else f"must be one of {expected}"
+
+        return _enum
+    return None  # an opaque type name
+
+
+def compile_type(declaration: str) -> Tuple[Check, bool]:
+    """Check for one declared parameter type, and whether the parameter is optional."""
+
+    optional = declaration.endswith("?")
+    name = declaration.rstrip("?").strip()
+    if name.endswith("[]"):
+        item = _scalar(name[:-2])
+
+        def _array(value: Any) -> Optional[str]:
+            if not isinstance(value, list):
+                return "must be an array"
+            if item is not None:
+                for index, element in enumerate(value):
+                    problem = item(element)
+                    if problem is not None:
+                        return f"item {index} {problem}"
+            return None
+
+        return _array, optional
+    scalar = _scalar(name)
+    return (scalar if scalar is not None else (lambda value: None)), optional
+
+
+@dataclass(frozen=True)
+class ParameterValidator:
+    fields: Mapping[str, Tuple[Check, bool]]
+    strict: bool = False
+
+    @classmethod
+    def compile(cls, input_schema: Mapping[str, Any], strict: bool = False) -> "ParameterValidator":
+        fields: Dict[str, Tuple[Check, bool]] = {}
+        for name, declaration in input_schema.items():
+            if isinstance(declaration, str):
+                fields[name] = compile_type(declaration)
+            else:
+                fields[name] = (lambda value: None, True)
+        return cls(fields=fields, strict=strict)
+
+    def __call__(self, params: Mapping[str, Any]) -> List[ParameterError]:
+        errors: List[ParameterError] = []
+        fields = self.fields
+        for name, value in params.items():
+            spec = fields.get(name)
+            if spec is None:
+                errors.append(ParameterError(name, "is not a parameter of this tool", "extra_forbidden"))
+                continue
+            problem = spec[0](value)
+            if problem is not None:
+                errors.append(ParameterError(name, problem, "type_error"))
+        if self.strict:
+            for name, (_, optional) in fields.items():
+                if not optional and name not in params:
+                    errors.append(ParameterError(name, "is required", "missing"))
+        return errors
+
+
+class ParameterValidators:
+    """Compiled validators per tool, rebuilt lazily after registry changes."""
+
+    def __init__(self, registry: ToolRegistry, strict: bool = False) -> None:
+        self._registry = registry
+        self.strict = strict
+        self._version = registry.version
+        self._validators: Dict[str, ParameterValidator] = {}
+        self._lock = Lock()
+
+    def validator(self, tool_id: str) -> ParameterValidator:
+        """The compiled validator for ``tool_id`` (``KeyError`` for unknown tools)."""
+
+        if self._registry.version != self._version:
+            with self._lock:
+                if self._registry.version != self._version:
+                    self._validators = {}
+                    self._version = self._registry.version
+        validator = self._validators.get(tool_id)
+        if validator is None:
+            schema = self._registry.get_definition(tool_id).spec.inputSchema
+            validator = self._validators[tool_id] = ParameterValidator.compile(schema, strict=self.strict)
+        return validator
+
+    def validate(self, tool_id: str, params: Mapping[str, Any]) -> List[ParameterError]:
+        """Problems with ``params`` for ``tool_id``; empty for valid calls, ``KeyError`` for unknown tools."""
+
+        return self.validator(tool_id)(params)
+
+
+parameter_validators = ParameterValidators(tool_registry, strict=config.decision.strict_params)
+
+
+__all__ = [
+    "ParameterError",
+    "ParameterValidator",
+    "ParameterValidators",
+    "compile_type",
+    "parameter_validators",
+]